@@ -1,6 +1,19 @@
 from .dataFetching import *
+from .dataStore import *
 from .dataHandler import *
 from .applying_indicators import *
 from .calculateGreeks import *
+from .ivSolver import *
+from .greeksCache import *
+from .warmupCache import *
+from .dayPrefetcher import *
+from .lazyGreeks import *
+from .chainIndex import *
+from .chainSchema import *
+from .strikeTable import *
+from .contractSeries import *
+from .indicatorKernels import *
 from .indicatorLibrary import *
-from .ohlcBuilder import *
\ No newline at end of file
+from .incrementalIndicators import *
+from .ohlcBuilder import *
+from .streamingCandles import *
\ No newline at end of file
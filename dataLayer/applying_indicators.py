@@ -1,4 +1,5 @@
-from .indicatorLibrary import all_indicators
+from .indicatorLibrary import all_indicators, RSI_INDICATOR_COLUMNS, STOCH_INDICATOR_COLUMNS
+from .indicatorGraph import compute_indicators, sweep_indicators, NODE_BY_OUTPUT
 
 # Parameters for various indicators
 rolling_window_of_returns = 4
@@ -27,17 +28,76 @@ acceleration_psar = 0.05
 maximum_psar = 0.5
 window = rolling_window_of_returns
 
-def apply_indicators(data):
+def indicator_params(**overrides):
+    """
+    Return the indicator parameters of this module as a dict for compute_indicators.
+
+    Parameters are derived in the order and with the expressions of the module
+    constants above, each one taken from overrides when given. Overriding a
+    parameter therefore re-derives exactly those defined from it (e.g.
+    rolling_window_of_returns the windows, bb_deviation atr_kc_multiplier and
+    multiplier) unless they are overridden too.
+    """
+    params = {}
+
+    def define(name, value):
+        params[name] = overrides.get(name, value)
+        return params[name]
+
+    base_window = define('rolling_window_of_returns', rolling_window_of_returns)
+    define('rsi_window', rsi_window)
+    define('bb_window', base_window)
+    deviation = define('bb_deviation', bb_deviation)
+    define('atr_kc_multiplier', deviation)
+    define('donchian_window', base_window)
+    define('keltner_window', base_window)
+    define('keltner_window_atr', base_window)
+    define('ulcer_index_window', base_window)
+    define('atr_window', base_window)
+    define('chaikin_volatility_period', base_window)
+    define('dpo_period', base_window)
+    define('roc_period', base_window)
+    define('rvi_period', base_window)
+    define('gamma', gamma)
+    short = define('short_window', base_window + 1)
+    medium = define('medium_window', short * 3)
+    define('long_window', medium * 3)
+    define('signal_window', medium)
+    define('multiplier', deviation)
+    define('k_window', base_window)
+    define('d_window', base_window)
+    define('acceleration_psar', acceleration_psar)
+    define('maximum_psar', maximum_psar)
+    define('window', base_window)
+
+    params.update({name: value for name, value in overrides.items() if name not in params})
+    return params
+
+def apply_indicators(data, indicators=None, sweep=None):
     """
     Apply various technical indicators to the input data.
 
     Args:
     - data (DataFrame): Input data (OHLC format).
+    - indicators (list or None): Columns needed downstream (e.g. ['ulcer_index_rsi', 'kc_low_rsi']);
+      only these and what they depend on are computed. None computes every indicator.
+    - sweep (list or None): Parameter overrides, one dict per setting (e.g. [{'rolling_window_of_returns': 4},
+      {'rolling_window_of_returns': 8, 'bb_deviation': 2.5}]), computed together by sweep_indicators.
 
     Returns:
     - Tuple: Dataframes containing OHLC data with applied indicators (OHLC with all indicators,
-      OHLC with RSI indicator, OHLC with Stochastic indicator).
+      OHLC with RSI indicator, OHLC with Stochastic indicator). With sweep, columns are a MultiIndex
+      ('param_set', 'indicator') and frame[k] is a view of setting k that Signals can use directly.
     """
+    if sweep is not None:
+        if indicators is None:
+            indicators = list(NODE_BY_OUTPUT) + [f'{column}_rsi' for column in RSI_INDICATOR_COLUMNS] + \
+                         [f'{column}_k_percent' for column in STOCH_INDICATOR_COLUMNS]
+        return sweep_indicators(data, indicators, [indicator_params(**overrides) for overrides in sweep])
+
+    if indicators is not None:
+        return compute_indicators(data, indicators, indicator_params())
+
     # Prepare arguments for the indicator function
     args = (data, rsi_window, gamma, window, short_window, medium_window, long_window, signal_window, k_window, d_window,
             bb_window, bb_deviation, donchian_window, keltner_window, ulcer_index_window, atr_window,
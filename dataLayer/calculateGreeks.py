@@ -1,38 +1,58 @@
 from py_vollib_vectorized import vectorized_implied_volatility, vectorized_delta, vectorized_gamma, vectorized_rho, vectorized_theta
 import pandas as pd
 import numpy as np
+from .ivSolver import implied_volatility_warm_start, black_scholes_greeks
 
-def calculate_iv_and_greeks(options_data):
+# Model parameters used for every IV/Greeks computation
+RISK_FREE_RATE = 0.0625
+IV_MODEL = 'black_scholes_merton'
+GREEKS_MODEL = 'black_scholes'
+
+# IV/Greeks engines: py_vollib's cold vectorized solver or the in-house warm-started solver
+IV_ENGINES = ('py_vollib', 'warm_start')
+
+# Columns added to the option chain by calculate_iv_and_greeks
+GREEKS_COLUMNS = ['time_to_expiry_days', 'iv', 'delta', 'gamma', 'rho', 'theta']
+
+def calculate_iv_and_greeks(options_data, r=RISK_FREE_RATE, engine='py_vollib'):
     """
     Calculate implied volatility (IV) and Greeks (delta, gamma, rho, theta) for options data.
 
     Parameters:
     - options_data (pd.DataFrame): DataFrame containing options data with columns:
         ['option_price', 'spot_price', 'strike_price', 'expiry_date', 'option_type']
+    - r (float): Risk-free rate.
+    - engine (str): 'py_vollib' or 'warm_start'. The warm-start engine solves IV per contract seeded
+      from the contract's previous IV and records its iteration counts in options_data.attrs['iv_solver'].
 
     Returns:
     - options_data (pd.DataFrame): DataFrame with added columns:
-        ['iv', 'delta', 'gamma', 'rho', 'theta'] containing calculated values
+        ['iv', 'delta', 'gamma', 'rho', 'theta'] containing calculated values. The risk-free
+        rate is the same on every row and is kept once in options_data.attrs['r'].
     """
     if options_data is None or options_data.empty:
         return None, None
     
     try:
         # Calculate time to expiry in days
-        options_data['time_diff'] = pd.to_datetime(options_data['expiry_date']) - pd.to_datetime(options_data.index)
+        expiry_date = options_data['expiry_date']
+        if isinstance(expiry_date.dtype, pd.CategoricalDtype):
+            # Compact chains store each expiry once; expand it through the category codes
+            expiry_date = expiry_date.astype(expiry_date.cat.categories.dtype)
+        options_data['time_diff'] = pd.to_datetime(expiry_date) - pd.to_datetime(options_data.index)
         options_data['time_to_expiry_days'] = options_data['time_diff'].dt.total_seconds() / (24 * 3600) / 365
         options_data.drop(columns=['time_diff'], inplace=True)
         
         # Set risk-free rate
-        options_data['r'] = 0.0625
+        options_data.attrs['r'] = r
 
         # Extract necessary data for calculations
         option_prices = options_data['option_price'].values
         spot_prices = options_data['spot_price'].values
         strike_prices = options_data['strike_price'].values
         times_to_expiry = options_data['time_to_expiry_days'].values
-        risk_free_rates = options_data['r'].values
-        option_types = options_data['option_type'].fillna('').apply(lambda x: 'c' if x == 'CE' else 'p').values
+        risk_free_rates = np.full(len(options_data), r)
+        option_types = np.where(np.asarray(options_data['option_type'].values) == 'CE', 'c', 'p').astype(object)
         
     except KeyError as e:
         # Handle missing keys by assigning NaNs to IV and Greeks arrays
@@ -43,27 +63,39 @@ def calculate_iv_and_greeks(options_data):
         theta = np.full(len(options_data), np.nan)
 
     try:
-        # Calculate IV and Greeks using vectorized functions
-        iv = vectorized_implied_volatility(
-            option_prices, spot_prices, strike_prices, times_to_expiry, risk_free_rates, option_types,
-            q=0, on_error='warn', model='black_scholes_merton', return_as='numpy'
-        )
-        delta = vectorized_delta(
-            option_types, spot_prices, strike_prices, times_to_expiry, risk_free_rates, iv,
-            q=0, model='black_scholes', return_as='numpy'
-        )
-        gamma = vectorized_gamma(
-            option_types, spot_prices, strike_prices, times_to_expiry, risk_free_rates, iv,
-            q=0, model='black_scholes', return_as='numpy'
-        )
-        rho = vectorized_rho(
-            option_types, spot_prices, strike_prices, times_to_expiry, risk_free_rates, iv,
-            q=0, model='black_scholes', return_as='numpy'
-        )
-        theta = vectorized_theta(
-            option_types, spot_prices, strike_prices, times_to_expiry, risk_free_rates, iv,
-            q=0, model='black_scholes', return_as='numpy'
-        )
+        if engine == 'warm_start':
+            # Solve IV per contract with warm starts and derive all Greeks from shared d1/d2 terms
+            contract_ids = options_data.groupby(['strike_price', 'option_type', 'expiry_date'], sort=False, observed=True).ngroup().values
+            is_call = option_types == 'c'
+            iv, solver_info = implied_volatility_warm_start(
+                option_prices, spot_prices, strike_prices, times_to_expiry, risk_free_rates, is_call, contract_ids
+            )
+            delta, gamma, rho, theta = black_scholes_greeks(
+                spot_prices, strike_prices, times_to_expiry, risk_free_rates, iv, is_call
+            )
+            options_data.attrs['iv_solver'] = solver_info
+        else:
+            # Calculate IV and Greeks using vectorized functions
+            iv = vectorized_implied_volatility(
+                option_prices, spot_prices, strike_prices, times_to_expiry, risk_free_rates, option_types,
+                q=0, on_error='warn', model=IV_MODEL, return_as='numpy'
+            )
+            delta = vectorized_delta(
+                option_types, spot_prices, strike_prices, times_to_expiry, risk_free_rates, iv,
+                q=0, model=GREEKS_MODEL, return_as='numpy'
+            )
+            gamma = vectorized_gamma(
+                option_types, spot_prices, strike_prices, times_to_expiry, risk_free_rates, iv,
+                q=0, model=GREEKS_MODEL, return_as='numpy'
+            )
+            rho = vectorized_rho(
+                option_types, spot_prices, strike_prices, times_to_expiry, risk_free_rates, iv,
+                q=0, model=GREEKS_MODEL, return_as='numpy'
+            )
+            theta = vectorized_theta(
+                option_types, spot_prices, strike_prices, times_to_expiry, risk_free_rates, iv,
+                q=0, model=GREEKS_MODEL, return_as='numpy'
+            )
         
     except ZeroDivisionError as e:
         # Handle ZeroDivisionError by assigning NaNs to IV and Greeks arrays
@@ -0,0 +1,211 @@
+import numpy as np
+import pandas as pd
+from executionLayer.sessionClock import SessionClock, SESSION_OPEN
+
+# Option type axis of the dense chain arrays
+OPTION_TYPES = ('CE', 'PE')
+
+# Pointer value meaning "no quote in the searched range"
+NO_QUOTE = np.iinfo(np.int64).max // 2
+
+# Fields copied into dense arrays when present in the chain
+CHAIN_INDEX_FIELDS = ['option_price', 'iv', 'delta', 'gamma', 'theta', 'rho']
+
+
+class ChainIndex:
+    """
+    Dense per-day view of an option chain for O(1) leg lookups.
+
+    Every field is stored as an array of shape (n_strikes, 2, n_seconds) whose
+    axes are strike bucket, option type (CE=0, PE=1) and integer second of the
+    session, alongside a presence mask of the same shape. Time is the innermost
+    axis so the series of one contract is a contiguous slice. A pointer array
+    of the same shape holds, for every second, the first second at or after it
+    with a quote, so gaps in the data are skipped with a single lookup.
+    Seconds are those of the day's SessionClock.
+    """
+    def __init__(self, options_data, fields=None, session_open=SESSION_OPEN, dtype=np.float64, clock=None):
+        """
+        Build the index from an option chain indexed by timestamp.
+
+        Parameters:
+        - options_data (pd.DataFrame): Option chain with 'strike_price', 'option_type' and the fields to index.
+        - fields (list or None): Columns to index, defaults to the CHAIN_INDEX_FIELDS present in the chain.
+        - session_open (datetime.time): Time mapped to second 0 when no clock is given.
+        - dtype: Floating dtype of the value arrays.
+        - clock (SessionClock or None): Time axis of the day, None for SessionClock.for_index of the chain.
+        """
+        if fields is None:
+            fields = [field for field in CHAIN_INDEX_FIELDS if field in options_data.columns]
+        self.fields = list(fields)
+
+        self.clock = SessionClock.for_index(options_data.index, session_open) if clock is None else clock
+        seconds = self.clock.seconds_of(options_data.index)
+        self.n_seconds = int(seconds.max()) + 1 if len(seconds) else 0
+
+        self.strikes = np.unique(options_data['strike_price'].values)
+        self.strike_lookup = {float(strike): position for position, strike in enumerate(self.strikes)}
+        strike_positions = np.searchsorted(self.strikes, options_data['strike_price'].values)
+
+        option_types = options_data['option_type'].values
+        type_positions = np.full(len(options_data), -1, dtype=np.int64)
+        for position, option_type in enumerate(OPTION_TYPES):
+            type_positions[option_types == option_type] = position
+        valid = type_positions >= 0
+
+        shape = (len(self.strikes), len(OPTION_TYPES), self.n_seconds)
+        rows = (strike_positions[valid], type_positions[valid], seconds[valid])
+
+        self.present = np.zeros(shape, dtype=bool)
+        self.present[rows] = True
+
+        # Backward running minimum of the quoted seconds; n_seconds marks "no later quote"
+        pointer_dtype = np.int32 if self.n_seconds < np.iinfo(np.int32).max else np.int64
+        quoted = np.where(self.present, np.arange(self.n_seconds, dtype=pointer_dtype), pointer_dtype(self.n_seconds))
+        self.next_quote = np.minimum.accumulate(quoted[..., ::-1], axis=-1)[..., ::-1]
+
+        self.values = {}
+        for field in self.fields:
+            array = np.full(shape, np.nan, dtype=dtype)
+            array[rows] = options_data[field].values[valid]
+            self.values[field] = array
+
+    def second_of(self, timestamp):
+        return self.clock.second_of(timestamp)
+
+    def timestamp_of(self, second):
+        return self.clock.timestamp_of(second)
+
+    def datetime64_of(self, second):
+        return self.clock.datetime64_of(second)
+
+    def contract(self, strike_price, option_type):
+        """
+        Return the (strike bucket, type) coordinates of a contract.
+
+        Returns:
+        - Tuple or None: (strike_position, type_position), None when the chain has no such contract.
+        """
+        strike_position = self.strike_lookup.get(float(strike_price))
+        if strike_position is None or option_type not in OPTION_TYPES:
+            return None
+        return strike_position, OPTION_TYPES.index(option_type)
+
+    def first_present(self, contract, start, stop=None):
+        """
+        Return the first second in [start, stop) at which the contract has a quote.
+
+        Parameters:
+        - contract (tuple): Coordinates from contract().
+        - start (int): First second to check.
+        - stop (int or None): Exclusive upper bound, None for the end of the session.
+
+        Returns:
+        - second (int or None): Second of the quote, None when there is none.
+        """
+        start = max(int(start), 0)
+        stop = self.n_seconds if stop is None else min(int(stop), self.n_seconds)
+        if start >= stop:
+            return None
+        second = int(self.next_quote[contract[0], contract[1], start])
+        return second if second < stop else None
+
+    def next_present(self, contract, start, stop):
+        """
+        Return, for every second in [start, stop), the first second at or after it with a quote.
+
+        Parameters:
+        - contract (tuple): Coordinates from contract().
+        - start (int): First second of the range.
+        - stop (int): Exclusive end of the range.
+
+        Returns:
+        - pointers (np.ndarray): Absolute seconds, NO_QUOTE where the contract has no later quote in the range.
+        """
+        start, stop = int(start), int(stop)
+        pointers = np.full(max(stop - start, 0), NO_QUOTE, dtype=np.int64)
+        lo, hi = max(start, 0), min(stop, self.n_seconds)
+        if lo < hi:
+            following = self.next_quote[contract[0], contract[1], lo:hi]
+            pointers[lo - start:hi - start] = np.where(following < hi, following, NO_QUOTE)
+        return pointers
+
+    def staleness(self, contract, start, stop):
+        """
+        Return, for every second in [start, stop), how many seconds pass until the contract's next quote.
+
+        A quote waited for at most max_retries - 1 seconds is the one the retry loops accept.
+
+        Returns:
+        - waits (np.ndarray): Seconds to the next quote, NO_QUOTE where there is none in the range.
+        """
+        pointers = self.next_present(contract, start, stop)
+        return np.where(pointers == NO_QUOTE, NO_QUOTE, pointers - np.arange(int(start), int(stop)))
+
+    def missing_stats(self):
+        """
+        Per-contract data quality of the day.
+
+        Gaps are counted between a contract's first and last quote; seconds
+        before the first quote or after the last one are not missing data.
+
+        Returns:
+        - stats (pd.DataFrame): Indexed by (strike_price, option_type) with 'quoted_seconds', 'first_quote',
+          'last_quote', 'missing_seconds', 'coverage' (quoted share of the active span), 'gaps' (number of
+          runs of missing seconds) and 'longest_gap' (seconds).
+        """
+        present = self.present.reshape(-1, self.n_seconds)
+        following = self.next_quote.reshape(-1, self.n_seconds).astype(np.int64)
+        seconds = np.arange(self.n_seconds)
+
+        quoted = present.sum(axis=1)
+        has_quotes = quoted > 0
+        first = np.where(has_quotes, following[:, 0], 0)
+        last = np.where(has_quotes, self.n_seconds - 1 - np.argmax(present[:, ::-1], axis=1), -1)
+        span = np.maximum(last - first + 1, 0)
+        active = (seconds >= first[:, None]) & (seconds <= last[:, None])
+
+        # A gap starts at a missing second whose predecessor is quoted; its length is the wait for the next quote
+        gap_start = np.zeros_like(present)
+        gap_start[:, 1:] = present[:, :-1] & ~present[:, 1:]
+        gap_start &= active
+        waits = np.where(active & ~present, following - seconds, 0)
+
+        index = pd.MultiIndex.from_product([self.strikes, OPTION_TYPES], names=['strike_price', 'option_type'])
+        stats = pd.DataFrame({
+            'quoted_seconds': quoted,
+            'first_quote': np.where(has_quotes, first, -1),
+            'last_quote': last,
+            'missing_seconds': span - quoted,
+            'coverage': np.where(span > 0, quoted / np.maximum(span, 1), np.nan),
+            'gaps': gap_start.sum(axis=1),
+            'longest_gap': waits.max(axis=1) if self.n_seconds else 0
+        }, index=index)
+        for column in ('first_quote', 'last_quote'):
+            stats[column] = [self.timestamp_of(second) if second >= 0 else pd.NaT for second in stats[column]]
+        return stats
+
+    def quote(self, contract, second):
+        """
+        Return all indexed fields of a contract at a second.
+
+        Returns:
+        - quote (dict): Field name -> value.
+        """
+        strike_position, type_position = contract
+        return {field: self.values[field][strike_position, type_position, second] for field in self.fields}
+
+    def series(self, field, contract, start=0, stop=None):
+        """
+        Return a zero-copy view of a field for one contract over [start, stop).
+        """
+        return self.values[field][contract[0], contract[1], start:stop]
+
+    def lookup(self, field, seconds, strike_positions, type_positions):
+        """
+        Vectorized lookup of a field for many (second, strike bucket, type) triples.
+        """
+        return self.values[field][strike_positions, type_positions, seconds]
+
+    def nbytes(self):
+        return self.present.nbytes + self.next_quote.nbytes + sum(array.nbytes for array in self.values.values())
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Declared storage of option chain columns: column -> (dtype, largest absolute change allowed by narrowing).
+# Categorical columns store each distinct value (option type, expiry) once and a small code per row.
+CHAIN_SCHEMA = {
+    'option_type': ('category', None),
+    'expiry_date': ('category', None),
+    'strike_price': ('int32', 0.0),
+    'option_price': ('float32', 0.005),
+    'spot_price': ('float32', 0.005),
+    'Difference': ('float32', 0.005),
+    'time_to_expiry_days': ('float32', 1e-7),
+    'iv': ('float32', 1e-6),
+    'delta': ('float32', 1e-6),
+    'gamma': ('float32', 1e-8),
+    'rho': ('float32', 1e-4),
+    'theta': ('float32', 1e-4)
+}
+
+
+def _narrow(values, dtype, atol):
+    """
+    Return values cast to dtype when every value survives within atol, None otherwise.
+    """
+    values = np.asarray(values)
+    if values.dtype == np.dtype(dtype):
+        return values
+    if np.dtype(dtype).kind in 'iu':
+        if not np.isfinite(values).all():
+            return None
+        info = np.iinfo(dtype)
+        if values.size and (values.min() < info.min or values.max() > info.max):
+            return None
+    narrowed = values.astype(dtype)
+    with np.errstate(invalid='ignore'):
+        error = np.abs(narrowed.astype(np.float64) - values)
+    if np.nanmax(error, initial=0.0) > atol:
+        return None
+    return narrowed
+
+
+def compact_chain(options_data, schema=CHAIN_SCHEMA):
+    """
+    Store an option chain with the compact dtypes of a schema.
+
+    Categorical columns become pandas categoricals. Numeric columns are narrowed
+    only when no value moves by more than the column's tolerance; a column
+    that would lose precision (e.g. fractional strikes) keeps its dtype.
+    Columns missing from the chain or the schema are left alone.
+
+    Parameters:
+    - options_data (pd.DataFrame): Option chain, modified in place.
+    - schema (dict): Column -> (dtype, tolerance), see CHAIN_SCHEMA.
+
+    Returns:
+    - options_data (pd.DataFrame): The same chain.
+    """
+    if options_data is None or not isinstance(options_data, pd.DataFrame):
+        return options_data
+    for column, (dtype, atol) in schema.items():
+        if column not in options_data.columns:
+            continue
+        if dtype == 'category':
+            if not isinstance(options_data[column].dtype, pd.CategoricalDtype):
+                options_data[column] = options_data[column].astype('category')
+            continue
+        narrowed = _narrow(options_data[column].values, dtype, atol)
+        if narrowed is not None:
+            options_data[column] = narrowed
+    return options_data
+
+
+def chain_memory(options_data):
+    """
+    Memory held by a chain in bytes, index and object contents included.
+    """
+    if options_data is None or not isinstance(options_data, pd.DataFrame):
+        return 0
+    return int(options_data.memory_usage(index=True, deep=True).sum())
+
+
+def memory_report(memory_log):
+    """
+    Tabulate chain memory per day and processing stage.
+
+    Stages such as 'chain_index' and 'strike_table' hold the size of the structure
+    built from the chain rather than the chain's own, so a day's working set is
+    its last chain stage plus those structures.
+
+    Parameters:
+    - memory_log (list): Records with 'date', 'stage', 'rows' and 'bytes' (see DataHandler.memory_log).
+
+    Returns:
+    - report (pd.DataFrame): One row per day, megabytes per stage in the order stages were logged,
+      plus 'rows'.
+    """
+    log = pd.DataFrame(memory_log, columns=['date', 'stage', 'rows', 'bytes'])
+    stages = list(dict.fromkeys(log['stage']))
+    report = log.pivot_table(index='date', columns='stage', values='bytes', aggfunc='last').reindex(columns=stages) / 1e6
+    report.columns.name = None
+    report['rows'] = log.groupby('date')['rows'].max()
+    return report
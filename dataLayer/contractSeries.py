@@ -0,0 +1,157 @@
+from collections import OrderedDict
+import numpy as np
+from executionLayer.sessionClock import SessionClock, SESSION_OPEN
+from .chainIndex import CHAIN_INDEX_FIELDS
+
+
+class ContractSeries:
+    """
+    Quotes of one contract (strike, option type) for a day.
+
+    Prices and Greeks are contiguous arrays in chain order, indexed by the
+    integer second of the day's SessionClock. since() returns a ContractSeries
+    over views of the same arrays.
+    """
+    def __init__(self, strike_price, option_type, clock, seconds, values):
+        self.strike_price = strike_price
+        self.option_type = option_type
+        self.clock = clock
+        self.seconds = seconds
+        self.values = values
+
+    def __len__(self):
+        return len(self.seconds)
+
+    def second_of(self, timestamp):
+        return self.clock.second_of(timestamp)
+
+    def timestamp_of(self, second):
+        return self.clock.timestamp_of(second)
+
+    def datetime64_of(self, second):
+        return self.clock.datetime64_of(second)
+
+    def since(self, timestamp):
+        """
+        Return the quotes at or after timestamp as views of this series.
+        """
+        start = int(np.searchsorted(self.seconds, self.second_of(timestamp), side='left'))
+        return ContractSeries(self.strike_price, self.option_type, self.clock, self.seconds[start:],
+                              {field: values[start:] for field, values in self.values.items()})
+
+    def first_present(self, start, stop=None):
+        """
+        Return the position of the first quote in seconds [start, stop), None when there is none.
+        """
+        position = int(np.searchsorted(self.seconds, start, side='left'))
+        if position == len(self.seconds) or (stop is not None and self.seconds[position] >= stop):
+            return None
+        return position
+
+    def quote(self, position):
+        """
+        Return the fields of the quote at a position as a dict.
+        """
+        return {field: values[position] for field, values in self.values.items()}
+
+    def nbytes(self):
+        return self.seconds.nbytes + sum(values.nbytes for values in self.values.values())
+
+
+class ContractSeriesCache:
+    """
+    LRU cache of per-contract series for one day of an option chain.
+
+    The chain's rows are grouped by (strike_price, option_type) once, on the
+    first miss. A contract's series is then gathered from its rows when it is
+    first requested and kept until max_contracts more recently used contracts
+    push it out, so strikes that recur during the session are served without
+    touching the chain again.
+    """
+    def __init__(self, options_data, max_contracts=64, fields=None, session_open=SESSION_OPEN, clock=None):
+        """
+        Initialize the cache.
+
+        Parameters:
+        - options_data (pd.DataFrame): Option chain indexed by timestamp with 'strike_price' and 'option_type'.
+        - max_contracts (int): Number of contract series kept.
+        - fields (list or None): Columns cached, defaults to the CHAIN_INDEX_FIELDS present in the chain.
+        - session_open (datetime.time): Time mapped to second 0 when no clock is given.
+        - clock (SessionClock or None): Time axis of the day, None for SessionClock.for_index of the chain.
+        """
+        if fields is None:
+            fields = [field for field in CHAIN_INDEX_FIELDS if field in options_data.columns]
+        self.options_data = options_data
+        self.fields = list(fields)
+        self.max_contracts = max_contracts
+
+        self.clock = SessionClock.for_index(options_data.index, session_open) if clock is None else clock
+        self.seconds = self.clock.seconds_of(options_data.index)
+
+        self.contract_rows = None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.peak_bytes = 0
+
+    def _rows(self, strike_price, option_type):
+        if self.contract_rows is None:
+            groups = self.options_data.groupby(['strike_price', 'option_type'], observed=True, sort=False).indices
+            self.contract_rows = {(float(strike), str(kind)): rows for (strike, kind), rows in groups.items()}
+        return self.contract_rows.get((float(strike_price), str(option_type)))
+
+    def _build(self, strike_price, option_type):
+        rows = self._rows(strike_price, option_type)
+        if rows is None:
+            return None
+        seconds = self.seconds[rows]
+        if not (np.diff(seconds) >= 0).all():
+            rows = rows[np.argsort(seconds, kind='stable')]
+            seconds = self.seconds[rows]
+        values = {field: np.ascontiguousarray(self.options_data[field].values[rows]) for field in self.fields}
+        return ContractSeries(strike_price, option_type, self.clock, seconds, values)
+
+    def get(self, strike_price, option_type):
+        """
+        Return the series of a contract, None when the chain has no quote for it.
+        """
+        key = (float(strike_price), str(option_type))
+        series = self.entries.get(key)
+        if series is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return series
+
+        self.misses += 1
+        series = self._build(strike_price, option_type)
+        if series is None:
+            return None
+        self.entries[key] = series
+        while len(self.entries) > self.max_contracts:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self.peak_bytes = max(self.peak_bytes, self.nbytes())
+        return series
+
+    def nbytes(self):
+        return sum(series.nbytes() for series in self.entries.values())
+
+    def stats(self):
+        """
+        Return cache statistics.
+
+        Returns:
+        - stats (dict): hits, misses, hit_rate, evictions, contracts (currently cached), bytes (held now)
+          and peak_bytes.
+        """
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'evictions': self.evictions,
+            'contracts': len(self.entries),
+            'bytes': self.nbytes(),
+            'peak_bytes': self.peak_bytes
+        }
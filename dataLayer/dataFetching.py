@@ -1,56 +1,77 @@
 import pandas as pd
+from .dataStore import PickleStore
 
-def get_option_data(ticker, year, month, day):
+# Default backend keeps reading the legacy per-day pickle tree
+default_store = PickleStore()
+
+def get_option_data(ticker, year, month, day, store=None, columns=None, start_time=None, end_time=None, strike_range=None):
     """
-    Retrieve options data from pickle files based on the ticker, year, month, and day.
+    Retrieve options data from the storage backend based on the ticker, year, month, and day.
 
     Parameters:
     - ticker (str): Ticker symbol ('BANKNIFTY' or 'NIFTY').
     - year (int): Year of the data.
     - month (int): Month of the data.
     - day (int): Day of the data.
+    - store (PickleStore, ParquetStore or None): Storage backend, defaults to the pickle tree.
+    - columns (list or None): Columns to load (e.g. dataStore.BACKTEST_OPTION_COLUMNS), None for all.
+    - start_time (datetime.time or None): Inclusive intraday lower bound.
+    - end_time (datetime.time or None): Inclusive intraday upper bound.
+    - strike_range (tuple or None): Inclusive (low, high) strike bounds.
 
     Returns:
     - data (pd.DataFrame or None): DataFrame containing options data if successful, None if unsuccessful.
     """
+    store = store if store is not None else default_store
     try:
-        if ticker == 'BANKNIFTY':
-            data = pd.read_pickle(r"D:\BNFDATA\options_data_backtest\pickles\{}_{}_{}.pkl".format(day, month, year))
-            if not data.empty:
-                return data
-            
-        elif ticker == 'NIFTY':
-            data = pd.read_pickle(r"D:\NIFTYDATA\options_data\pickles\{}_{}_{}.pkl".format(day, month, year))
-            if not data.empty:
-                return data
+        data = store.read_options(ticker, year, month, day, columns=columns, start_time=start_time,
+                                  end_time=end_time, strike_range=strike_range)
+        if data is not None and not data.empty:
+            return data
     except Exception as e:
         print(f"Error occurred while retrieving options data: {e}")
         return None
 
-def get_futures_data(ticker, year, month, day):
+def get_futures_data(ticker, year, month, day, store=None, columns=None, start_time=None, end_time=None):
     """
-    Retrieve futures data from pickle files based on the ticker, year, month, and day.
+    Retrieve futures data from the storage backend based on the ticker, year, month, and day.
 
     Parameters:
     - ticker (str): Ticker symbol ('BANKNIFTY' or 'NIFTY').
     - year (int): Year of the data.
     - month (int): Month of the data.
     - day (int): Day of the data.
+    - store (PickleStore, ParquetStore or None): Storage backend, defaults to the pickle tree.
+    - columns (list or None): Columns to load, None for all.
+    - start_time (datetime.time or None): Inclusive intraday lower bound.
+    - end_time (datetime.time or None): Inclusive intraday upper bound.
 
     Returns:
     - data (pd.DataFrame or None): DataFrame containing futures data if successful, None if unsuccessful.
     """
+    store = store if store is not None else default_store
     try:
-        if ticker == 'BANKNIFTY':
-            data = pd.read_pickle(r"D:\Banknifty Futures\{}\{}\{}_{}_{}.pkl".format(ticker, year, day, month, year))
-            if not data.empty:
-                return data
-            
-        elif ticker == 'NIFTY':
-            data = pd.read_pickle(r"D:\Banknifty Futures\{}\{}\{}_{}_{}.pkl".format(ticker, year, day, month, year))
-            if not data.empty:
-                return data
-            
+        data = store.read_futures(ticker, year, month, day, columns=columns, start_time=start_time, end_time=end_time)
+        if data is not None and not data.empty:
+            return data
+
     except Exception as e:
         print(f"Error occurred while retrieving futures data: {e}")
         return None
+
+def has_futures_data(ticker, year, month, day, store=None):
+    """
+    Check whether the storage backend holds futures data for a day, without reading it.
+
+    Parameters:
+    - ticker (str): Ticker symbol ('BANKNIFTY' or 'NIFTY').
+    - year (int): Year of the data.
+    - month (int): Month of the data.
+    - day (int): Day of the data.
+    - store (PickleStore, ParquetStore or None): Storage backend, defaults to the pickle tree.
+
+    Returns:
+    - exists (bool): True if the day has a futures file.
+    """
+    store = store if store is not None else default_store
+    return store.has_futures(ticker, year, month, day)
@@ -1,27 +1,113 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from .dataFetching import get_option_data, get_futures_data
+from .dataFetching import get_option_data, get_futures_data, has_futures_data
 from .ohlcBuilder import create_ohlc_candles
-from .applying_indicators import apply_indicators
-from .calculateGreeks import calculate_iv_and_greeks
+from .applying_indicators import apply_indicators, indicator_params
+from .greeksCache import calculate_iv_and_greeks_cached
+from .lazyGreeks import LazyGreeks
+from .chainIndex import ChainIndex
+from .strikeTable import StrikeTable
+from .contractSeries import ContractSeriesCache
+from .warmupCache import prepend_warmup, tail_start_time
+from .dayPrefetcher import DayPrefetcher
+from .chainSchema import compact_chain, chain_memory
 from strategyLayer.createLegs import *
 from strategyLayer.positionClass import *
 from strategyLayer.strategyClass import *
 from executionLayer.spreadStrategiesBacktester import *
+from executionLayer.sessionClock import SessionClock, SESSION_OPEN, SESSION_CLOSE, ENTRY_CUTOFF
 from signalLayer.signalsOnFutures import *
 import time
 
+# Indicator tags passed to Signals.four_tags
+SIGNAL_TAGS = ['ulcer_index_rsi', 'kc_low_rsi', 'kc_low_rsi', 'kc_low_rsi']
+
 class DataHandler:
-    def __init__(self, ticker, timeframe):
+    def __init__(self, ticker, timeframe, store=None, option_columns=None, greeks_cache=None,
+                 greeks_engine='py_vollib', greeks_mode='full', use_chain_index=True,
+                 exit_engine='vectorized', max_positions=None, margin_cap=None, compute_all_indicators=False,
+                 warmup_cache=None, prefetch_depth=2, prefetch_workers=2, prefetch_max_bytes=None,
+                 compact_chains=False, track_memory=False, series_cache_size=64, session_open=SESSION_OPEN,
+                 session_close=SESSION_CLOSE, entry_cutoff=ENTRY_CUTOFF):
         """
         Initialize DataHandler with ticker symbol and timeframe.
 
         Args:
         - ticker (str): Ticker symbol for the financial instrument (e.g., 'BANKNIFTY').
         - timeframe (str): Timeframe for OHLC data (e.g., '1T' for 1-minute intervals).
+        - store (PickleStore, ParquetStore or None): Storage backend, defaults to the legacy pickle tree.
+        - option_columns (list or None): Option chain columns to load (e.g. BACKTEST_OPTION_COLUMNS), None for all.
+        - greeks_cache (GreeksCache or None): On-disk IV/Greeks cache, None to always recompute.
+        - greeks_engine (str): IV/Greeks engine, 'py_vollib' or 'warm_start'.
+        - greeks_mode (str): 'full' computes Greeks for the whole chain up front (research),
+          'lazy' keeps prices only and computes Greeks for contracts legs actually touch.
+        - use_chain_index (bool): Whether leg entry and exit lookups go through a dense ChainIndex.
+        - exit_engine (str): 'vectorized' finds exits in one pass over the ChainIndex, 'loop' checks
+          every second (always used without a chain index).
+        - max_positions (int or None): Run the multi-position portfolio engine with this many concurrent
+          positions (requires the chain index), None for one position at a time.
+        - margin_cap (float or None): Maximum absolute margin of open positions in portfolio mode.
+        - compute_all_indicators (bool): Compute every indicator instead of only those SIGNAL_TAGS need.
+        - warmup_cache (WarmupCache or None): Cache of session tails used to seed each day's indicators
+          with the previous session, None to compute every day from its own candles only.
+        - prefetch_depth (int): Days read ahead by fetch_and_process_days while the current day is backtested.
+        - prefetch_workers (int): Threads reading days ahead.
+        - prefetch_max_bytes (int or None): Limit on the size of days read ahead, loaded or in flight, None for
+          unlimited.
+        - compact_chains (bool): Store option chains with the compact dtypes of CHAIN_SCHEMA as they are loaded.
+        - track_memory (bool): Record the chain's memory after each stage, and the size of the day's ChainIndex
+          and StrikeTable, in self.memory_log (see memory_report).
+        - series_cache_size (int or None): Contracts kept in the per-day ContractSeriesCache used for leg lookups
+          without a chain index, None to filter and merge the chain at each entry. Cache statistics of every
+          day are kept in self.series_cache_stats.
+        - session_open, session_close (datetime.time): Session bounds; session_open is second 0 of each
+          day's integer time axis (SessionClock).
+        - entry_cutoff (datetime.time): Last time exits are checked, no entries at or after it.
         """
         self.ticker = ticker
         self.timeframe = timeframe
+        self.store = store
+        self.option_columns = option_columns
+        self.greeks_cache = greeks_cache
+        self.greeks_engine = greeks_engine
+        self.greeks_mode = greeks_mode
+        self.use_chain_index = use_chain_index
+        self.exit_engine = exit_engine
+        self.max_positions = max_positions
+        self.margin_cap = margin_cap
+        self.compute_all_indicators = compute_all_indicators
+        self.warmup_cache = warmup_cache
+        self.prefetch_depth = prefetch_depth
+        self.prefetch_workers = prefetch_workers
+        self.prefetch_max_bytes = prefetch_max_bytes
+        self.prefetch_stats = None
+        self.compact_chains = compact_chains
+        self.track_memory = track_memory
+        self.memory_log = []
+        self.series_cache_size = series_cache_size
+        self.series_cache_stats = []
+        self.session_open = session_open
+        self.session_close = session_close
+        self.entry_cutoff = entry_cutoff
+
+    def compute_greeks(self, date, options_data):
+        """
+        Add IV/Greeks to the option chain according to the configured Greeks mode.
+
+        Args:
+        - date (datetime): Trading day of the chain.
+        - options_data (DataFrame or None): Option chain.
+
+        Returns:
+        - DataFrame or tuple: Chain with Greeks (full mode), chain with prices only (lazy mode),
+          or (None, None) when there is no data.
+        """
+        if self.greeks_mode == 'lazy':
+            if options_data is None or options_data.empty:
+                return None, None
+            return options_data
+        return calculate_iv_and_greeks_cached(options_data, self.greeks_cache, self.ticker, date, engine=self.greeks_engine)
 
     def process_data(self, date, futures_data, options_data, timeframe):
         """
@@ -37,67 +123,257 @@ class DataHandler:
         - Tuple: Processed data including OHLC candles, RSI indicator, and processed options data.
         """
         if futures_data is None:
-            options_data_processed = calculate_iv_and_greeks(options_data)
+            options_data_processed = self.compute_greeks(date, options_data)
             return date, None, None, options_data_processed
 
         ohlc_data = create_ohlc_candles(futures_data, timeframe)
-        indicator_data, indicator_rsi, indicator_stoch = apply_indicators(ohlc_data.copy())
-        options_data_processed = calculate_iv_and_greeks(options_data)
+        indicators = None if self.compute_all_indicators else list(dict.fromkeys(SIGNAL_TAGS))
+        if self.warmup_cache is not None:
+            indicator_data, indicator_rsi, indicator_stoch = self.apply_indicators_with_warmup(date, ohlc_data, indicators, timeframe)
+        else:
+            indicator_data, indicator_rsi, indicator_stoch = apply_indicators(ohlc_data.copy(), indicators)
+        options_data_processed = self.compute_greeks(date, options_data)
+        if self.compact_chains:
+            compact_chain(options_data_processed)
+        self.record_memory(date, 'greeks', options_data_processed)
         
         return date, ohlc_data, indicator_rsi, options_data_processed
 
-    def fetch_data(self, date):
+    def load_warmup(self, date, timeframe, params):
+        """
+        Return the trailing bars of the session before date.
+
+        The previous session is the latest earlier day of the cache's calendar,
+        or the latest earlier day with futures data. Its tail comes from the
+        warmup cache; on a miss (e.g. the first day of a date shard whose
+        predecessor belongs to another worker), only the end of that session's
+        futures ticks is read to rebuild it, and the rebuilt tail is stored for
+        the next lookup.
+
+        Args:
+        - date (datetime): Trading day being processed.
+        - timeframe (str): Timeframe for OHLC data.
+        - params (dict): Indicator parameters.
+
+        Returns:
+        - DataFrame or None: Trailing OHLC bars, None when no previous session is found.
+        """
+        cache = self.warmup_cache
+        key = cache.make_key(timeframe, params)
+        session, warmup = cache.previous(self.ticker, date, key, self.has_futures)
+        if session is None or warmup is not None:
+            return warmup
+
+        n_bars = cache.n_bars(params, timeframe)
+        futures_data = get_futures_data(self.ticker, session.year, session.month, session.day, store=self.store,
+                                        start_time=tail_start_time(timeframe, n_bars, cache.session_close))
+        if futures_data is None:
+            return None
+        ohlc_data = create_ohlc_candles(futures_data, timeframe)
+        cache.put(self.ticker, session, key, ohlc_data, n_bars)
+        return ohlc_data.iloc[-n_bars:]
+
+    def has_futures(self, date):
+        """
+        Return whether the store holds futures data for a day.
+        """
+        return has_futures_data(self.ticker, date.year, date.month, date.day, store=self.store)
+
+    def apply_indicators_with_warmup(self, date, ohlc_data, indicators, timeframe):
+        """
+        Apply indicators over the previous session's tail followed by this session, then store this session's tail.
+
+        Args:
+        - date (datetime): Trading day of ohlc_data.
+        - ohlc_data (DataFrame): Candles of the session.
+        - indicators (list or None): Columns needed downstream, None for every indicator.
+        - timeframe (str): Timeframe for OHLC data.
+
+        Returns:
+        - Tuple: Same frames as apply_indicators, restricted to the session's own bars.
+        """
+        params = indicator_params()
+        warmup = self.load_warmup(date, timeframe, params)
+        seeded = prepend_warmup(ohlc_data, warmup)
+        n_warmup = len(seeded) - len(ohlc_data)
+
+        frames = apply_indicators(seeded.copy(), indicators)
+        cache = self.warmup_cache
+        # Only the session's own bars are stored, as a rebuild from its ticks would produce
+        cache.put(self.ticker, date, cache.make_key(timeframe, params), ohlc_data, cache.n_bars(params, timeframe))
+        return tuple(frame.iloc[n_warmup:] for frame in frames)
+
+    def load_day(self, date):
+        """
+        Read the raw futures and options data of a given date, without processing it.
+
+        Args:
+        - date (datetime): Date for which data is read.
+
+        Returns:
+        - Tuple: (futures_data, options_data), either of which may be None.
+        """
+        futures_data = get_futures_data(self.ticker, date.year, date.month, date.day, store=self.store)
+        options_data = get_option_data(self.ticker, date.year, date.month, date.day, store=self.store,
+                                       columns=self.option_columns)
+        self.record_memory(date, 'loaded', options_data)
+        if self.compact_chains:
+            compact_chain(options_data)
+            self.record_memory(date, 'compacted', options_data)
+        return futures_data, options_data
+
+    def record_memory(self, date, stage, options_data, nbytes=None):
+        """
+        Append memory after a processing stage to self.memory_log when track_memory is set.
+
+        Without nbytes the stage's size is the chain's memory; structures built from the
+        chain (ChainIndex, StrikeTable) pass their own nbytes() and log as stages of their own.
+        """
+        if self.track_memory and isinstance(options_data, pd.DataFrame):
+            self.memory_log.append({'date': date, 'stage': stage, 'rows': len(options_data),
+                                    'bytes': chain_memory(options_data) if nbytes is None else nbytes})
+
+    def fetch_data(self, date, loaded=None):
         """
         Fetch futures and options data for a given date and process it.
 
         Args:
         - date (datetime): Date for which data is fetched.
+        - loaded (tuple or None): Raw data already read by load_day, None to read it now.
 
         Returns:
         - Tuple: Processed data from process_data method.
         """
-        futures_data = get_futures_data(self.ticker, date.year, date.month, date.day)
-        options_data = get_option_data(self.ticker, date.year, date.month, date.day)
+        futures_data, options_data = self.load_day(date) if loaded is None else loaded
         return self.process_data(date, futures_data, options_data, self.timeframe)
 
-    def fetch_and_process_data(self, args):
+    def build_backtester(self, date, sl, tp, instruments_with_actions, sl_percentage_based, tp_percentage_based, strategy_type,
+                         loaded=None):
+        """
+        Fetch one day of data and set up a SpreadBacktester with classified signals.
+
+        Args:
+        - date (datetime): Trading day.
+        - sl, tp, instruments_with_actions, sl_percentage_based, tp_percentage_based, strategy_type:
+          SpreadBacktester parameters.
+        - loaded (tuple or None): Raw data already read by load_day, None to read it now.
+
+        Returns:
+        - SpreadBacktester or None: Backtester ready to execute, None when there is no data or no signals.
+        """
+        date, ohlc_data, indicator_data, options_data_processed = self.fetch_data(date, loaded)
+        
+        if options_data_processed is None or isinstance(options_data_processed, tuple):
+            return None  # Return None if options_data_processed is not valid
+        
+        options_data_processed.index = pd.to_datetime(options_data_processed.index)
+        
+        signal_generator = Signals(indicator_data, options_data_processed, 15, 95)
+        signal_df = signal_generator.four_tags(*SIGNAL_TAGS)
+        
+        if signal_df is None:
+            return None  # Return None if no valid signals are generated
+        
+        signal_df = signal_generator.clean_signals(signal_df)
+
+        # In lazy mode Greeks are computed only for the contracts and windows legs touch
+        greeks = LazyGreeks(options_data_processed, engine=self.greeks_engine) if self.greeks_mode == 'lazy' else None
+        # Every per-day structure shares the day's integer time axis
+        clock = SessionClock.for_index(options_data_processed.index, self.session_open, self.session_close, self.entry_cutoff)
+        # Compact chains get a float32 index as well
+        chain_index = (ChainIndex(options_data_processed, dtype=np.float32 if self.compact_chains else np.float64,
+                                  clock=clock)
+                       if self.use_chain_index else None)
+        strike_table = StrikeTable(options_data_processed, chain_index=chain_index, clock=clock)
+        if chain_index is not None:
+            self.record_memory(date, 'chain_index', options_data_processed, chain_index.nbytes())
+        self.record_memory(date, 'strike_table', options_data_processed, strike_table.nbytes())
+        series_cache = (ContractSeriesCache(options_data_processed, self.series_cache_size, clock=clock)
+                        if chain_index is None and self.series_cache_size else None)
+        exit_engine = (VectorizedExitEngine(chain_index, greeks, clock)
+                       if chain_index is not None and self.exit_engine == 'vectorized' else None)
+        
+        # Initialize SpreadBacktester to execute backtesting
+        return SpreadBacktester(options_data_processed, signal_df, sl, tp, instruments_with_actions,
+                                sl_percentage_based, tp_percentage_based, strategy_type, greeks,
+                                chain_index, exit_engine, self.max_positions or 1, self.margin_cap, strike_table,
+                                series_cache, clock)
+
+    def fetch_and_process_data(self, args, loaded=None):
         """
         Fetches and processes data for backtesting based on provided arguments.
 
         Args:
         - args (tuple): Tuple containing date, stop loss (sl), target profit (tp),
           instruments with actions, strategy type, and other parameters.
+        - loaded (tuple or None): Raw data already read by load_day, None to read it now.
 
         Returns:
         - Tuple: Trades and uncounted trades generated during backtesting.
         """
-        date, sl, tp, instruments_with_actions, sl_percentage_based, tp_percentage_based, strategy_type = args
-        date, ohlc_data, indicator_data, options_data_processed = self.fetch_data(date)
-        
-        if options_data_processed is not None:
-            if isinstance(options_data_processed, tuple):
-                return None  # Return None if options_data_processed is not valid
-            
-            options_data_processed.index = pd.to_datetime(options_data_processed.index)
-            
-            signal_generator = Signals(indicator_data, options_data_processed, 15, 95)
-            signal_df = signal_generator.four_tags('ulcer_index_rsi', 'kc_low_rsi', 'kc_low_rsi', 'kc_low_rsi')
-            
-            if signal_df is None:
-                return None  # Return None if no valid signals are generated
-            
-            signal_df = signal_generator.clean_signals(signal_df)
-            
-            # Initialize SpreadBacktester to execute backtesting
-            backtester = SpreadBacktester(options_data_processed, signal_df, sl, tp, instruments_with_actions,
-                                          sl_percentage_based, tp_percentage_based, strategy_type)
-            start_time = time.time()
-            starting_timestamp = backtester.classifying_signals()
-            trades, uncounted_trades = backtester.execute_trades(starting_timestamp)
-            end_time = time.time()
-            
-            elapsed_time = end_time - start_time
-            print(f"Processed {date} in {elapsed_time:.2f} seconds")
-            return trades, uncounted_trades
+        date = args[0]
+        backtester = self.build_backtester(*args, loaded=loaded)
+        if backtester is None:
+            return None
+
+        start_time = time.time()
+        starting_timestamp = backtester.classifying_signals()
+        if self.max_positions is not None:
+            trades, uncounted_trades = backtester.execute_portfolio(starting_timestamp)
         else:
-            return None  # Return None if options_data_processed is None
+            trades, uncounted_trades = backtester.execute_trades(starting_timestamp)
+        end_time = time.time()
+        
+        elapsed_time = end_time - start_time
+        print(f"Processed {date} in {elapsed_time:.2f} seconds")
+        if backtester.series_cache is not None:
+            stats = backtester.series_cache.stats()
+            self.series_cache_stats.append({'date': date, **stats})
+            print(f"Series cache for {date}: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_rate']:.1%}), {stats['peak_bytes'] / 1e6:.2f} MB peak")
+        return trades, uncounted_trades
+
+    def fetch_and_sweep(self, args):
+        """
+        Backtest a whole SL/TP grid for one day, loading data and building signals once.
+
+        Args:
+        - args (tuple): Same layout as fetch_and_process_data, with arrays of stop losses and
+          target profits (one entry per combination, broadcast against each other).
+
+        Returns:
+        - Tuple or None: Trades with 'combo_id' and combinations (see SpreadBacktester.sweep).
+        """
+        date, sl, tp, instruments_with_actions, sl_percentage_based, tp_percentage_based, strategy_type = args
+        backtester = self.build_backtester(date, 0, 0, instruments_with_actions, sl_percentage_based,
+                                           tp_percentage_based, strategy_type)
+        if backtester is None or backtester.chain_index is None:
+            return None
+
+        start_time = time.time()
+        starting_timestamp = backtester.classifying_signals()
+        trades, combinations = backtester.sweep(sl, tp, timestamp=starting_timestamp)
+        print(f"Swept {len(combinations)} combinations for {date} in {time.time() - start_time:.2f} seconds")
+        return trades, combinations
+
+    def fetch_and_process_days(self, args_list):
+        """
+        Backtest several days in order, reading upcoming days in the background.
+
+        While one day is backtested, a DayPrefetcher reads the next prefetch_depth
+        days, so file reads stay off the critical path. Pipeline statistics of the
+        run are kept in self.prefetch_stats.
+
+        Args:
+        - args_list (list): One fetch_and_process_data argument tuple per day, e.g. a contiguous
+          shard of dates handed to one worker.
+
+        Returns:
+        - list: fetch_and_process_data results, in the order of args_list.
+        """
+        prefetcher = DayPrefetcher(self.load_day, [args[0] for args in args_list], depth=self.prefetch_depth,
+                                   max_workers=self.prefetch_workers, max_bytes=self.prefetch_max_bytes)
+        # Several tuples may share a date (e.g. different SL/TP), so pair them with the prefetcher by position
+        results = [self.fetch_and_process_data(args, loaded) for args, (_, loaded) in zip(args_list, prefetcher)]
+        self.prefetch_stats = prefetcher.stats()
+        return results
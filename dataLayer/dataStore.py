@@ -0,0 +1,321 @@
+import os
+from datetime import datetime, time
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Columns the backtester actually reads from an option chain
+BACKTEST_OPTION_COLUMNS = ['option_price', 'strike_price', 'option_type', 'spot_price', 'expiry_date', 'Difference']
+
+# Name of the column holding the DataFrame index inside columnar files
+TIMESTAMP_COLUMN = '__timestamp__'
+
+
+def _time_bounds(year, month, day, start_time, end_time):
+    """
+    Convert optional intraday bounds into full timestamps for the given day.
+
+    Parameters:
+    - year (int), month (int), day (int): Trading day.
+    - start_time (datetime.time, str or None): Inclusive lower bound.
+    - end_time (datetime.time, str or None): Inclusive upper bound.
+
+    Returns:
+    - Tuple: (start, end) as pd.Timestamp or None.
+    """
+    bounds = []
+    for bound in (start_time, end_time):
+        if bound is None:
+            bounds.append(None)
+            continue
+        if isinstance(bound, str):
+            bound = pd.Timestamp(bound).time()
+        if isinstance(bound, time):
+            bound = datetime.combine(datetime(year, month, day), bound)
+        bounds.append(pd.Timestamp(bound))
+    return bounds[0], bounds[1]
+
+
+def filter_frame(data, columns=None, start=None, end=None, strike_range=None):
+    """
+    Apply column projection and time/strike predicates to an in-memory frame.
+
+    Parameters:
+    - data (pd.DataFrame): Frame indexed by timestamp.
+    - columns (list or None): Columns to keep.
+    - start (pd.Timestamp or None): Inclusive lower time bound.
+    - end (pd.Timestamp or None): Inclusive upper time bound.
+    - strike_range (tuple or None): Inclusive (low, high) strike bounds.
+
+    Returns:
+    - data (pd.DataFrame): Filtered frame.
+    """
+    mask = None
+    if start is not None:
+        mask = data.index >= start
+    if end is not None:
+        mask = (data.index <= end) if mask is None else (mask & (data.index <= end))
+    if strike_range is not None and 'strike_price' in data.columns:
+        low, high = strike_range
+        strike_mask = data['strike_price'].between(low, high).values
+        mask = strike_mask if mask is None else (mask & strike_mask)
+    if mask is not None:
+        data = data[mask]
+    if columns is not None:
+        data = data[[col for col in columns if col in data.columns]]
+    return data
+
+
+class PickleStore:
+    """
+    Storage backend for the legacy per-day pickle tree.
+
+    Pickles cannot be partially read, so projection and predicates are applied
+    after the whole day has been deserialized.
+    """
+    OPTION_PATHS = {
+        'BANKNIFTY': r"D:\BNFDATA\options_data_backtest\pickles\{day}_{month}_{year}.pkl",
+        'NIFTY': r"D:\NIFTYDATA\options_data\pickles\{day}_{month}_{year}.pkl",
+    }
+    FUTURES_PATHS = {
+        'BANKNIFTY': r"D:\Banknifty Futures\{ticker}\{year}\{day}_{month}_{year}.pkl",
+        'NIFTY': r"D:\Banknifty Futures\{ticker}\{year}\{day}_{month}_{year}.pkl",
+    }
+
+    def __init__(self, option_paths=None, futures_paths=None):
+        """
+        Initialize the store with path templates per ticker.
+
+        Parameters:
+        - option_paths (dict or None): Ticker -> path template for options pickles.
+        - futures_paths (dict or None): Ticker -> path template for futures pickles.
+        """
+        self.option_paths = option_paths if option_paths is not None else dict(self.OPTION_PATHS)
+        self.futures_paths = futures_paths if futures_paths is not None else dict(self.FUTURES_PATHS)
+
+    def option_path(self, ticker, year, month, day):
+        template = self.option_paths.get(ticker)
+        return None if template is None else template.format(ticker=ticker, year=year, month=month, day=day)
+
+    def futures_path(self, ticker, year, month, day):
+        template = self.futures_paths.get(ticker)
+        return None if template is None else template.format(ticker=ticker, year=year, month=month, day=day)
+
+    def _read(self, path, year, month, day, columns, start_time, end_time, strike_range):
+        if path is None:
+            return None
+        data = pd.read_pickle(path)
+        start, end = _time_bounds(year, month, day, start_time, end_time)
+        return filter_frame(data, columns, start, end, strike_range)
+
+    def read_options(self, ticker, year, month, day, columns=None, start_time=None, end_time=None, strike_range=None):
+        path = self.option_path(ticker, year, month, day)
+        return self._read(path, year, month, day, columns, start_time, end_time, strike_range)
+
+    def read_futures(self, ticker, year, month, day, columns=None, start_time=None, end_time=None):
+        path = self.futures_path(ticker, year, month, day)
+        return self._read(path, year, month, day, columns, start_time, end_time, None)
+
+    def has_futures(self, ticker, year, month, day):
+        path = self.futures_path(ticker, year, month, day)
+        return path is not None and os.path.exists(path)
+
+    def iter_futures(self, ticker, dates, columns=None, batch_size=65536):
+        """
+        Yield futures ticks of several days in chunks of at most batch_size rows.
+
+        Each day's pickle is still loaded whole; days without a file are skipped.
+
+        Parameters:
+        - ticker (str): Ticker symbol.
+        - dates (iterable): Trading days in time order.
+        - columns (list or None): Columns to load, None for all.
+        - batch_size (int): Rows per chunk.
+
+        Yields:
+        - chunk (pd.DataFrame): Ticks indexed by timestamp.
+        """
+        for date in dates:
+            date = pd.Timestamp(date)
+            path = self.futures_path(ticker, date.year, date.month, date.day)
+            if path is None or not os.path.exists(path):
+                continue
+            data = filter_frame(pd.read_pickle(path), columns)
+            for start in range(0, len(data), batch_size):
+                yield data.iloc[start:start + batch_size]
+
+
+class ParquetStore:
+    """
+    Storage backend for a Parquet tree partitioned by ticker/year/month/day.
+
+    Layout: ``{root}/{kind}/ticker={ticker}/year={year}/month={month:02d}/day={day:02d}/data.parquet``
+    where kind is 'options' or 'futures'. Rows are written sorted by timestamp in
+    small row groups so that time-range and strike-range predicates are pushed
+    down to the row-group statistics and only the requested columns are decoded.
+    """
+    def __init__(self, root, row_group_size=65536, compression='zstd'):
+        """
+        Initialize the store.
+
+        Parameters:
+        - root (str): Root directory of the partitioned tree.
+        - row_group_size (int): Rows per Parquet row group.
+        - compression (str): Parquet compression codec.
+        """
+        if pq is None:
+            raise ImportError("ParquetStore requires pyarrow")
+        self.root = root
+        self.row_group_size = row_group_size
+        self.compression = compression
+
+    def partition_path(self, kind, ticker, year, month, day):
+        return os.path.join(self.root, kind, f"ticker={ticker}", f"year={year}",
+                            f"month={month:02d}", f"day={day:02d}", "data.parquet")
+
+    def has_partition(self, kind, ticker, year, month, day):
+        return os.path.exists(self.partition_path(kind, ticker, year, month, day))
+
+    def write(self, kind, ticker, year, month, day, data):
+        """
+        Write one day of data into its partition, replacing any existing file.
+
+        Parameters:
+        - kind (str): 'options' or 'futures'.
+        - ticker (str): Ticker symbol.
+        - year (int), month (int), day (int): Trading day.
+        - data (pd.DataFrame): Frame indexed by timestamp.
+
+        Returns:
+        - path (str): Path of the written file.
+        """
+        path = self.partition_path(kind, ticker, year, month, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        frame = data.sort_index(kind='stable')
+        index_name = frame.index.name
+        timestamps = frame.index
+        frame = frame.reset_index(drop=True)
+        frame.insert(0, TIMESTAMP_COLUMN, timestamps)
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'index_name'] = (index_name or '').encode()
+        table = table.replace_schema_metadata(metadata)
+
+        tmp_path = path + '.tmp'
+        pq.write_table(table, tmp_path, row_group_size=self.row_group_size, compression=self.compression)
+        os.replace(tmp_path, path)
+        return path
+
+    def _read(self, kind, ticker, year, month, day, columns, start_time, end_time, strike_range):
+        path = self.partition_path(kind, ticker, year, month, day)
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+
+        start, end = _time_bounds(year, month, day, start_time, end_time)
+        filters = []
+        if start is not None:
+            filters.append((TIMESTAMP_COLUMN, '>=', start))
+        if end is not None:
+            filters.append((TIMESTAMP_COLUMN, '<=', end))
+        if strike_range is not None:
+            filters.append(('strike_price', '>=', strike_range[0]))
+            filters.append(('strike_price', '<=', strike_range[1]))
+
+        read_columns = None if columns is None else [TIMESTAMP_COLUMN] + [col for col in columns if col != TIMESTAMP_COLUMN]
+        table = pq.read_table(path, columns=read_columns, filters=filters or None)
+
+        data = table.to_pandas()
+        data.set_index(TIMESTAMP_COLUMN, inplace=True)
+        index_name = (table.schema.metadata or {}).get(b'index_name', b'').decode()
+        data.index.name = index_name or None
+        return data
+
+    def read_options(self, ticker, year, month, day, columns=None, start_time=None, end_time=None, strike_range=None):
+        return self._read('options', ticker, year, month, day, columns, start_time, end_time, strike_range)
+
+    def read_futures(self, ticker, year, month, day, columns=None, start_time=None, end_time=None):
+        return self._read('futures', ticker, year, month, day, columns, start_time, end_time, None)
+
+    def has_futures(self, ticker, year, month, day):
+        return self.has_partition('futures', ticker, year, month, day)
+
+    def iter_futures(self, ticker, dates, columns=None, batch_size=None):
+        """
+        Yield futures ticks of several days one batch of rows at a time.
+
+        Only one batch is decoded at a time, so memory stays bounded by the batch
+        size however long the range of days is. Days without a partition are skipped.
+
+        Parameters:
+        - ticker (str): Ticker symbol.
+        - dates (iterable): Trading days in time order.
+        - columns (list or None): Columns to load, None for all.
+        - batch_size (int or None): Rows per chunk, defaults to the row group size.
+
+        Yields:
+        - chunk (pd.DataFrame): Ticks indexed by timestamp.
+        """
+        read_columns = None if columns is None else [TIMESTAMP_COLUMN] + [col for col in columns if col != TIMESTAMP_COLUMN]
+        for date in dates:
+            date = pd.Timestamp(date)
+            path = self.partition_path('futures', ticker, date.year, date.month, date.day)
+            if not os.path.exists(path):
+                continue
+            parquet_file = pq.ParquetFile(path)
+            index_name = (parquet_file.schema_arrow.metadata or {}).get(b'index_name', b'').decode()
+            for batch in parquet_file.iter_batches(batch_size=batch_size or self.row_group_size, columns=read_columns):
+                data = batch.to_pandas()
+                data.set_index(TIMESTAMP_COLUMN, inplace=True)
+                data.index.name = index_name or None
+                yield data
+
+
+def convert_pickle_tree(source, target, tickers, dates, kinds=('options', 'futures'), overwrite=False):
+    """
+    One-shot conversion of the legacy pickle tree into a partitioned ParquetStore.
+
+    Parameters:
+    - source (PickleStore): Store reading the existing pickles.
+    - target (ParquetStore): Store receiving the converted partitions.
+    - tickers (list): Ticker symbols to convert.
+    - dates (iterable): Trading days to convert.
+    - kinds (tuple): Which datasets to convert ('options', 'futures').
+    - overwrite (bool): Whether to rewrite partitions that already exist.
+
+    Returns:
+    - summary (dict): Counts of 'converted', 'skipped' and 'missing' partitions.
+    """
+    summary = {'converted': 0, 'skipped': 0, 'missing': 0}
+
+    # Every ticker walks the same days, so a generator must not be consumed by the first one
+    dates = list(dates)
+    for ticker in tickers:
+        for date in dates:
+            for kind in kinds:
+                if not overwrite and target.has_partition(kind, ticker, date.year, date.month, date.day):
+                    summary['skipped'] += 1
+                    continue
+
+                try:
+                    if kind == 'options':
+                        data = source.read_options(ticker, date.year, date.month, date.day)
+                    else:
+                        data = source.read_futures(ticker, date.year, date.month, date.day)
+                except (FileNotFoundError, OSError):
+                    data = None
+
+                if data is None or data.empty:
+                    summary['missing'] += 1
+                    continue
+
+                target.write(kind, ticker, date.year, date.month, date.day, data)
+                summary['converted'] += 1
+
+    return summary
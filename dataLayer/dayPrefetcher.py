@@ -0,0 +1,131 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import perf_counter
+import pandas as pd
+
+
+def frame_bytes(value):
+    """
+    Approximate in-memory size of a loaded day (DataFrames, possibly nested in tuples or lists).
+
+    Object columns are counted by their pointers only, which keeps the estimate cheap.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    if isinstance(value, (tuple, list)):
+        return sum(frame_bytes(item) for item in value)
+    return 0
+
+
+class DayPrefetcher:
+    """
+    Loads upcoming days on a small thread pool while the current day is processed.
+
+    Iterating yields (date, loaded) in the order of dates. Up to `depth` days
+    beyond the one being processed are read ahead; no further read is started
+    while the days read ahead take max_bytes or more. The size of a day is only
+    known once it is loaded, so with max_bytes set the reads in flight are
+    waited for before another one is started, and the days held besides the one
+    being processed never exceed max_bytes by more than one day. File reads and
+    decompression release the GIL, so disk and network waits overlap with the
+    CPU-bound Greeks, indicators and execution of the current day.
+    """
+    def __init__(self, loader, dates, depth=2, max_workers=2, max_bytes=None):
+        """
+        Initialize the prefetcher.
+
+        Parameters:
+        - loader (callable): Function of a date returning that day's raw data.
+        - dates (iterable): Days to load, in processing order.
+        - depth (int): Days read ahead of the one being processed.
+        - max_workers (int): Threads reading days concurrently.
+        - max_bytes (int or None): Limit on the size of days read ahead, loaded or in flight, None for unlimited.
+        """
+        self.loader = loader
+        self.dates = list(dates)
+        self.depth = depth
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.days = 0
+        self.stalls = 0
+        self.stall_seconds = 0.0
+        self.load_seconds = 0.0
+        self.cap_wait_seconds = 0.0
+        self.ready_samples = []
+        self.peak_bytes = 0
+
+    def _load(self, date):
+        started = perf_counter()
+        loaded = self.loader(date)
+        elapsed = perf_counter() - started
+        return loaded, frame_bytes(loaded), elapsed
+
+    def _buffered_bytes(self, pending):
+        return sum(future.result()[1] for _, future in pending if future.done() and future.exception() is None)
+
+    def _over_cap(self, pending):
+        """
+        Return whether the days read ahead take max_bytes or more, waiting for reads in flight to know their size.
+        """
+        if self.max_bytes is None or not pending:
+            return False
+        in_flight = [future for _, future in pending if not future.done()]
+        if in_flight:
+            started = perf_counter()
+            wait(in_flight)
+            self.cap_wait_seconds += perf_counter() - started
+        return self._buffered_bytes(pending) >= self.max_bytes
+
+    def __iter__(self):
+        dates = iter(self.dates)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            def fill(limit):
+                while len(pending) < limit:
+                    if self._over_cap(pending):
+                        return
+                    date = next(dates, None)
+                    if date is None:
+                        return
+                    pending.append((date, pool.submit(self._load, date)))
+
+            fill(self.depth + 1)
+            while pending:
+                date, future = pending.popleft()
+                # Start the next reads before waiting for or handing over this day
+                fill(self.depth)
+                self.ready_samples.append(sum(queued.done() for _, queued in pending) + future.done())
+                if not future.done():
+                    started = perf_counter()
+                    future.result()
+                    self.stalls += 1
+                    self.stall_seconds += perf_counter() - started
+                loaded, size, elapsed = future.result()
+                self.load_seconds += elapsed
+                self.peak_bytes = max(self.peak_bytes, size + self._buffered_bytes(pending))
+                self.days += 1
+                yield date, loaded
+
+    def stats(self):
+        """
+        Return pipeline statistics.
+
+        Returns:
+        - stats (dict): days, stalls (days not loaded when needed), stall_seconds (time spent waiting
+          for them), load_seconds (time spent loading on the pool), cap_wait_seconds (time spent waiting
+          for reads in flight before checking max_bytes), mean_ready and max_ready (days already
+          loaded when one was requested, the effective queue depth) and peak_bytes (largest size of
+          loaded days held, the one handed over included).
+        """
+        return {
+            'days': self.days,
+            'stalls': self.stalls,
+            'stall_seconds': self.stall_seconds,
+            'load_seconds': self.load_seconds,
+            'cap_wait_seconds': self.cap_wait_seconds,
+            'mean_ready': sum(self.ready_samples) / len(self.ready_samples) if self.ready_samples else 0.0,
+            'max_ready': max(self.ready_samples, default=0),
+            'peak_bytes': self.peak_bytes
+        }
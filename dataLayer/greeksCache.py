@@ -0,0 +1,239 @@
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+from .calculateGreeks import calculate_iv_and_greeks, RISK_FREE_RATE, IV_MODEL, GREEKS_MODEL, GREEKS_COLUMNS
+
+# Chain columns that determine the IV/Greeks output
+GREEKS_INPUT_COLUMNS = ['option_price', 'spot_price', 'strike_price', 'expiry_date', 'option_type']
+
+
+class GreeksCache:
+    """
+    On-disk cache of the columns produced by calculate_iv_and_greeks.
+
+    Entries live under ``{root}/{ticker}/{YYYY-MM-DD}/{key}/`` with one ``.npy``
+    file per column, so a hit is a memory-mapped read of each column. The key is
+    a content hash of the input chain plus the model parameters; any change to
+    either produces a new entry. Least recently used entries are evicted once
+    the cache grows beyond max_bytes.
+    """
+    def __init__(self, root, max_bytes=None):
+        """
+        Initialize the cache.
+
+        Parameters:
+        - root (str): Directory holding cache entries.
+        - max_bytes (int or None): Size limit for the whole cache, None for unlimited.
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def make_key(self, options_data, r=RISK_FREE_RATE, iv_model=IV_MODEL, greeks_model=GREEKS_MODEL, engine='py_vollib'):
+        """
+        Build the content hash identifying an option chain and model parameters.
+
+        Parameters:
+        - options_data (pd.DataFrame): Option chain before IV/Greeks are added.
+        - r (float): Risk-free rate.
+        - iv_model (str): Model name used for implied volatility.
+        - greeks_model (str): Model name used for the Greeks.
+        - engine (str): IV/Greeks engine passed to calculate_iv_and_greeks.
+
+        Returns:
+        - key (str): Hex digest.
+        """
+        digest = hashlib.sha1()
+        digest.update(pd.util.hash_pandas_object(options_data.index, index=False).values.tobytes())
+        for column in GREEKS_INPUT_COLUMNS:
+            if column in options_data.columns:
+                digest.update(column.encode())
+                digest.update(pd.util.hash_pandas_object(options_data[column], index=False).values.tobytes())
+        digest.update(json.dumps({'r': r, 'iv_model': iv_model, 'greeks_model': greeks_model, 'engine': engine},
+                                 sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def entry_path(self, ticker, date, key):
+        return os.path.join(self.root, ticker, pd.Timestamp(date).strftime('%Y-%m-%d'), key)
+
+    def get(self, ticker, date, key):
+        """
+        Load cached columns for a chain.
+
+        Parameters:
+        - ticker (str): Ticker symbol.
+        - date (datetime): Trading day.
+        - key (str): Key from make_key.
+
+        Returns:
+        - columns (dict or None): Column name -> memory-mapped array, None on a miss.
+        """
+        path = self.entry_path(ticker, date, key)
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            self.misses += 1
+            return None
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in meta['columns']}
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+        # Touch the entry so that eviction keeps recently used days
+        os.utime(meta_path)
+        self.hits += 1
+        return columns
+
+    def put(self, ticker, date, key, options_data, columns=GREEKS_COLUMNS):
+        """
+        Store IV/Greeks columns of a processed chain.
+
+        Parameters:
+        - ticker (str): Ticker symbol.
+        - date (datetime): Trading day.
+        - key (str): Key from make_key.
+        - options_data (pd.DataFrame): Chain returned by calculate_iv_and_greeks.
+        - columns (list): Columns to store.
+        """
+        path = self.entry_path(ticker, date, key)
+        tmp_path = path + f".tmp{os.getpid()}"
+        os.makedirs(tmp_path, exist_ok=True)
+
+        stored = []
+        for name in columns:
+            if name in options_data.columns:
+                np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(options_data[name].values))
+                stored.append(name)
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump({'columns': stored, 'rows': len(options_data)}, f)
+
+        # Another worker may have written the same entry in the meantime; the existing one is kept
+        try:
+            os.replace(tmp_path, path)
+            self.writes += 1
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def invalidate(self, ticker=None, date=None):
+        """
+        Remove cached entries.
+
+        Parameters:
+        - ticker (str or None): Restrict to one ticker, None for all.
+        - date (datetime or None): Restrict to one day (requires ticker), None for all days.
+        """
+        if ticker is None:
+            target = self.root
+        elif date is None:
+            target = os.path.join(self.root, ticker)
+        else:
+            target = os.path.join(self.root, ticker, pd.Timestamp(date).strftime('%Y-%m-%d'))
+        shutil.rmtree(target, ignore_errors=True)
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for ticker in os.listdir(self.root):
+            ticker_path = os.path.join(self.root, ticker)
+            if not os.path.isdir(ticker_path):
+                continue
+            for day in os.listdir(ticker_path):
+                day_path = os.path.join(ticker_path, day)
+                if not os.path.isdir(day_path):
+                    continue
+                for key in os.listdir(day_path):
+                    entry = os.path.join(day_path, key)
+                    meta_path = os.path.join(entry, 'meta.json')
+                    if not os.path.exists(meta_path):
+                        continue
+                    size = sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+                    entries.append((os.path.getmtime(meta_path), size, entry))
+        return entries
+
+    def size_bytes(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, max_bytes):
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+
+        Parameters:
+        - max_bytes (int): Size limit.
+
+        Returns:
+        - evicted (int): Number of entries removed.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, entry in entries:
+            if total <= max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def stats(self):
+        """
+        Return hit/miss statistics for this cache instance.
+
+        Returns:
+        - stats (dict): hits, misses, hit_rate, writes and evictions.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'writes': self.writes,
+            'evictions': self.evictions
+        }
+
+
+def calculate_iv_and_greeks_cached(options_data, cache, ticker, date, r=RISK_FREE_RATE, engine='py_vollib'):
+    """
+    calculate_iv_and_greeks with a GreeksCache in front of it.
+
+    Parameters:
+    - options_data (pd.DataFrame): Option chain.
+    - cache (GreeksCache or None): Cache to consult, None to always compute.
+    - ticker (str): Ticker symbol.
+    - date (datetime): Trading day.
+    - r (float): Risk-free rate.
+    - engine (str): IV/Greeks engine passed to calculate_iv_and_greeks.
+
+    Returns:
+    - options_data (pd.DataFrame): Chain with IV/Greeks columns (same contract as calculate_iv_and_greeks).
+    """
+    if cache is None or options_data is None or options_data.empty:
+        return calculate_iv_and_greeks(options_data, r=r, engine=engine)
+
+    key = cache.make_key(options_data, r=r, engine=engine)
+    columns = cache.get(ticker, date, key)
+    if columns is not None and all(len(values) == len(options_data) for values in columns.values()):
+        # Entries written before the rate moved to attrs also hold an 'r' column
+        for name, values in columns.items():
+            if name in GREEKS_COLUMNS:
+                options_data[name] = values
+        options_data.attrs['r'] = r
+        return options_data
+
+    options_data = calculate_iv_and_greeks(options_data, r=r, engine=engine)
+    if isinstance(options_data, pd.DataFrame):
+        cache.put(ticker, date, key, options_data)
+    return options_data
@@ -0,0 +1,674 @@
+import copy
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+from .indicatorLibrary import RSI_INDICATOR_COLUMNS, STOCH_INDICATOR_COLUMNS
+from .indicatorGraph import split_request, compute_indicators
+from .applying_indicators import indicator_params
+
+# Base indicator columns produced per bar, in the column order of all_indicators
+INCREMENTAL_COLUMNS = [
+    'SMA', 'EMA_no_adjust', 'EMA_adjusted', 'WMA', 'HMA', 'MACD', 'Signal_Line', 'K_percent', 'D_percent', 'TR',
+    'ATR', 'CCI_sma', 'CCI_ema', 'DPO_sma', 'DPO_ema', 'Trix_sma', 'Trix_ema', 'Bull_Power_sma', 'Bear_Power_sma',
+    'Bull_Power_ema', 'Bear_Power_ema', 'Conversion_Line', 'laguerre', 'laguerre_volatility',
+    'adaptive_relative_volatility', 'adaptive_wpr_volatility', 'RVI', 'demand_index_volatility',
+    'commodity_selection_index', 'efficiency_ratio_volatility', 'R1', 'S1', 'R2', 'S2', 'R3', 'S3',
+    'cycles_indicator', 'darvas_box', 'BB_mid', 'rolling_std', 'BB_high', 'BB_low', 'BB_percentageChange',
+    'BB_width', 'donchian_high', 'donchian_low', 'donchian_mid', 'donchian_percentageChange', 'donchian_width',
+    'close_previous', 'TRANGE', 'NATR', 'typical_price', 'kc_mid', 'kc_high', 'kc_low', 'kc_width', 'ui_drawdown',
+    'ulcer_index', 'price_spread', 'ema_price_spread', 'chaikin_volatility', 'sma_midpoint', 'DPO', 'ROC'
+]
+
+NAN = float('nan')
+
+
+def _divide(numerator, denominator):
+    """
+    Float division with NumPy semantics (inf or NaN instead of ZeroDivisionError).
+    """
+    if denominator == 0:
+        if numerator == 0 or numerator != numerator:
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+def _sqrt(value):
+    return math.sqrt(value) if value >= 0 else (NAN if value != value else 0.0)
+
+
+class Lag:
+    """
+    Value of a series `periods` updates ago (shift(periods)).
+    """
+    def __init__(self, periods):
+        self.values = deque([NAN] * periods, maxlen=periods)
+
+    def update(self, value):
+        lagged = self.values[0]
+        self.values.append(value)
+        return lagged
+
+
+class RollingMean:
+    """
+    Rolling mean with the add/remove and Kahan compensation scheme of pandas rolling().mean().
+
+    As in pandas, NaN and +-inf are missing observations.
+    """
+    def __init__(self, window, min_periods=None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.values = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        self.nobs = 0
+        self.total = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.negative = 0
+        self.same_count = 0
+        self.previous = NAN
+
+    def add(self, value):
+        if not math.isfinite(value):
+            return
+        self.nobs += 1
+        y = value - self.compensation_add
+        t = self.total + y
+        self.compensation_add = t - self.total - y
+        self.total = t
+        if math.copysign(1.0, value) < 0:
+            self.negative += 1
+        self.same_count = self.same_count + 1 if value == self.previous else 1
+        self.previous = value
+
+    def remove(self, value):
+        if not math.isfinite(value):
+            return
+        self.nobs -= 1
+        y = -value - self.compensation_remove
+        t = self.total + y
+        self.compensation_remove = t - self.total - y
+        self.total = t
+        if math.copysign(1.0, value) < 0:
+            self.negative -= 1
+
+    def slide(self, value):
+        if self.window == 1:
+            self.values.clear()
+            self.reset()
+        elif len(self.values) == self.window:
+            self.remove(self.values[0])
+        self.values.append(value)
+        self.add(value)
+
+    def update(self, value):
+        self.slide(value)
+        if self.nobs < self.min_periods or self.nobs == 0:
+            return NAN
+        if self.same_count >= self.nobs:
+            return self.previous
+        result = self.total / self.nobs
+        if self.negative == 0 and result < 0:
+            return 0.0
+        if self.negative == self.nobs and result > 0:
+            return 0.0
+        return result
+
+
+class RollingSum(RollingMean):
+    """
+    Rolling sum (pandas rolling().sum()).
+    """
+    def update(self, value):
+        self.slide(value)
+        if self.nobs < self.min_periods:
+            return NAN
+        if self.nobs and self.same_count >= self.nobs:
+            return self.previous * self.nobs
+        return self.total
+
+
+class RollingStd:
+    """
+    Rolling sample standard deviation with the online (Welford) add/remove scheme of pandas rolling().std().
+    """
+    def __init__(self, window, ddof=1):
+        self.window = window
+        self.ddof = ddof
+        self.values = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        self.nobs = 0
+        self.mean = 0.0
+        self.ssqdm = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.same_count = 0
+        self.previous = NAN
+
+    def add(self, value):
+        if not math.isfinite(value):
+            return
+        self.same_count = self.same_count + 1 if value == self.previous else 1
+        self.previous = value
+        self.nobs += 1
+        previous_mean = self.mean - self.compensation_add
+        y = value - self.compensation_add
+        t = y - self.mean
+        self.compensation_add = t + self.mean - y
+        self.mean = self.mean + t / self.nobs
+        self.ssqdm += (value - previous_mean) * (value - self.mean)
+
+    def remove(self, value):
+        if not math.isfinite(value):
+            return
+        self.nobs -= 1
+        if self.nobs:
+            previous_mean = self.mean - self.compensation_remove
+            y = value - self.compensation_remove
+            t = y - self.mean
+            self.compensation_remove = t + self.mean - y
+            self.mean = self.mean - t / self.nobs
+            self.ssqdm -= (value - previous_mean) * (value - self.mean)
+        else:
+            self.mean = 0.0
+            self.ssqdm = 0.0
+
+    def update(self, value):
+        if self.window == 1:
+            self.values.clear()
+            self.reset()
+        elif len(self.values) == self.window:
+            self.remove(self.values[0])
+        self.values.append(value)
+        self.add(value)
+
+        if self.nobs < self.window or self.nobs <= self.ddof:
+            return NAN
+        if self.nobs == 1 or self.same_count >= self.nobs:
+            return 0.0
+        return _sqrt(self.ssqdm / (self.nobs - self.ddof))
+
+
+class RollingExtremum:
+    """
+    Rolling max (or min) over a monotonic deque, amortized O(1) per update.
+
+    Windows holding a missing value (NaN or +-inf) give NaN, like pandas rolling().max().
+    """
+    def __init__(self, window, maximum=True):
+        self.window = window
+        self.sign = 1.0 if maximum else -1.0
+        self.candidates = deque()
+        self.missing = deque(maxlen=window)
+        self.n_missing = 0
+        self.count = 0
+
+    def update(self, value):
+        count = self.count
+        self.count += 1
+        missing = not math.isfinite(value)
+        if len(self.missing) == self.window:
+            self.n_missing -= self.missing[0]
+        self.missing.append(missing)
+        self.n_missing += missing
+        while self.candidates and self.candidates[0][0] <= count - self.window:
+            self.candidates.popleft()
+        if not missing:
+            key = self.sign * value
+            while self.candidates and self.sign * self.candidates[-1][1] <= key:
+                self.candidates.pop()
+            self.candidates.append((count, value))
+        if count < self.window - 1 or self.n_missing:
+            return NAN
+        return self.candidates[0][1]
+
+
+class ExponentialMean:
+    """
+    Exponentially weighted mean following pandas ewm(span=...).mean() with ignore_na=False
+    (NaN and +-inf are missing observations).
+    """
+    def __init__(self, span, adjust=False):
+        com = (span - 1) / 2.0
+        alpha = 1.0 / (1.0 + com)
+        self.old_weight_factor = 1.0 - alpha
+        self.new_weight = 1.0 if adjust else alpha
+        self.adjust = adjust
+        self.old_weight = 1.0
+        self.weighted = NAN
+        self.nobs = 0
+
+    def update(self, value):
+        is_observation = math.isfinite(value)
+        self.nobs += is_observation
+        if self.weighted == self.weighted:
+            self.old_weight *= self.old_weight_factor
+            if is_observation:
+                if self.weighted != value:
+                    self.weighted = (self.old_weight * self.weighted + self.new_weight * value) / \
+                                    (self.old_weight + self.new_weight)
+                self.old_weight = self.old_weight + self.new_weight if self.adjust else 1.0
+        elif is_observation:
+            self.weighted = value
+        return self.weighted if self.nobs >= 1 else NAN
+
+
+class RollingBuffer:
+    """
+    Last `window` values with their running plain and weighted sums (WMA, mean absolute deviation).
+
+    Sliding the window updates the weighted sum from the plain one, so the
+    weighted mean is O(1) per update; the sums are recomputed from the buffer
+    once per window to keep rounding from accumulating. Windows holding a
+    missing value (NaN or +-inf) give NaN.
+    """
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.weighted = 0.0
+        self.n_missing = 0
+        self.pushes = 0
+
+    def push(self, value):
+        missing = not math.isfinite(value)
+        item = 0.0 if missing else value
+        if len(self.values) == self.window:
+            dropped = self.values[0]
+            # Every kept value moves down one weight and the new one takes weight `window`
+            self.weighted += self.window * item - self.total
+            if math.isfinite(dropped):
+                self.total -= dropped
+            else:
+                self.n_missing -= 1
+        else:
+            self.weighted += (len(self.values) + 1) * item
+        self.total += item
+        self.n_missing += missing
+        self.values.append(value)
+
+        self.pushes += 1
+        if self.pushes % self.window == 0:
+            self.resum()
+        return len(self.values) == self.window and not self.n_missing
+
+    def resum(self):
+        self.total = 0.0
+        self.weighted = 0.0
+        for weight, item in enumerate(self.values, start=1):
+            if math.isfinite(item):
+                self.total += item
+                self.weighted += item * weight
+
+    def weighted_mean(self, value):
+        if not self.push(value):
+            return NAN
+        return self.weighted / (self.window * (self.window + 1) / 2.0)
+
+    def mean_abs_deviation(self, value):
+        if not self.push(value):
+            return NAN
+        mean = self.total / self.window
+        deviation = 0.0
+        for item in self.values:
+            deviation += abs(item - mean)
+        return deviation / self.window
+
+
+class IncrementalIndicators:
+    """
+    Bar-by-bar indicator engine with constant-size state.
+
+    Every indicator of all_indicators keeps its own rolling state (running
+    sums, monotonic deques, exponential weights or a window-length buffer),
+    so appending a bar costs the same whatever the length of the history.
+    The rolling updates follow the pandas algorithms used by the batch
+    library, so replaying a day reproduces apply_indicators up to floating
+    point rounding (see check_consistency). snapshot() and restore() copy the
+    state, e.g. to resume a replay or branch a live session.
+    """
+    def __init__(self, params=None, indicators=None):
+        """
+        Parameters:
+        - params (dict or None): Indicator parameters, defaults to applying_indicators.indicator_params().
+        - indicators (list or None): Transform columns wanted ('<column>_rsi', '<column>_k_percent',
+          '<column>_d_percent'); base indicators are always produced. None produces every transform.
+        """
+        self.params = indicator_params() if params is None else dict(params)
+        if indicators is None:
+            self.rsi_columns = list(RSI_INDICATOR_COLUMNS)
+            self.stoch_columns = list(STOCH_INDICATOR_COLUMNS)
+        else:
+            _, rsi, stoch = split_request(indicators)
+            self.rsi_columns = [column for column in RSI_INDICATOR_COLUMNS if column in rsi]
+            self.stoch_columns = [column for column in STOCH_INDICATOR_COLUMNS if column in stoch]
+        self.reset()
+
+    def reset(self):
+        """
+        Drop all state, as before the first bar of a session.
+        """
+        p = self.params
+        window = p['window']
+        hma_smoothing = int(np.sqrt(window))
+        self.alpha = float(np.exp(-p['gamma']))
+        self.bars = 0
+        self.state = {
+            'sma': RollingMean(window),
+            'ema': ExponentialMean(window),
+            'ema_adjusted': ExponentialMean(window, adjust=True),
+            'wma': RollingBuffer(window),
+            'hma_half': RollingMean(window // 2),
+            'hma_full': RollingMean(window),
+            'hma_first': RollingMean(hma_smoothing),
+            'hma_second': RollingMean(hma_smoothing),
+            'macd_short': ExponentialMean(p['short_window']),
+            'macd_long': ExponentialMean(p['long_window']),
+            'macd_signal': ExponentialMean(p['signal_window']),
+            'stoch_low': RollingExtremum(p['k_window'], maximum=False),
+            'stoch_high': RollingExtremum(p['k_window']),
+            'stoch_d': RollingMean(p['d_window']),
+            'csi_atr': RollingMean(window),
+            'cci_sma': RollingMean(window),
+            'cci_ema': ExponentialMean(window),
+            'cci_deviation': RollingBuffer(window),
+            'dpo_sma_lag': Lag(int(window / 2) + 1),
+            'dpo_ema_lag': Lag(int(window / 2) + 1),
+            'trix_sma': [RollingMean(window) for _ in range(2)],
+            'trix_ema': [ExponentialMean(window) for _ in range(3)],
+            'conversion_high': RollingExtremum(p['short_window']),
+            'conversion_low': RollingExtremum(p['short_window'], maximum=False),
+            'arv_range': RollingMean(window),
+            'arv_ratio': RollingMean(window),
+            'wpr_range': RollingMean(window),
+            'wpr_ratio': RollingMean(window),
+            'rvi_range': RollingMean(window),
+            'demand_sum': RollingSum(window),
+            'returns_std': RollingStd(window),
+            'cycles_lag': Lag(window),
+            'cycles_std': RollingStd(window),
+            'darvas_high': Lag(window),
+            'darvas_low': Lag(window),
+            'bb_mid': RollingMean(p['bb_window']),
+            'bb_std': RollingStd(p['bb_window']),
+            'donchian_high': RollingExtremum(p['donchian_window']),
+            'donchian_low': RollingExtremum(p['donchian_window'], maximum=False),
+            'atr': RollingMean(p['atr_window']),
+            'kc_mid': RollingMean(p['keltner_window']),
+            'ui_max': RollingExtremum(p['ulcer_index_window']),
+            'ui_mean': RollingMean(p['ulcer_index_window']),
+            'chaikin_ema': ExponentialMean(p['chaikin_volatility_period']),
+            'dpo_mid': RollingMean((p['dpo_period'] // 2) + 1),
+            'dpo_lag': Lag((p['dpo_period'] // 2) + 1),
+            'roc_lag': Lag(p['roc_period']),
+            'rsi': {column: (RollingMean(p['rsi_window'], 1), RollingMean(p['rsi_window'], 1))
+                    for column in self.rsi_columns},
+            'stoch': {column: (RollingExtremum(p['k_window'], maximum=False), RollingExtremum(p['k_window']),
+                               RollingMean(p['d_window'])) for column in self.stoch_columns}
+        }
+        # Scalars carried from the previous bar
+        self.previous = {'close': NAN, 'filled_close': NAN, 'laguerre_lag1': NAN, 'laguerre': NAN,
+                         'trix_sma': NAN, 'trix_ema': NAN, 'rvi': NAN,
+                         'rsi': {column: NAN for column in self.rsi_columns}}
+
+    def snapshot(self):
+        """
+        Return a deep copy of the engine state.
+        """
+        return copy.deepcopy({'bars': self.bars, 'state': self.state, 'previous': self.previous})
+
+    def restore(self, snapshot):
+        """
+        Reset the engine to a state returned by snapshot().
+        """
+        snapshot = copy.deepcopy(snapshot)
+        self.bars = snapshot['bars']
+        self.state = snapshot['state']
+        self.previous = snapshot['previous']
+
+    def update(self, open_price, high, low, close):
+        """
+        Add one OHLC bar.
+
+        Parameters:
+        - open_price, high, low, close (float): Bar prices (NaN for an empty bar).
+
+        Returns:
+        - Tuple: (dict of base indicators, dict of RSI columns, dict of stochastic columns) for the bar.
+        """
+        p = self.params
+        s = self.state
+        prev = self.previous
+        open_price, high, low, close = float(open_price), float(high), float(low), float(close)
+        v = {}
+
+        v['SMA'] = sma = s['sma'].update(close)
+        v['EMA_no_adjust'] = ema = s['ema'].update(close)
+        v['EMA_adjusted'] = s['ema_adjusted'].update(close)
+        v['WMA'] = s['wma'].weighted_mean(close)
+        hull = 2 * s['hma_half'].update(close) - s['hma_full'].update(close)
+        v['HMA'] = s['hma_second'].update(s['hma_first'].update(hull))
+
+        v['MACD'] = macd = s['macd_short'].update(close) - s['macd_long'].update(close)
+        v['Signal_Line'] = s['macd_signal'].update(macd)
+
+        lowest_low = s['stoch_low'].update(low)
+        highest_high = s['stoch_high'].update(high)
+        v['K_percent'] = k_percent = _divide(close - lowest_low, highest_high - lowest_low) * 100
+        v['D_percent'] = s['stoch_d'].update(k_percent)
+
+        close_previous = prev['close']
+        candidates = [x for x in (high - low, abs(high - close_previous), abs(low - close_previous)) if x == x]
+        v['TR'] = tr = max(candidates) if candidates else NAN
+        csi_atr = s['csi_atr'].update(tr)
+
+        typical_price = (high + low + close) / 3
+        cci_deviation = 0.015 * s['cci_deviation'].mean_abs_deviation(typical_price)
+        v['CCI_sma'] = _divide(typical_price - s['cci_sma'].update(typical_price), cci_deviation)
+        v['CCI_ema'] = _divide(typical_price - s['cci_ema'].update(typical_price), cci_deviation)
+        v['DPO_sma'] = close - s['dpo_sma_lag'].update(sma)
+        v['DPO_ema'] = close - s['dpo_ema_lag'].update(ema)
+
+        sma3 = sma
+        for rolling in s['trix_sma']:
+            sma3 = rolling.update(sma3)
+        v['Trix_sma'] = _divide(sma3 - prev['trix_sma'], prev['trix_sma']) * 100
+        ema3 = close
+        for rolling in s['trix_ema']:
+            ema3 = rolling.update(ema3)
+        v['Trix_ema'] = _divide(ema3 - prev['trix_ema'], prev['trix_ema']) * 100
+
+        v['Bull_Power_sma'], v['Bear_Power_sma'] = high - sma, low - sma
+        v['Bull_Power_ema'], v['Bear_Power_ema'] = high - ema, low - ema
+        v['Conversion_Line'] = (s['conversion_high'].update(high) + s['conversion_low'].update(low)) / 2
+
+        # Laguerre filter, same expression as indicatorKernels.laguerre_filter
+        alpha = self.alpha
+        lag1 = (1 - alpha) * close + alpha * close_previous
+        lag1_previous = prev['laguerre_lag1']
+        lag2 = (-alpha**2) * close + 2 * alpha * lag1 - lag1_previous
+        lag3 = (alpha**3) * close - 3 * alpha * lag2 + 3 * lag1 - lag1_previous
+        lag4 = (-alpha**4) * close + 4 * alpha * lag3 - 6 * lag2 + 4 * lag1 - lag1_previous
+        l0 = (1 - alpha/2)**2 * lag4
+        l1 = -2 * (1 - alpha) * lag3
+        l2 = (1 - alpha) * (1 - alpha) * lag2
+        laguerre = (l0 + l1 + l2) / 6
+        v['laguerre'] = laguerre
+        v['laguerre_volatility'] = abs(laguerre - prev['laguerre'])
+
+        price_range = high - low
+        v['adaptive_relative_volatility'] = s['arv_ratio'].update(_divide(price_range, s['arv_range'].update(price_range)))
+        weighted_price_range = price_range * typical_price
+        v['adaptive_wpr_volatility'] = s['wpr_ratio'].update(
+            _divide(weighted_price_range, s['wpr_range'].update(weighted_price_range)))
+
+        rvi_step = _divide(s['rvi_range'].update(price_range), close_previous)
+        if rvi_step == rvi_step:
+            prev['rvi'] = rvi_step if prev['rvi'] != prev['rvi'] else prev['rvi'] + rvi_step
+            v['RVI'] = prev['rvi']
+        else:
+            v['RVI'] = NAN
+
+        v['demand_index_volatility'] = _divide(price_range, s['demand_sum'].update(price_range))
+        v['commodity_selection_index'] = _divide(close - open_price, csi_atr)
+
+        # pct_change forward-fills missing closes before taking the ratio
+        filled_close = close if close == close else prev['filled_close']
+        daily_return = _divide(filled_close, prev['filled_close']) - 1
+        v['efficiency_ratio_volatility'] = _divide(1, s['returns_std'].update(daily_return))
+
+        pivot_point = typical_price
+        v['R1'], v['S1'] = 2 * pivot_point - low, 2 * pivot_point - high
+        v['R2'], v['S2'] = pivot_point + (high - low), pivot_point - (high - low)
+        v['R3'], v['S3'] = pivot_point + 2 * (high - low), pivot_point - 2 * (high - low)
+
+        v['cycles_indicator'] = s['cycles_std'].update(typical_price - s['cycles_lag'].update(typical_price))
+        high_shifted, low_shifted = s['darvas_high'].update(high), s['darvas_low'].update(low)
+        upper_band = high_shifted + (high_shifted - low_shifted) / 2
+        lower_band = low_shifted - (high_shifted - low_shifted) / 2
+        v['darvas_box'] = (upper_band - lower_band) / 2
+
+        v['BB_mid'] = bb_mid = s['bb_mid'].update(close)
+        v['rolling_std'] = rolling_std = s['bb_std'].update(close)
+        v['BB_high'] = bb_high = bb_mid + (p['bb_deviation'] * rolling_std)
+        v['BB_low'] = bb_low = bb_mid - (p['bb_deviation'] * rolling_std)
+        v['BB_percentageChange'] = _divide(close - bb_mid, bb_mid)
+        v['BB_width'] = bb_high - bb_low
+
+        v['donchian_high'] = donchian_high = s['donchian_high'].update(high)
+        v['donchian_low'] = donchian_low = s['donchian_low'].update(low)
+        v['donchian_mid'] = (donchian_high + donchian_low) / 2
+        v['donchian_percentageChange'] = _divide(close - (donchian_high + donchian_low) / 2,
+                                                 (donchian_high + donchian_low) / 2)
+        v['donchian_width'] = donchian_high - donchian_low
+
+        # Same comparison order as the row-wise max of the batch true range
+        trange = high - low
+        for candidate in (abs(high - close_previous), abs(low - close_previous)):
+            if candidate > trange:
+                trange = candidate
+        v['close_previous'] = close_previous
+        v['TRANGE'] = trange
+        v['ATR'] = atr = s['atr'].update(trange)
+        v['NATR'] = _divide(atr, close) * 100
+
+        v['typical_price'] = typical_price
+        v['kc_mid'] = kc_mid = s['kc_mid'].update(typical_price)
+        v['kc_high'] = kc_high = kc_mid + (p['atr_kc_multiplier'] * atr)
+        v['kc_low'] = kc_low = kc_mid - (p['atr_kc_multiplier'] * atr)
+        v['kc_width'] = _divide(kc_high - kc_low, kc_mid)
+
+        rolling_max = s['ui_max'].update(close)
+        v['ui_drawdown'] = ui_drawdown = _divide(100 * (close - rolling_max), rolling_max)
+        v['ulcer_index'] = _sqrt(s['ui_mean'].update(ui_drawdown ** 2))
+
+        v['price_spread'] = price_spread = high - low
+        v['ema_price_spread'] = ema_price_spread = s['chaikin_ema'].update(price_spread)
+        v['chaikin_volatility'] = _divide(100 * (price_spread - ema_price_spread), ema_price_spread)
+
+        v['sma_midpoint'] = sma_midpoint = s['dpo_mid'].update(close)
+        v['DPO'] = close - s['dpo_lag'].update(sma_midpoint)
+        close_lagged = s['roc_lag'].update(close)
+        v['ROC'] = _divide(close - close_lagged, close_lagged) * 100
+
+        prev['close'] = close
+        prev['filled_close'] = filled_close
+        prev['laguerre_lag1'] = lag1
+        prev['laguerre'] = laguerre
+        prev['trix_sma'] = sma3
+        prev['trix_ema'] = ema3
+        self.bars += 1
+        return v, self.update_rsi(v), self.update_stoch(v)
+
+    def update_rsi(self, values):
+        rsi = {}
+        previous = self.previous['rsi']
+        for column, (average_gain, average_loss) in self.state['rsi'].items():
+            value = values[column]
+            price_diff = value - previous[column]
+            previous[column] = value
+            gain = price_diff if price_diff > 0 else 0.0
+            loss = -(price_diff if price_diff < 0 else 0.0)
+            rs = _divide(average_gain.update(gain), average_loss.update(loss))
+            rsi[f'{column}_rsi'] = 100 - _divide(100, 1 + rs)
+        return rsi
+
+    def update_stoch(self, values):
+        stoch = {}
+        for column, (rolling_low, rolling_high, d_mean) in self.state['stoch'].items():
+            value = values[column]
+            lowest_low, highest_high = rolling_low.update(value), rolling_high.update(value)
+            k_percent = _divide(value - lowest_low, highest_high - lowest_low) * 100
+            stoch[f'{column}_k_percent'] = k_percent
+            stoch[f'{column}_d_percent'] = d_mean.update(k_percent)
+        return stoch
+
+    def run(self, data):
+        """
+        Feed every bar of an OHLC frame through the engine.
+
+        Parameters:
+        - data (pd.DataFrame): OHLC bars with 'open', 'high', 'low' and 'close'.
+
+        Returns:
+        - Tuple: (OHLC with base indicators, RSI columns, stochastic columns), shaped like apply_indicators.
+        """
+        rows, rsi_rows, stoch_rows = [], [], []
+        for bar in zip(data['open'].values, data['high'].values, data['low'].values, data['close'].values):
+            values, rsi, stoch = self.update(*bar)
+            rows.append(values)
+            rsi_rows.append(rsi)
+            stoch_rows.append(stoch)
+
+        base = pd.DataFrame(rows, index=data.index, columns=INCREMENTAL_COLUMNS)
+        data_rsi = pd.DataFrame(rsi_rows, index=data.index, columns=[f'{column}_rsi' for column in self.rsi_columns])
+        stoch_columns = [f'{column}_{suffix}' for column in self.stoch_columns for suffix in ('k_percent', 'd_percent')]
+        data_stoch = pd.DataFrame(stoch_rows, index=data.index, columns=stoch_columns)
+        return pd.concat([data, base], axis=1), data_rsi, data_stoch
+
+
+def check_consistency(data, params=None, indicators=None, rtol=1e-6, atol=1e-8):
+    """
+    Compare a bar-by-bar replay of the incremental engine with the batch indicators.
+
+    Parameters:
+    - data (pd.DataFrame): OHLC bars.
+    - params (dict or None): Indicator parameters, defaults to applying_indicators.indicator_params().
+    - indicators (list or None): Transform columns to compare, None for all of them.
+    - rtol, atol (float): Tolerances of np.isclose.
+
+    Returns:
+    - report (pd.DataFrame): Per column 'max_abs_diff', 'mismatches' (rows outside tolerance, NaN
+      placement included) and 'consistent'.
+    """
+    params = indicator_params() if params is None else params
+    engine = IncrementalIndicators(params, indicators)
+    streamed = engine.run(data[['open', 'high', 'low', 'close']])
+
+    requested = INCREMENTAL_COLUMNS + [f'{column}_rsi' for column in engine.rsi_columns] + \
+                [f'{column}_{suffix}' for column in engine.stoch_columns for suffix in ('k_percent', 'd_percent')]
+    batch = compute_indicators(data[['open', 'high', 'low', 'close']].copy(), requested, params)
+
+    rows = {}
+    for expected_frame, streamed_frame in zip(batch, streamed):
+        for column in streamed_frame.columns:
+            if column not in INCREMENTAL_COLUMNS and expected_frame is batch[0]:
+                continue
+            expected = expected_frame[column].to_numpy(dtype=np.float64)
+            result = streamed_frame[column].to_numpy(dtype=np.float64)
+            with np.errstate(invalid='ignore'):
+                difference = np.abs(expected - result)
+            finite = np.isfinite(difference)
+            rows[column] = {
+                'max_abs_diff': float(difference[finite].max()) if finite.any() else 0.0,
+                'mismatches': int((~np.isclose(expected, result, rtol=rtol, atol=atol, equal_nan=True)).sum())
+            }
+    report = pd.DataFrame.from_dict(rows, orient='index')
+    report['consistent'] = report['mismatches'] == 0
+    return report
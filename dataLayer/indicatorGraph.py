@@ -0,0 +1,283 @@
+import numpy as np
+import pandas as pd
+from .indicatorLibrary import *
+
+# OHLC columns every indicator graph starts from
+BASE_COLUMNS = ['open', 'high', 'low', 'close']
+
+
+class IndicatorNode:
+    """
+    One step of the indicator graph: a function of the bar data and the
+    indicator parameters that produces one or more columns.
+    """
+    def __init__(self, outputs, inputs, function, params=()):
+        """
+        Parameters:
+        - outputs (list): Columns produced, in the order the function returns them.
+        - inputs (list): Columns the function reads (OHLC columns or outputs of other nodes).
+        - function (callable): function(data, params) returning one Series or a tuple of Series.
+        - params (tuple): Names of the indicator parameters the function reads.
+        """
+        self.outputs = list(outputs)
+        self.inputs = list(inputs)
+        self.function = function
+        self.params = tuple(params)
+
+    def compute(self, data, params):
+        values = self.function(data, params)
+        if len(self.outputs) == 1:
+            values = (values,)
+        for name, value in zip(self.outputs, values):
+            data[name] = value
+        return data
+
+
+# Base indicators in an order where every node comes after the nodes it reads from
+INDICATOR_NODES = [
+    IndicatorNode(['SMA'], ['close'], lambda data, p: calculate_sma(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['EMA_no_adjust'], ['close'], lambda data, p: calculate_ema_without_adjust(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['EMA_adjusted'], ['close'], lambda data, p: calculate_ema_with_adjust(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['WMA'], ['close'], lambda data, p: calculate_wma(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['HMA'], ['close'], lambda data, p: calculate_hma(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['MACD', 'Signal_Line'], ['close'],
+                  lambda data, p: calculate_macd(data, p['short_window'], p['long_window'], p['signal_window']),
+                  params=('short_window', 'long_window', 'signal_window')),
+    IndicatorNode(['K_percent', 'D_percent'], ['high', 'low', 'close'],
+                  lambda data, p: calculate_stochastic_oscillator(data, p['k_window'], p['d_window']),
+                  params=('k_window', 'd_window')),
+    IndicatorNode(['TR'], ['high', 'low', 'close'], lambda data, p: calculate_atr(data, p['window'])[0],
+                  params=('window',)),
+    IndicatorNode(['CCI_sma'], ['high', 'low', 'close'], lambda data, p: calculate_cci_on_sma(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['CCI_ema'], ['high', 'low', 'close'], lambda data, p: calculate_cci_on_ema(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['DPO_sma'], ['close'], lambda data, p: calculate_detrended_price_oscillator_on_sma(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['DPO_ema'], ['close'], lambda data, p: calculate_detrended_price_oscillator_on_ema(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['Trix_sma'], ['close'], lambda data, p: calculate_trix_on_sma(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['Trix_ema'], ['close'], lambda data, p: calculate_trix_on_ema(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['Bull_Power_sma', 'Bear_Power_sma'], ['high', 'low', 'close'],
+                  lambda data, p: calculate_elder_ray_index_on_sma(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['Bull_Power_ema', 'Bear_Power_ema'], ['high', 'low', 'close'],
+                  lambda data, p: calculate_elder_ray_index_on_ema(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['Conversion_Line'], ['high', 'low'],
+                  lambda data, p: calculate_ichimoku_cloud(data, p['short_window'], p['long_window']),
+                  params=('short_window', 'long_window')),
+    IndicatorNode(['laguerre', 'laguerre_volatility'], ['close'],
+                  lambda data, p: calculate_adaptive_laguerre_filter_volatility(data, p['gamma'], p['window']),
+                  params=('gamma', 'window')),
+    IndicatorNode(['adaptive_relative_volatility'], ['high', 'low'],
+                  lambda data, p: adaptive_relative_volatility(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['adaptive_wpr_volatility'], ['high', 'low', 'close'],
+                  lambda data, p: adaptive_wpr_volatility(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['RVI'], ['high', 'low', 'close'], lambda data, p: relative_volatility_index(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['demand_index_volatility'], ['high', 'low'], lambda data, p: demand_index_volatility(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['commodity_selection_index'], ['open', 'high', 'low', 'close'],
+                  lambda data, p: commodity_selection_index(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['efficiency_ratio_volatility'], ['close'], lambda data, p: efficiency_ratio_volatility(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['R1', 'S1', 'R2', 'S2', 'R3', 'S3'], ['high', 'low', 'close'], lambda data, p: pivot_points_volatility(data)),
+    IndicatorNode(['cycles_indicator'], ['high', 'low', 'close'], lambda data, p: cycles_indicator_volatility(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['darvas_box'], ['high', 'low'], lambda data, p: darvas_box_volatility(data, p['window']),
+                  params=('window',)),
+    IndicatorNode(['BB_mid', 'rolling_std', 'BB_high', 'BB_low', 'BB_percentageChange', 'BB_width'], ['close'],
+                  lambda data, p: calculate_bollinger_bands(data, p['bb_window'], p['bb_deviation']),
+                  params=('bb_window', 'bb_deviation')),
+    IndicatorNode(['donchian_high', 'donchian_low', 'donchian_mid', 'donchian_percentageChange', 'donchian_width'],
+                  ['high', 'low', 'close'], lambda data, p: calculate_donchian_channel(data, p['donchian_window']),
+                  params=('donchian_window',)),
+    IndicatorNode(['close_previous', 'TRANGE'], ['high', 'low', 'close'], lambda data, p: calculate_true_range(data)),
+    IndicatorNode(['ATR', 'NATR'], ['TRANGE', 'close'], lambda data, p: calculate_atr_on_true_range(data, p['atr_window']),
+                  params=('atr_window',)),
+    IndicatorNode(['typical_price', 'kc_mid', 'kc_high', 'kc_low', 'kc_width'], ['high', 'low', 'close', 'ATR'],
+                  lambda data, p: calculate_keltner_channel(data, p['keltner_window'], p['atr_kc_multiplier']),
+                  params=('keltner_window', 'atr_kc_multiplier')),
+    IndicatorNode(['ui_drawdown', 'ulcer_index'], ['close'], lambda data, p: calculate_ulcer_index(data, p['ulcer_index_window']),
+                  params=('ulcer_index_window',)),
+    IndicatorNode(['price_spread', 'ema_price_spread', 'chaikin_volatility'], ['high', 'low'],
+                  lambda data, p: calculate_chaikin_volatility(data, p['chaikin_volatility_period']),
+                  params=('chaikin_volatility_period',)),
+    IndicatorNode(['sma_midpoint', 'DPO'], ['close'], lambda data, p: calculate_dpo(data, p['dpo_period']),
+                  params=('dpo_period',)),
+    IndicatorNode(['ROC'], ['close'], lambda data, p: calculate_roc(data, p['roc_period']),
+                  params=('roc_period',))
+]
+
+# Column name -> node producing it
+NODE_BY_OUTPUT = {output: node for node in INDICATOR_NODES for output in node.outputs}
+
+
+def split_request(requested):
+    """
+    Split requested columns into base indicators and their RSI / stochastic transforms.
+
+    Parameters:
+    - requested (list): Column names such as 'SMA', 'ulcer_index_rsi' or 'kc_low_k_percent'.
+
+    Returns:
+    - Tuple: (base columns, columns to take RSI of, columns to take stochastics of).
+
+    Raises:
+    - ValueError: If a requested column is not produced by any node.
+    """
+    base, rsi, stoch = [], [], []
+    for name in requested:
+        if name.endswith('_rsi') and name[:-len('_rsi')] in RSI_INDICATOR_COLUMNS:
+            rsi.append(name[:-len('_rsi')])
+        elif name.endswith(('_k_percent', '_d_percent')) and name[:-len('_k_percent')] in STOCH_INDICATOR_COLUMNS:
+            stoch.append(name[:-len('_k_percent')])
+        elif name in NODE_BY_OUTPUT or name in BASE_COLUMNS:
+            base.append(name)
+        else:
+            raise ValueError(f"Unknown indicator: {name}")
+    return base, rsi, stoch
+
+
+def resolve_nodes(columns):
+    """
+    Return the nodes needed to produce columns, including everything they depend on.
+
+    Parameters:
+    - columns (list): Base indicator columns.
+
+    Returns:
+    - nodes (list): Nodes in INDICATOR_NODES order, which is a valid evaluation order.
+    """
+    needed = set()
+    pending = [column for column in columns if column in NODE_BY_OUTPUT]
+    while pending:
+        node = NODE_BY_OUTPUT[pending.pop()]
+        if id(node) in needed:
+            continue
+        needed.add(id(node))
+        pending.extend(column for column in node.inputs if column in NODE_BY_OUTPUT)
+    return [node for node in INDICATOR_NODES if id(node) in needed]
+
+
+def compute_indicators(data, requested, params):
+    """
+    Compute only the indicators a request needs.
+
+    Parameters:
+    - data (pd.DataFrame): OHLC bars; indicator columns are added to it.
+    - requested (list): Columns wanted, base indicators or their '_rsi', '_k_percent' and '_d_percent' transforms.
+    - params (dict): Indicator parameters (the names used in applying_indicators).
+
+    Returns:
+    - Tuple: (OHLC with the computed base indicators, requested RSI columns, requested stochastic columns).
+    """
+    base, rsi, stoch = split_request(requested)
+    for node in resolve_nodes(base + rsi + stoch):
+        data = node.compute(data, params)
+
+    # Transforms keep the library's column order
+    rsi_columns = [column for column in RSI_INDICATOR_COLUMNS if column in rsi]
+    data_rsi = rsi_frame(data, rsi_columns, params['rsi_window'])
+
+    stoch_columns = [column for column in STOCH_INDICATOR_COLUMNS if column in stoch]
+    data_stoch = stoch_frame(data, stoch_columns, params['k_window'], params['d_window'])
+
+    return data, data_rsi, data_stoch
+
+
+def sweep_indicators(data, requested, param_sets):
+    """
+    Compute the requested indicators for several parameter sets together.
+
+    A node is computed once per distinct combination of the parameters it
+    reads and the nodes it reads from, so sets that differ only in, say,
+    bb_deviation share every other indicator. RSI and stochastic transforms
+    run once over the matrix of distinct source columns, sharing running
+    sums between windows.
+
+    Parameters:
+    - data (pd.DataFrame): OHLC bars.
+    - requested (list): Columns wanted, as in compute_indicators.
+    - param_sets (list): Full indicator parameter dicts, one per set.
+
+    Returns:
+    - Tuple: (OHLC with base indicators, RSI columns, stochastic columns). Columns are a MultiIndex
+      ('param_set', 'indicator') with the position of the set in param_sets as first level. Each
+      frame is one float64 block laid out set by set, so frame[k] is a view, not a copy.
+    """
+    base, rsi, stoch = split_request(requested)
+    nodes = resolve_nodes(base + rsi + stoch)
+    rsi_columns = [column for column in RSI_INDICATOR_COLUMNS if column in rsi]
+    stoch_columns = [column for column in STOCH_INDICATOR_COLUMNS if column in stoch]
+    source = data[BASE_COLUMNS].astype(np.float64)
+
+    # Node key -> computed columns, and per set the key of every column
+    computed = {}
+    column_keys = []
+    frames = []
+    for params in param_sets:
+        frame = source.copy()
+        keys = {column: column for column in BASE_COLUMNS}
+        for node in nodes:
+            key = (INDICATOR_NODES.index(node),) + tuple(params[name] for name in node.params) + \
+                  tuple(keys[column] for column in node.inputs)
+            if key not in computed:
+                outputs = node.function(frame, params)
+                computed[key] = (outputs,) if len(node.outputs) == 1 else outputs
+            for name, value in zip(node.outputs, computed[key]):
+                frame[name] = value
+                keys[name] = (key, name)
+        column_keys.append(keys)
+        frames.append(frame)
+
+    # Distinct source columns of the transforms, across all sets
+    distinct = {}
+    for keys, frame in zip(column_keys, frames):
+        for column in dict.fromkeys(rsi_columns + stoch_columns):
+            distinct.setdefault(keys[column], frame[column].to_numpy(dtype=np.float64))
+    position = {key: i for i, key in enumerate(distinct)}
+    matrix = np.empty((len(data), len(distinct)), order='F')
+    for i, values in enumerate(distinct.values()):
+        matrix[:, i] = values
+
+    rsi_windows = list(dict.fromkeys(p['rsi_window'] for p in param_sets))
+    stoch_windows = list(dict.fromkeys((p['k_window'], p['d_window']) for p in param_sets))
+    rsi_by_window = calculate_rsi_2d_windows(matrix, rsi_windows) if rsi_columns else {}
+    stoch_by_window = calculate_stoch_2d_windows(matrix, stoch_windows) if stoch_columns else {}
+
+    # Outputs are filled in place, column-major so that each setting is one contiguous slice
+    data_names = list(frames[0].columns)
+    rsi_names = [f'{column}_rsi' for column in rsi_columns]
+    stoch_names = [f'{column}_{suffix}' for column in stoch_columns for suffix in ('k_percent', 'd_percent')]
+    data_out, rsi_out, stoch_out = [np.empty((len(data), len(param_sets) * len(names)), order='F')
+                                    for names in (data_names, rsi_names, stoch_names)]
+
+    for k, (params, keys, frame) in enumerate(zip(param_sets, column_keys, frames)):
+        data_out[:, k * len(data_names):(k + 1) * len(data_names)] = frame.to_numpy(dtype=np.float64)
+        if rsi_columns:
+            columns = [position[keys[column]] for column in rsi_columns]
+            rsi_out[:, k * len(rsi_names):(k + 1) * len(rsi_names)] = rsi_by_window[params['rsi_window']][:, columns]
+        if stoch_columns:
+            columns = [position[keys[column]] for column in stoch_columns]
+            k_percent, d_percent = stoch_by_window[(params['k_window'], params['d_window'])]
+            offset = k * len(stoch_names)
+            stoch_out[:, offset:offset + len(stoch_names):2] = k_percent[:, columns]
+            stoch_out[:, offset + 1:offset + len(stoch_names):2] = d_percent[:, columns]
+
+    def sweep_frame(values, names):
+        columns = pd.MultiIndex.from_product([range(len(param_sets)), names], names=['param_set', 'indicator'])
+        return pd.DataFrame(values, index=data.index, columns=columns, copy=False)
+
+    return (sweep_frame(data_out, data_names), sweep_frame(rsi_out, rsi_names), sweep_frame(stoch_out, stoch_names))
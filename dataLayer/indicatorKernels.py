@@ -0,0 +1,232 @@
+from time import perf_counter
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# True when the kernels below are compiled with Numba
+HAS_NUMBA = njit is not None
+
+
+def _weighted_moving_average_numpy(values, window):
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        weights = np.arange(1, window + 1, dtype=np.float64)
+        result[window - 1:] = sliding_window_view(values, window) @ weights / weights.sum()
+    return result
+
+
+def _rolling_mean_abs_deviation_numpy(values, window):
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window)
+        result[window - 1:] = np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+    return result
+
+
+def _true_range_numpy(high, low, close_previous):
+    # Same comparison order as max(high - low, |high - prev|, |low - prev|), so a NaN previous close is skipped
+    trange = high - low
+    for candidate in (np.abs(high - close_previous), np.abs(low - close_previous)):
+        with np.errstate(invalid='ignore'):
+            trange = np.where(candidate > trange, candidate, trange)
+    return trange
+
+
+def _laguerre_filter_numpy(close, gamma):
+    alpha = np.exp(-gamma)
+    close_previous = np.concatenate([[np.nan], close[:-1]])
+    lag1 = (1 - alpha) * close + alpha * close_previous
+    lag1_previous = np.concatenate([[np.nan], lag1[:-1]])
+    lag2 = (-alpha**2) * close + 2 * alpha * lag1 - lag1_previous
+    lag3 = (alpha**3) * close - 3 * alpha * lag2 + 3 * lag1 - lag1_previous
+    lag4 = (-alpha**4) * close + 4 * alpha * lag3 - 6 * lag2 + 4 * lag1 - lag1_previous
+    l0 = (1 - alpha/2)**2 * lag4
+    l1 = -2 * (1 - alpha) * lag3
+    l2 = (1 - alpha) * (1 - alpha) * lag2
+    return (l0 + l1 + l2) / 6
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _weighted_moving_average_numba(values, window):
+        n = len(values)
+        result = np.full(n, np.nan)
+        total_weight = window * (window + 1) / 2.0
+        for i in range(window - 1, n):
+            acc = 0.0
+            for j in range(window):
+                acc += values[i - window + 1 + j] * (j + 1)
+            result[i] = acc / total_weight
+        return result
+
+    @njit(cache=True)
+    def _rolling_mean_abs_deviation_numba(values, window):
+        n = len(values)
+        result = np.full(n, np.nan)
+        for i in range(window - 1, n):
+            mean = 0.0
+            for j in range(i - window + 1, i + 1):
+                mean += values[j]
+            mean /= window
+            deviation = 0.0
+            for j in range(i - window + 1, i + 1):
+                deviation += abs(values[j] - mean)
+            result[i] = deviation / window
+        return result
+
+    @njit(cache=True)
+    def _true_range_numba(high, low, close_previous):
+        n = len(high)
+        result = np.empty(n)
+        for i in range(n):
+            trange = high[i] - low[i]
+            candidate = abs(high[i] - close_previous[i])
+            if candidate > trange:
+                trange = candidate
+            candidate = abs(low[i] - close_previous[i])
+            if candidate > trange:
+                trange = candidate
+            result[i] = trange
+        return result
+
+    @njit(cache=True)
+    def _laguerre_filter_numba(close, alpha, alpha2, alpha3, alpha4):
+        # Powers of alpha are passed in so the result matches the NumPy expression bit for bit
+        n = len(close)
+        result = np.full(n, np.nan)
+        lag1_previous = np.nan
+        for i in range(n):
+            close_previous = close[i - 1] if i > 0 else np.nan
+            lag1 = (1 - alpha) * close[i] + alpha * close_previous
+            lag2 = (-alpha2) * close[i] + 2 * alpha * lag1 - lag1_previous
+            lag3 = alpha3 * close[i] - 3 * alpha * lag2 + 3 * lag1 - lag1_previous
+            lag4 = (-alpha4) * close[i] + 4 * alpha * lag3 - 6 * lag2 + 4 * lag1 - lag1_previous
+            l0 = (1 - alpha/2)**2 * lag4
+            l1 = -2 * (1 - alpha) * lag3
+            l2 = (1 - alpha) * (1 - alpha) * lag2
+            result[i] = (l0 + l1 + l2) / 6
+            lag1_previous = lag1
+        return result
+
+
+def _as_float(values):
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def weighted_moving_average(values, window):
+    """
+    Linearly weighted moving average (weights 1..window, newest heaviest), NaN for the first window-1 rows.
+    """
+    values = _as_float(values)
+    if HAS_NUMBA:
+        return _weighted_moving_average_numba(values, int(window))
+    return _weighted_moving_average_numpy(values, int(window))
+
+
+def rolling_mean_abs_deviation(values, window):
+    """
+    Rolling mean absolute deviation from the window mean, NaN for the first window-1 rows.
+    """
+    values = _as_float(values)
+    if HAS_NUMBA:
+        return _rolling_mean_abs_deviation_numba(values, int(window))
+    return _rolling_mean_abs_deviation_numpy(values, int(window))
+
+
+def true_range(high, low, close_previous):
+    """
+    True range per bar: the largest of high - low, |high - previous close| and |low - previous close|.
+    """
+    high, low, close_previous = _as_float(high), _as_float(low), _as_float(close_previous)
+    if HAS_NUMBA:
+        return _true_range_numba(high, low, close_previous)
+    return _true_range_numpy(high, low, close_previous)
+
+
+def laguerre_filter(close, gamma):
+    """
+    Adaptive Laguerre filter of a close series (the laguerre column of the indicator library).
+    """
+    close = _as_float(close)
+    if HAS_NUMBA:
+        alpha = np.exp(-gamma)
+        return _laguerre_filter_numba(close, alpha, alpha**2, alpha**3, alpha**4)
+    return _laguerre_filter_numpy(close, float(gamma))
+
+
+def _best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        result = function()
+        timings.append(perf_counter() - started)
+    return min(timings), result
+
+
+def benchmark_kernels(n_bars=22500, window=14, gamma=0.5, repeat=3, seed=0):
+    """
+    Time the kernels against the pandas implementations they replace.
+
+    The default size is a full 09:15-15:30 session of 1-second bars. Numba
+    compilation is excluded by a warm-up call before timing.
+
+    Parameters:
+    - n_bars (int): Number of synthetic bars.
+    - window (int): Indicator window.
+    - gamma (float): Laguerre gamma.
+    - repeat (int): Timing repetitions; the best one is reported.
+    - seed (int): Seed of the synthetic random walk.
+
+    Returns:
+    - results (pd.DataFrame): One row per indicator with 'pandas_seconds', 'kernel_seconds',
+      'speedup' and 'max_abs_diff'.
+    """
+    rng = np.random.default_rng(seed)
+    close = pd.Series(18000 + rng.normal(scale=2.0, size=n_bars).cumsum())
+    high = close + rng.uniform(0, 3, size=n_bars)
+    low = close - rng.uniform(0, 3, size=n_bars)
+    close_previous = close.shift(1)
+    typical_price = (high + low + close) / 3
+
+    weights = np.arange(1, window + 1)
+    mad = lambda x: np.mean(np.abs(x - np.mean(x)))
+
+    def pandas_laguerre():
+        alpha = np.exp(-gamma)
+        lag1 = (1 - alpha) * close + alpha * close.shift(1)
+        lag2 = (-alpha**2) * close + 2 * alpha * lag1 - lag1.shift(1)
+        lag3 = (alpha**3) * close - 3 * alpha * lag2 + 3 * lag1 - lag1.shift(1)
+        lag4 = (-alpha**4) * close + 4 * alpha * lag3 - 6 * lag2 + 4 * lag1 - lag1.shift(1)
+        return ((1 - alpha/2)**2 * lag4 - 2 * (1 - alpha) * lag3 + (1 - alpha) * (1 - alpha) * lag2) / 6
+
+    frame = pd.DataFrame({'high': high, 'low': low, 'close_previous': close_previous})
+    cases = {
+        'WMA': (lambda: close.rolling(window=window).apply(lambda x: np.dot(x, weights) / weights.sum(), raw=True),
+                lambda: weighted_moving_average(close.values, window)),
+        'mean_abs_deviation': (lambda: typical_price.rolling(window=window).apply(mad, raw=True),
+                               lambda: rolling_mean_abs_deviation(typical_price.values, window)),
+        'TRANGE': (lambda: frame.apply(lambda row: max(row['high'] - row['low'], abs(row['high'] - row['close_previous']),
+                                                       abs(row['low'] - row['close_previous'])), axis=1),
+                   lambda: true_range(high.values, low.values, close_previous.values)),
+        'laguerre': (pandas_laguerre, lambda: laguerre_filter(close.values, gamma))
+    }
+
+    rows = []
+    for name, (reference, kernel) in cases.items():
+        kernel()
+        pandas_seconds, expected = _best_time(reference, repeat)
+        kernel_seconds, result = _best_time(kernel, repeat)
+        difference = np.abs(np.asarray(expected, dtype=np.float64) - result)
+        rows.append({
+            'indicator': name,
+            'pandas_seconds': pandas_seconds,
+            'kernel_seconds': kernel_seconds,
+            'speedup': pandas_seconds / kernel_seconds if kernel_seconds > 0 else np.inf,
+            'max_abs_diff': float(np.nanmax(difference)) if np.isfinite(difference).any() else 0.0
+        })
+    return pd.DataFrame(rows).set_index('indicator')
@@ -0,0 +1,235 @@
+import numpy as np
+from scipy.special import ndtr
+
+# Bounds on volatility searched by the solver
+MIN_SIGMA = 1e-6
+MAX_SIGMA = 10.0
+
+SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+def _norm_pdf(x):
+    return np.exp(-0.5 * x * x) / SQRT_2PI
+
+
+def _d1_d2(S, K, T, r, sigma):
+    sqrt_t = np.sqrt(T)
+    sigma_sqrt_t = sigma * sqrt_t
+    d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrt_t
+    return d1, d1 - sigma_sqrt_t, sqrt_t
+
+
+def black_scholes_price(S, K, T, r, sigma, is_call):
+    """
+    Black-Scholes price for calls and puts (no dividends).
+
+    Parameters:
+    - S, K, T, r, sigma (np.ndarray): Spot, strike, annualized time to expiry, rate and volatility.
+    - is_call (np.ndarray): Boolean mask, True for calls.
+
+    Returns:
+    - price (np.ndarray): Option prices.
+    """
+    d1, d2, _ = _d1_d2(S, K, T, r, sigma)
+    discount = K * np.exp(-r * T)
+    call = S * ndtr(d1) - discount * ndtr(d2)
+    put = discount * ndtr(-d2) - S * ndtr(-d1)
+    return np.where(is_call, call, put)
+
+
+def black_scholes_greeks(S, K, T, r, sigma, is_call):
+    """
+    Delta, gamma, rho and theta computed in one pass from shared d1/d2 terms.
+
+    Follows the conventions of the py_vollib_vectorized Greeks used so far:
+    rho is per 1% change in rate and theta is the price change over one
+    calendar day (or to expiry when less than a day is left). NaN volatilities
+    give NaN Greeks.
+
+    Parameters:
+    - S, K, T, r, sigma (np.ndarray): Spot, strike, annualized time to expiry, rate and volatility.
+    - is_call (np.ndarray): Boolean mask, True for calls.
+
+    Returns:
+    - Tuple: (delta, gamma, rho, theta) arrays.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1, d2, sqrt_t = _d1_d2(S, K, T, r, sigma)
+        pdf_d1 = _norm_pdf(d1)
+        nd1 = ndtr(d1)
+        nd2 = ndtr(d2)
+        discount = K * np.exp(-r * T)
+
+        delta = np.where(is_call, nd1, nd1 - 1.0)
+        gamma = pdf_d1 / (S * sigma * sqrt_t)
+        rho = np.where(is_call, T * discount * nd2, -T * discount * (1.0 - nd2)) * 0.01
+
+        price = np.where(is_call, S * nd1 - discount * nd2, discount * (1.0 - nd2) - S * (1.0 - nd1))
+        T_next = np.where(T <= 1.0 / 365.0, 0.00001, T - 1.0 / 365.0)
+        theta = black_scholes_price(S, K, T_next, r, sigma, is_call) - price
+
+    return delta, gamma, rho, theta
+
+
+def _initial_guess(price, S, K, T, r, is_call):
+    """
+    Corrado-Miller approximation used to seed rows that have no warm start.
+    """
+    discount = K * np.exp(-r * T)
+    # Put-call parity gives the call price for put rows
+    call_price = np.where(is_call, price, price + S - discount)
+    half_gap = (S - discount) / 2
+    inner = (call_price - half_gap) ** 2 - (S - discount) ** 2 / np.pi
+    guess = np.sqrt(2 * np.pi / T) / (S + discount) * (call_price - half_gap + np.sqrt(np.maximum(inner, 0)))
+    return np.clip(np.where(np.isfinite(guess) & (guess > 0), guess, 0.2), 0.01, 3.0)
+
+
+def _halley(price, S, K, T, r, is_call, sigma, tol, max_iterations):
+    """
+    Safeguarded Newton/Halley iterations on the rows that have not converged yet.
+
+    Returns:
+    - Tuple: (sigma, converged mask, iterations per row).
+    """
+    n = len(price)
+    low = np.full(n, MIN_SIGMA)
+    high = np.full(n, MAX_SIGMA)
+    converged = np.zeros(n, dtype=bool)
+    iterations = np.zeros(n, dtype=np.int16)
+    active = np.arange(n)
+
+    for _ in range(max_iterations):
+        if active.size == 0:
+            break
+
+        s, k, t, rr, call, sig = S[active], K[active], T[active], r[active], is_call[active], sigma[active]
+        d1, d2, sqrt_t = _d1_d2(s, k, t, rr, sig)
+        discount = k * np.exp(-rr * t)
+        model = np.where(call, s * ndtr(d1) - discount * ndtr(d2), discount * ndtr(-d2) - s * ndtr(-d1))
+        diff = model - price[active]
+        vega = s * _norm_pdf(d1) * sqrt_t
+        iterations[active] += 1
+
+        done = np.abs(diff) <= tol * np.maximum(price[active], 1.0)
+        converged[active[done]] = True
+
+        # Price is increasing in sigma, so every evaluation tightens the bracket
+        too_high = diff > 0
+        high[active] = np.where(too_high, np.minimum(high[active], sig), high[active])
+        low[active] = np.where(too_high, low[active], np.maximum(low[active], sig))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = diff / vega
+            volga_ratio = d1 * d2 / sig
+            step = newton / (1.0 - 0.5 * newton * volga_ratio)
+            step = np.where(np.isfinite(step), step, newton)
+            candidate = sig - step
+
+        lo, hi = low[active], high[active]
+        outside = ~np.isfinite(candidate) | (candidate <= lo) | (candidate >= hi)
+        candidate = np.where(outside, 0.5 * (lo + hi), candidate)
+
+        keep = ~done
+        sigma[active[keep]] = candidate[keep]
+        active = active[keep]
+
+    return sigma, converged, iterations
+
+
+def implied_volatility_warm_start(option_prices, spot_prices, strike_prices, times_to_expiry, risk_free_rates, is_call,
+                                  contract_ids, tol=1e-8, max_iterations=50, anchor_stride=64):
+    """
+    Vectorized implied volatility that warm-starts each row from an earlier row of the same contract.
+
+    Rows of each contract (same strike/type/expiry) are ordered in time. Every
+    anchor_stride-th row is solved cold from a Corrado-Miller seed; the remaining
+    rows are filled in halving strides, each seeded with the IV of the row stride
+    positions earlier, so the final pass seeds every odd row from the previous
+    second. Within a pass only unconverged rows are iterated.
+
+    Rows priced below intrinsic value, at or above the no-arbitrage maximum, with
+    non-positive time to expiry or that fail to converge get NaN, matching
+    vectorized_implied_volatility(on_error='warn').
+
+    Parameters:
+    - option_prices, spot_prices, strike_prices, times_to_expiry, risk_free_rates (np.ndarray): Inputs per row.
+    - is_call (np.ndarray): Boolean mask, True for calls.
+    - contract_ids (np.ndarray): Integer contract id per row; rows must be in time order within a contract.
+    - tol (float): Relative price tolerance.
+    - max_iterations (int): Iteration cap per pass.
+    - anchor_stride (int): Distance between cold-solved anchor rows (rounded up to a power of two).
+
+    Returns:
+    - iv (np.ndarray): Implied volatility per row.
+    - info (dict): 'iterations' (Newton/Halley iterations over all passes), 'row_iterations'
+      (row evaluations), 'mean_iterations' (per solvable row) and 'failed' (NaN rows).
+    """
+    price = np.asarray(option_prices, dtype=np.float64)
+    S = np.asarray(spot_prices, dtype=np.float64)
+    K = np.asarray(strike_prices, dtype=np.float64)
+    T = np.asarray(times_to_expiry, dtype=np.float64)
+    r = np.broadcast_to(np.asarray(risk_free_rates, dtype=np.float64), price.shape)
+    is_call = np.asarray(is_call, dtype=bool)
+    n = len(price)
+
+    iv = np.full(n, np.nan)
+    info = {'iterations': 0, 'row_iterations': 0, 'mean_iterations': 0.0, 'failed': 0}
+    if n == 0:
+        return iv, info
+
+    # Same arbitrage checks as py_vollib_vectorized, on undiscounted prices
+    with np.errstate(invalid='ignore', over='ignore'):
+        forward = S * np.exp(r * T)
+        undiscounted = price * np.exp(r * T)
+        intrinsic = np.maximum(np.where(is_call, forward - K, K - forward), 0.0)
+        max_price = np.where(is_call, forward, K)
+        solvable = (T > 0) & np.isfinite(price) & np.isfinite(S) & np.isfinite(K) & \
+                   (undiscounted >= intrinsic) & (undiscounted < max_price)
+
+    # Position of each row within its contract, keeping time order
+    order = np.argsort(contract_ids, kind='stable')
+    sorted_ids = np.asarray(contract_ids)[order]
+    starts = np.r_[0, np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1]
+    group_start = np.repeat(starts, np.diff(np.r_[starts, n]))
+    position = np.empty(n, dtype=np.int64)
+    position[order] = np.arange(n) - group_start
+
+    stride = 1
+    while stride < max(anchor_stride, 1):
+        stride *= 2
+
+    sorted_pos = np.empty(n, dtype=np.int64)
+    sorted_pos[order] = np.arange(n)
+
+    solved = np.zeros(n, dtype=bool)
+    row_iterations = 0
+    iterations = 0
+
+    while stride >= 1:
+        rows = np.flatnonzero(solvable & ~solved & (position % stride == 0))
+        if rows.size:
+            # Seed from the row stride positions earlier in the same contract, cold where there is none
+            seed = np.full(rows.size, np.nan)
+            has_previous = position[rows] >= stride
+            previous = order[sorted_pos[rows[has_previous]] - stride]
+            seed[has_previous] = iv[previous]
+            cold = ~np.isfinite(seed)
+            if cold.any():
+                cold_rows = rows[cold]
+                seed[cold] = _initial_guess(price[cold_rows], S[cold_rows], K[cold_rows], T[cold_rows],
+                                            r[cold_rows], is_call[cold_rows])
+
+            sigma, converged, row_iter = _halley(price[rows], S[rows], K[rows], T[rows], r[rows], is_call[rows],
+                                                 seed, tol, max_iterations)
+            iv[rows[converged]] = sigma[converged]
+            solved[rows] = True
+            row_iterations += int(row_iter.sum())
+            iterations += int(row_iter.max())
+
+        stride //= 2
+
+    info['iterations'] = iterations
+    info['row_iterations'] = row_iterations
+    info['mean_iterations'] = row_iterations / max(int(solvable.sum()), 1)
+    info['failed'] = int(np.isnan(iv).sum())
+    return iv, info
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+from .calculateGreeks import calculate_iv_and_greeks, RISK_FREE_RATE
+
+# Greeks served by LazyGreeks.lookup
+LAZY_GREEKS_COLUMNS = ['iv', 'delta', 'gamma', 'rho', 'theta']
+
+
+class LazyGreeks:
+    """
+    On-demand IV/Greeks for an option chain that carries prices only.
+
+    Greeks are computed the first time a (strike_price, option_type) contract is
+    touched within a time window and memoized, so only the contracts and
+    periods that legs actually trade pay for IV solving.
+    """
+    def __init__(self, options_data, r=RISK_FREE_RATE, engine='warm_start', window_seconds=900):
+        """
+        Initialize the lazy Greeks provider.
+
+        Parameters:
+        - options_data (pd.DataFrame): Option chain indexed by timestamp without Greeks columns.
+        - r (float): Risk-free rate.
+        - engine (str): IV/Greeks engine passed to calculate_iv_and_greeks.
+        - window_seconds (int): Size of the memoized time windows per contract.
+        """
+        self.options_data = options_data
+        self.r = r
+        self.engine = engine
+        self.window_ns = int(window_seconds) * 1_000_000_000
+        self.contract_rows = None
+        self.contracts = {}
+        self.hits = 0
+        self.misses = 0
+        self.computed_rows = 0
+
+    def _contract(self, strike_price, option_type):
+        """
+        Return the memo entry for a contract, building the row lookup on first use.
+        """
+        key = (strike_price, option_type)
+        contract = self.contracts.get(key)
+        if contract is not None:
+            return contract
+
+        if self.contract_rows is None:
+            self.contract_rows = self.options_data.groupby(['strike_price', 'option_type'], sort=False, observed=True).indices
+
+        rows = self.contract_rows.get(key)
+        if rows is None:
+            return None
+
+        timestamps = self.options_data.index.values[rows].astype('datetime64[ns]').astype(np.int64)
+        order = np.argsort(timestamps, kind='stable')
+        rows, timestamps = rows[order], timestamps[order]
+        contract = {
+            'rows': rows,
+            'timestamps': timestamps,
+            'windows': (timestamps - timestamps[0]) // self.window_ns,
+            'computed': set(),
+            'values': {name: np.full(len(rows), np.nan) for name in LAZY_GREEKS_COLUMNS}
+        }
+        self.contracts[key] = contract
+        return contract
+
+    def _compute_window(self, contract, window):
+        """
+        Compute IV/Greeks for all rows of a contract that fall in one window.
+        """
+        positions = np.flatnonzero(contract['windows'] == window)
+        chunk = self.options_data.iloc[contract['rows'][positions]].copy()
+        chunk = calculate_iv_and_greeks(chunk, r=self.r, engine=self.engine)
+        if isinstance(chunk, pd.DataFrame):
+            for name in LAZY_GREEKS_COLUMNS:
+                contract['values'][name][positions] = chunk[name].values
+        contract['computed'].add(window)
+        self.computed_rows += len(positions)
+
+    def lookup(self, strike_price, option_type, timestamp):
+        """
+        Return IV and Greeks of a contract at a timestamp, computing its window if needed.
+
+        Parameters:
+        - strike_price (float): Strike price of the contract.
+        - option_type (str): 'CE' or 'PE'.
+        - timestamp (datetime): Quote timestamp of the contract.
+
+        Returns:
+        - greeks (dict): 'iv', 'delta', 'gamma', 'rho', 'theta' (NaN when the contract has no quote at timestamp).
+        """
+        contract = self._contract(strike_price, option_type)
+        if contract is None:
+            return {name: np.nan for name in LAZY_GREEKS_COLUMNS}
+
+        ts = pd.Timestamp(timestamp).value
+        position = np.searchsorted(contract['timestamps'], ts)
+        if position >= len(contract['timestamps']) or contract['timestamps'][position] != ts:
+            return {name: np.nan for name in LAZY_GREEKS_COLUMNS}
+
+        window = contract['windows'][position]
+        if window in contract['computed']:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._compute_window(contract, window)
+
+        return {name: contract['values'][name][position] for name in LAZY_GREEKS_COLUMNS}
+
+    def stats(self):
+        """
+        Return memoization statistics.
+
+        Returns:
+        - stats (dict): hits, misses, contracts touched, rows computed and the fraction of the chain computed.
+        """
+        total_rows = len(self.options_data)
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'contracts': len(self.contracts),
+            'computed_rows': self.computed_rows,
+            'computed_fraction': self.computed_rows / total_rows if total_rows else 0.0
+        }
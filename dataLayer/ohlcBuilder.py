@@ -1,5 +1,8 @@
 import pandas as pd
 
+# How each candle column combines when finer bars are merged into a coarser one
+OHLC_AGGREGATIONS = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'oi': 'sum'}
+
 def create_ohlc_candles(tick_data, timeframe):
     """
     Aggregates tick data into OHLC candles based on the given timeframe.
@@ -20,4 +23,75 @@ def create_ohlc_candles(tick_data, timeframe):
     if 'OI' in tick_data.columns:
         ohlc_data['oi'] = tick_data['OI'].resample(timeframe).sum()
     
-    return ohlc_data
\ No newline at end of file
+    return ohlc_data
+
+def _offset(timeframe):
+    return pd.to_timedelta(pd.tseries.frequencies.to_offset(timeframe))
+
+def resample_ohlc(ohlc_data, timeframe):
+    """
+    Merges OHLC candles into coarser candles without going back to the ticks.
+
+    Open and close skip empty bars, high and low take the extremes, volume and OI are summed,
+    so the result equals create_ohlc_candles on the same ticks.
+
+    Parameters:
+    - ohlc_data: A DataFrame of candles as returned by create_ohlc_candles
+    - timeframe: Coarser timeframe, a whole multiple of the candles' timeframe
+
+    Returns:
+    - ohlc_data: A DataFrame containing the coarser candles
+    """
+    aggregations = {column: OHLC_AGGREGATIONS[column] for column in ohlc_data.columns if column in OHLC_AGGREGATIONS}
+    return ohlc_data.resample(timeframe).agg(aggregations)
+
+def create_ohlc_pyramid(tick_data, timeframes):
+    """
+    Builds candles for several timeframes with a single pass over the ticks.
+
+    The finest timeframe is resampled from the ticks and every coarser one is
+    merged from it with resample_ohlc.
+
+    Parameters:
+    - tick_data: A DataFrame containing tick data (see create_ohlc_candles)
+    - timeframes: List of timeframes, e.g. ['1T', '3T', '5T', '15T', '1H']
+
+    Returns:
+    - pyramid: Dict of timeframe -> DataFrame of candles, in the order given
+    """
+    by_length = sorted(timeframes, key=_offset)
+    base = by_length[0]
+    for timeframe in by_length[1:]:
+        if _offset(timeframe) % _offset(base) != pd.Timedelta(0):
+            raise ValueError(f"Timeframe {timeframe} is not a multiple of {base}")
+
+    base_data = create_ohlc_candles(tick_data, base)
+    pyramid = {base: base_data}
+    for timeframe in by_length[1:]:
+        pyramid[timeframe] = resample_ohlc(base_data, timeframe)
+    return {timeframe: pyramid[timeframe] for timeframe in timeframes}
+
+def align_pyramid(pyramid):
+    """
+    Puts the candles of a pyramid on the finest timeframe's index as one frame.
+
+    A coarser candle appears from the last fine bar it covers onwards, i.e. once it
+    is complete, and is carried forward until the next one completes, so no row
+    sees a candle that is still forming.
+
+    Parameters:
+    - pyramid: Dict of timeframe -> DataFrame of candles (see create_ohlc_pyramid)
+
+    Returns:
+    - aligned: A DataFrame with a ('timeframe', column) MultiIndex on the columns
+    """
+    base = min(pyramid, key=_offset)
+    index = pyramid[base].index
+    frames = {}
+    for timeframe, ohlc_data in pyramid.items():
+        if timeframe != base:
+            completed = ohlc_data.copy()
+            completed.index = completed.index + (_offset(timeframe) - _offset(base))
+            ohlc_data = completed.reindex(index, method='ffill')
+        frames[timeframe] = ohlc_data
+    return pd.concat(frames, axis=1, names=['timeframe', None])
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+
+# Tick columns aggregated into candles, and the candle column each one produces
+TICK_COLUMNS = {'Volume': 'volume', 'OI': 'oi'}
+# Chunks up to this many ticks are merged tick by tick instead of through a groupby
+SMALL_CHUNK = 64
+
+
+class StreamingCandles:
+    """
+    Tick-to-candle aggregator fed one chunk of ticks at a time.
+
+    Candles are the ones create_ohlc_candles builds from the same ticks:
+    buckets are anchored at midnight of the first tick (resample's default
+    origin), open and close follow tick timestamps rather than arrival order,
+    and empty buckets between two candles come out as NaN rows with zero
+    volume and OI. A bucket is emitted once the latest tick seen is at least
+    `lateness` past its end; ticks arriving within that tolerance are merged
+    into their bucket wherever they fall in the stream, and older ones are
+    dropped and counted in late_ticks. Only buckets that are still open are
+    kept, so memory does not grow with the number of ticks.
+    """
+    def __init__(self, timeframe, lateness='0s', fill_gaps=True):
+        """
+        Initialize the aggregator.
+
+        Parameters:
+        - timeframe (str): Candle timeframe (e.g. '1T').
+        - lateness (str or pd.Timedelta): How far behind the latest tick a tick may arrive and still be counted.
+        - fill_gaps (bool): Emit NaN candles for empty buckets, as resample does. Turn off for multi-day
+          streams to skip the overnight buckets.
+        """
+        self.timeframe = timeframe
+        self.step = pd.to_timedelta(pd.tseries.frequencies.to_offset(timeframe)).value
+        self.lateness = pd.Timedelta(lateness).value
+        self.fill_gaps = fill_gaps
+        self.origin = None
+        self.dtypes = {}
+        self.index_name = None
+        self.empty = None
+        # bucket start (ns) -> [open, high, low, close, volume, oi, first tick ns, last tick ns]
+        self.pending = {}
+        self.next_bucket = None
+        self.latest = None
+        self.ticks = 0
+        self.late_ticks = 0
+        self.candles = 0
+
+    def _start(self, chunk):
+        first = int(chunk.index.values.astype('datetime64[ns]').astype(np.int64).min())
+        self.origin = pd.Timestamp(first).normalize().value
+        self.dtypes = {name: chunk[name].dtype for name in TICK_COLUMNS if name in chunk.columns}
+        self.index_name = chunk.index.name
+
+    def _merge(self, bucket, row):
+        current = self.pending.get(bucket)
+        if current is None:
+            self.pending[bucket] = row
+            return
+        if row[6] < current[6]:
+            current[0], current[6] = row[0], row[6]
+        if row[7] >= current[7]:
+            current[3], current[7] = row[3], row[7]
+        current[1] = max(current[1], row[1])
+        current[2] = min(current[2], row[2])
+        current[4] += row[4]
+        current[5] += row[5]
+
+    def _emit(self, buckets):
+        if not buckets and self.empty is not None:
+            return self.empty
+        records = [self.pending.pop(bucket) for bucket in buckets]
+        if self.fill_gaps and buckets:
+            start = buckets[0] if self.next_bucket is None else self.next_bucket
+            index = np.arange(start, buckets[-1] + self.step, self.step, dtype=np.int64)
+        else:
+            index = np.asarray(buckets, dtype=np.int64)
+
+        positions = np.searchsorted(index, np.asarray(buckets, dtype=np.int64))
+        prices = np.full((len(index), 4), np.nan)
+        totals = np.zeros((len(index), 2))
+        if records:
+            values = np.array([record[:6] for record in records], dtype=np.float64)
+            prices[positions] = values[:, :4]
+            totals[positions] = values[:, 4:6]
+        if buckets:
+            self.next_bucket = buckets[-1] + self.step
+
+        candles = pd.DataFrame(prices, columns=['open', 'high', 'low', 'close'],
+                               index=pd.DatetimeIndex(index.astype('datetime64[ns]'), name=self.index_name))
+        for k, name in enumerate(TICK_COLUMNS):
+            if name in self.dtypes:
+                candles[TICK_COLUMNS[name]] = totals[:, k].astype(self.dtypes[name])
+        self.candles += len(candles)
+        if not buckets and self.origin is not None:
+            self.empty = candles
+        return candles
+
+    def update(self, chunk):
+        """
+        Add a chunk of ticks and return the candles it closes.
+
+        Parameters:
+        - chunk (pd.DataFrame): Ticks indexed by timestamp with 'Close' and optionally 'Volume' and 'OI',
+          as read by get_futures_data. Chunks may overlap in time up to the lateness tolerance.
+
+        Returns:
+        - candles (pd.DataFrame): Closed candles in time order, possibly empty.
+        """
+        if chunk is None or chunk.empty:
+            return self._emit([])
+        if self.origin is None:
+            self._start(chunk)
+
+        timestamps = chunk.index.values.astype('datetime64[ns]').astype(np.int64)
+        buckets = self.origin + (timestamps - self.origin) // self.step * self.step
+        self.ticks += len(timestamps)
+        self.latest = max(int(timestamps.max()), self.latest if self.latest is not None else int(timestamps.max()))
+
+        on_time = np.ones(len(timestamps), dtype=bool) if self.next_bucket is None else buckets >= self.next_bucket
+        self.late_ticks += int(len(on_time) - on_time.sum())
+
+        prices = chunk['Close'].values
+        totals = [chunk[name].values if name in self.dtypes else np.zeros(len(chunk)) for name in TICK_COLUMNS]
+        if len(chunk) <= SMALL_CHUNK:
+            for i in np.flatnonzero(on_time):
+                price, timestamp = float(prices[i]), int(timestamps[i])
+                self._merge(int(buckets[i]), [price, price, price, price, float(totals[0][i]), float(totals[1][i]),
+                                              timestamp, timestamp])
+        else:
+            frame = pd.DataFrame({'bucket': buckets, 'timestamp': timestamps, 'price': prices,
+                                  'volume': totals[0], 'oi': totals[1]})
+            frame = frame[on_time].sort_values('timestamp', kind='stable')
+            summary = frame.groupby('bucket', sort=True).agg(
+                open=('price', 'first'), high=('price', 'max'), low=('price', 'min'), close=('price', 'last'),
+                volume=('volume', 'sum'), oi=('oi', 'sum'), first=('timestamp', 'first'), last=('timestamp', 'last'))
+            for bucket, row in zip(summary.index.values, summary.itertuples(index=False)):
+                self._merge(int(bucket), list(row))
+
+        # Buckets whose end is at least `lateness` behind the latest tick are closed
+        watermark = self.latest - self.lateness
+        closed = sorted(bucket for bucket in self.pending if bucket + self.step <= watermark)
+        return self._emit(closed)
+
+    def flush(self):
+        """
+        Close every open bucket, e.g. at the end of a stream.
+
+        Returns:
+        - candles (pd.DataFrame): Remaining candles in time order.
+        """
+        return self._emit(sorted(self.pending))
+
+    def stats(self):
+        """
+        Return counters of this aggregator.
+
+        Returns:
+        - stats (dict): ticks, late_ticks (dropped), candles (emitted) and open_buckets.
+        """
+        return {
+            'ticks': self.ticks,
+            'late_ticks': self.late_ticks,
+            'candles': self.candles,
+            'open_buckets': len(self.pending)
+        }
+
+
+def stream_candles(chunks, timeframe, lateness='0s', fill_gaps=True):
+    """
+    Turn a stream of tick chunks into a stream of closed candles.
+
+    Each yielded frame can go straight to IncrementalIndicators.run, which keeps
+    its state between calls.
+
+    Parameters:
+    - chunks (iterable): Tick DataFrames, e.g. ParquetStore.iter_futures(...).
+    - timeframe (str): Candle timeframe (e.g. '1T').
+    - lateness (str or pd.Timedelta): Tolerance for late and out-of-order ticks (see StreamingCandles).
+    - fill_gaps (bool): Emit NaN candles for empty buckets.
+
+    Yields:
+    - candles (pd.DataFrame): Non-empty frames of closed candles in time order.
+    """
+    aggregator = StreamingCandles(timeframe, lateness=lateness, fill_gaps=fill_gaps)
+    for chunk in chunks:
+        candles = aggregator.update(chunk)
+        if not candles.empty:
+            yield candles
+    candles = aggregator.flush()
+    if not candles.empty:
+        yield candles
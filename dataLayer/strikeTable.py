@@ -0,0 +1,156 @@
+import numpy as np
+from executionLayer.sessionClock import SessionClock, SESSION_OPEN
+from .chainIndex import OPTION_TYPES
+
+
+class StrikeTable:
+    """
+    Per-second strike selection for one day of an option chain.
+
+    The ATM strike of every second is found once with a grouped argmin over
+    'Difference' (first row in chain order on ties, as in
+    SpreadBacktester.enter_spread), and stored in an array indexed by integer
+    second of the session. Strikes k steps away from ATM are read from the
+    sorted strike ladder. When the chain carries deltas, the strike nearest
+    to a target delta is read from the ChainIndex delta array if one is
+    given, otherwise from a dense (option type, second, strike) delta array
+    built on the first delta selection. Each selection is an array read.
+    """
+    def __init__(self, options_data, session_open=SESSION_OPEN, chain_index=None, clock=None):
+        """
+        Build the table from an option chain indexed by timestamp.
+
+        Parameters:
+        - options_data (pd.DataFrame): Option chain with 'strike_price', 'Difference' and optionally
+          'option_type' and 'delta'.
+        - session_open (datetime.time): Time mapped to second 0 when there is no clock or chain index.
+        - chain_index (ChainIndex or None): Index of the same chain whose 'delta' array serves delta selections.
+        - clock (SessionClock or None): Time axis of the day, None for the chain index's clock or
+          SessionClock.for_index of the chain.
+        """
+        if clock is None:
+            clock = chain_index.clock if chain_index is not None else SessionClock.for_index(options_data.index, session_open)
+        self.clock = clock
+
+        seconds = clock.seconds_of(options_data.index)
+        self.n_seconds = int(seconds.max()) + 1 if len(seconds) else 0
+
+        strike_prices = np.asarray(options_data['strike_price'].values, dtype=np.float64)
+        self.strikes = np.unique(strike_prices[~np.isnan(strike_prices)])
+        self.strike_lookup = {float(strike): position for position, strike in enumerate(self.strikes)}
+
+        # Smallest Difference per second, ties broken by chain order (lexsort is stable)
+        difference = np.asarray(options_data['Difference'].values, dtype=np.float64)
+        order = np.lexsort((difference, seconds))
+        first_rows = order[np.unique(seconds[order], return_index=True)[1]]
+        atm = np.where(np.isnan(difference[first_rows]), np.nan, strike_prices[first_rows])
+
+        self.atm = np.full(self.n_seconds, np.nan)
+        self.atm[seconds[first_rows]] = atm
+        self.atm_position = np.full(self.n_seconds, -1, dtype=np.int64)
+        valid = ~np.isnan(self.atm)
+        self.atm_position[valid] = np.searchsorted(self.strikes, self.atm[valid])
+
+        self.options_data = options_data
+        self.chain_index = chain_index if chain_index is not None and 'delta' in chain_index.values else None
+        self.has_delta = self.chain_index is not None or \
+            ('delta' in options_data.columns and 'option_type' in options_data.columns)
+        self.delta = None
+
+    def build_delta(self):
+        """
+        Build the dense (option type, second, strike) delta array of the chain.
+        """
+        options_data = self.options_data
+        seconds = self.clock.seconds_of(options_data.index)
+        strike_prices = np.asarray(options_data['strike_price'].values, dtype=np.float64)
+        option_types = np.asarray(options_data['option_type'].values)
+        self.delta = np.full((len(OPTION_TYPES), self.n_seconds, len(self.strikes)), np.nan, dtype=np.float32)
+        strike_positions = np.searchsorted(self.strikes, strike_prices)
+        for position, option_type in enumerate(OPTION_TYPES):
+            rows = (option_types == option_type) & ~np.isnan(strike_prices)
+            self.delta[position, seconds[rows], strike_positions[rows]] = options_data['delta'].values[rows]
+
+    def second_of(self, timestamp):
+        return self.clock.second_of(timestamp)
+
+    def atm_strike(self, timestamp):
+        """
+        Return the ATM strike at a timestamp.
+
+        Raises:
+        - KeyError: If the chain has no row at timestamp, like options_data.loc[timestamp].
+        """
+        second = self.second_of(timestamp)
+        strike = self.atm[second] if 0 <= second < self.n_seconds else np.nan
+        if np.isnan(strike):
+            raise KeyError(timestamp)
+        return strike
+
+    def offset_strike(self, timestamp, steps):
+        """
+        Return the strike `steps` places above (positive) or below (negative) ATM on the strike ladder.
+
+        Raises:
+        - KeyError: If there is no ATM at timestamp or the ladder does not reach that far.
+        """
+        second = self.second_of(timestamp)
+        position = self.atm_position[second] if 0 <= second < self.n_seconds else -1
+        if position < 0 or not 0 <= position + steps < len(self.strikes):
+            raise KeyError((timestamp, steps))
+        return self.strikes[position + steps]
+
+    def delta_strike(self, timestamp, option_type, target_delta):
+        """
+        Return the strike whose delta at timestamp is nearest to target_delta.
+
+        Parameters:
+        - timestamp (datetime): Selection time.
+        - option_type (str): 'CE' or 'PE'.
+        - target_delta (float): Signed target, e.g. 0.25 for calls or -0.25 for puts.
+
+        Raises:
+        - ValueError: If the chain was built without deltas.
+        - KeyError: If no strike of that type has a delta at timestamp.
+        """
+        if not self.has_delta:
+            raise ValueError("delta_strike requires a chain with 'delta' and 'option_type' columns")
+        if option_type not in OPTION_TYPES:
+            raise KeyError((timestamp, option_type))
+
+        chain_index = self.chain_index
+        if chain_index is not None:
+            second = chain_index.second_of(timestamp)
+            if not 0 <= second < chain_index.n_seconds:
+                raise KeyError((timestamp, option_type))
+            strikes = chain_index.strikes
+            deltas = chain_index.values['delta'][:, OPTION_TYPES.index(option_type), second]
+        else:
+            if self.delta is None:
+                self.build_delta()
+            second = self.second_of(timestamp)
+            if not 0 <= second < self.n_seconds:
+                raise KeyError((timestamp, option_type))
+            strikes = self.strikes
+            deltas = self.delta[OPTION_TYPES.index(option_type), second]
+
+        distance = np.abs(deltas - target_delta)
+        if np.isnan(distance).all():
+            raise KeyError((timestamp, option_type))
+        return strikes[int(np.nanargmin(distance))]
+
+    def resolve(self, timestamp, atm_strike, instrument):
+        """
+        Return the strike of an instrument specification.
+
+        Instruments give 'strike_part' (points from ATM), 'strike_steps' (places on the strike
+        ladder from ATM) or 'delta' (target delta of the instrument's option type).
+        """
+        if 'delta' in instrument:
+            return self.delta_strike(timestamp, instrument['option_type'], instrument['delta'])
+        if 'strike_steps' in instrument:
+            return self.offset_strike(timestamp, instrument['strike_steps'])
+        return atm_strike + instrument['strike_part']
+
+    def nbytes(self):
+        return self.atm.nbytes + self.atm_position.nbytes + (self.delta.nbytes if self.delta is not None else 0)
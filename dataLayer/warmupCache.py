@@ -0,0 +1,265 @@
+import os
+import json
+import shutil
+import hashlib
+from datetime import time
+import numpy as np
+import pandas as pd
+from executionLayer.sessionClock import SESSION_OPEN, SESSION_CLOSE
+
+# Trailing bars kept per session, as a multiple of the longest indicator window
+WARMUP_MULTIPLE = 4
+
+
+def warmup_bars(params, multiple=WARMUP_MULTIPLE):
+    """
+    Number of trailing bars needed to warm up every indicator of a parameter set.
+
+    Rolling indicators only need their longest window, but the exponential ones
+    (EMA, DEMA, TRIX, ...) chain several smoothings; `multiple` times the longest
+    window leaves their seed weight negligible.
+
+    Parameters:
+    - params (dict): Indicator parameters (see indicator_params).
+    - multiple (int): Bars kept per bar of the longest window.
+
+    Returns:
+    - n_bars (int): Number of trailing bars.
+    """
+    windows = [value for name, value in params.items() if name.endswith(('_window', '_period')) or name == 'window']
+    return int(multiple * max(windows)) + 1
+
+
+def session_bars(timeframe, session_open=SESSION_OPEN, session_close=SESSION_CLOSE):
+    """
+    Number of candles of timeframe in a full session, the close included.
+    """
+    span = pd.Timestamp.combine(pd.Timestamp(0).date(), session_close) - \
+           pd.Timestamp.combine(pd.Timestamp(0).date(), session_open)
+    return int(span // pd.to_timedelta(pd.tseries.frequencies.to_offset(timeframe))) + 1
+
+
+def prepend_warmup(ohlc_data, warmup):
+    """
+    Put the trailing bars of an earlier session in front of a session's candles.
+
+    Returns:
+    - ohlc_data (pd.DataFrame): Warmup bars followed by the session; unchanged when warmup is None or empty.
+    """
+    if warmup is None or warmup.empty:
+        return ohlc_data
+    warmup = warmup[warmup.index < ohlc_data.index[0]].reindex(columns=ohlc_data.columns)
+    return pd.concat([warmup, ohlc_data])
+
+
+class WarmupCache:
+    """
+    On-disk cache of the trailing OHLC bars of each session.
+
+    Indicators of a session are seeded by computing them over the previous
+    session's tail followed by the session itself, so the first bars of a day
+    are no longer NaN or warming up. Entries live under
+    ``{root}/{ticker}/{YYYY-MM-DD}/{key}/`` with one ``.npy`` file per column,
+    the same layout as GreeksCache; the key hashes the timeframe, the indicator
+    parameters and the number of bars kept. A tail is a few hundred rows, so a
+    date-sharded worker only reads a small entry for the day before its first
+    date instead of that day's ticks.
+
+    A tail holds bars of its own session only and is at most one session
+    long, so it is the same whether it was stored after the session was
+    processed or rebuilt from the session's ticks on a miss. With longer
+    timeframes (3T and up with the default parameters) a full session is
+    less than warmup_bars, and the slowest indicators start from fewer than
+    `multiple` windows of history.
+    """
+    def __init__(self, root, multiple=WARMUP_MULTIPLE, max_gap_days=7, calendar=None, session_open=SESSION_OPEN,
+                 session_close=SESSION_CLOSE):
+        """
+        Initialize the cache.
+
+        Parameters:
+        - root (str): Directory holding cache entries.
+        - multiple (int): Bars kept per bar of the longest indicator window (see warmup_bars).
+        - max_gap_days (int): Calendar days searched back for a previous session (weekends, holidays).
+        - calendar (iterable or None): Trading days; when given, the previous session is the latest of
+          them before the day being processed instead of the latest day with data.
+        - session_open, session_close (datetime.time): Session bounds, which limit the bars of a tail.
+        """
+        self.root = root
+        self.multiple = multiple
+        self.session_open = session_open
+        self.session_close = session_close
+        self.max_gap_days = max_gap_days
+        self.calendar = None if calendar is None else pd.DatetimeIndex(sorted(set(pd.DatetimeIndex(calendar).normalize())))
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def n_bars(self, params, timeframe):
+        """
+        Number of trailing bars kept: warmup_bars of params, at most one session of timeframe.
+        """
+        return min(warmup_bars(params, self.multiple), session_bars(timeframe, self.session_open, self.session_close))
+
+    def make_key(self, timeframe, params):
+        """
+        Build the key identifying a timeframe and indicator parameter set.
+
+        Parameters:
+        - timeframe (str): Candle timeframe (e.g. '1T').
+        - params (dict): Indicator parameters.
+
+        Returns:
+        - key (str): Hex digest.
+        """
+        payload = {'timeframe': timeframe, 'params': params, 'n_bars': self.n_bars(params, timeframe)}
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def entry_path(self, ticker, date, key):
+        return os.path.join(self.root, ticker, pd.Timestamp(date).strftime('%Y-%m-%d'), key)
+
+    def get(self, ticker, date, key):
+        """
+        Load the tail stored for one session.
+
+        Parameters:
+        - ticker (str): Ticker symbol.
+        - date (datetime): Trading day whose tail is wanted.
+        - key (str): Key from make_key.
+
+        Returns:
+        - tail (pd.DataFrame or None): Trailing OHLC bars, None on a miss.
+        """
+        path = self.entry_path(ticker, date, key)
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            index = pd.DatetimeIndex(np.load(os.path.join(path, 'index.npy')), name=meta['index_name'])
+            return pd.DataFrame({name: np.load(os.path.join(path, f"{name}.npy")) for name in meta['columns']},
+                                index=index)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def previous_session(self, date, has_session=None):
+        """
+        Resolve the trading session before date.
+
+        Parameters:
+        - date (datetime): Trading day being processed.
+        - has_session (callable or None): Returns whether a day has data (e.g. futures ticks); used when
+          there is no calendar, searching back up to max_gap_days.
+
+        Returns:
+        - session (Timestamp or None): Day of the previous session, None when none is found.
+        """
+        day = pd.Timestamp(date).normalize()
+        if self.calendar is not None:
+            position = self.calendar.searchsorted(day, side='left')
+            return self.calendar[position - 1] if position else None
+
+        for offset in range(1, self.max_gap_days + 1):
+            previous_day = day - pd.Timedelta(days=offset)
+            if has_session is not None and has_session(previous_day):
+                return previous_day
+        return None
+
+    def previous(self, ticker, date, key, has_session=None):
+        """
+        Load the tail of the session before date.
+
+        Only the tail of that exact session is read; a tail cached for an older
+        session is never used in its place.
+
+        Parameters:
+        - ticker (str): Ticker symbol.
+        - date (datetime): Trading day being processed.
+        - key (str): Key from make_key.
+        - has_session (callable or None): See previous_session.
+
+        Returns:
+        - Tuple: Day of the previous session (None when none is found) and its cached tail (None on a miss).
+        """
+        session = self.previous_session(date, has_session)
+        tail = None if session is None else self.get(ticker, session, key)
+        if tail is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return session, tail
+
+    def put(self, ticker, date, key, ohlc_data, n_bars):
+        """
+        Store the trailing bars of a session.
+
+        Parameters:
+        - ticker (str): Ticker symbol.
+        - date (datetime): Trading day of the session.
+        - key (str): Key from make_key.
+        - ohlc_data (pd.DataFrame): Candles of the session only, without earlier warmup bars.
+        - n_bars (int): Number of trailing bars to keep.
+        """
+        tail = ohlc_data.iloc[-n_bars:]
+        path = self.entry_path(ticker, date, key)
+        tmp_path = path + f".tmp{os.getpid()}"
+        os.makedirs(tmp_path, exist_ok=True)
+
+        np.save(os.path.join(tmp_path, 'index.npy'), tail.index.values.astype('datetime64[ns]'))
+        columns = [str(name) for name in tail.columns]
+        for name in columns:
+            np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(tail[name].values))
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump({'columns': columns, 'rows': len(tail), 'index_name': tail.index.name}, f)
+
+        # Re-running a day replaces its tail; another worker may be writing the same entry
+        shutil.rmtree(path, ignore_errors=True)
+        try:
+            os.replace(tmp_path, path)
+            self.writes += 1
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def invalidate(self, ticker=None, date=None):
+        """
+        Remove cached entries.
+
+        Parameters:
+        - ticker (str or None): Restrict to one ticker, None for all.
+        - date (datetime or None): Restrict to one day (requires ticker), None for all days.
+        """
+        if ticker is None:
+            target = self.root
+        elif date is None:
+            target = os.path.join(self.root, ticker)
+        else:
+            target = os.path.join(self.root, ticker, pd.Timestamp(date).strftime('%Y-%m-%d'))
+        shutil.rmtree(target, ignore_errors=True)
+
+    def stats(self):
+        """
+        Return hit/miss statistics of previous-session lookups for this cache instance.
+
+        Returns:
+        - stats (dict): hits, misses, hit_rate and writes.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'writes': self.writes
+        }
+
+
+def tail_start_time(timeframe, n_bars, close=SESSION_CLOSE):
+    """
+    Intraday time from which n_bars candles of timeframe reach the session close.
+
+    Used to read only the end of a session's ticks when a tail has to be rebuilt.
+    """
+    span = pd.to_timedelta(pd.tseries.frequencies.to_offset(timeframe)) * n_bars
+    start = pd.Timestamp.combine(pd.Timestamp(0).date(), close) - span
+    return time(0, 0) if start.normalize() < pd.Timestamp(0) else start.time()
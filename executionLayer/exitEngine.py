@@ -0,0 +1,277 @@
+import numpy as np
+from utils.utils import *
+
+class VectorizedExitEngine:
+    """
+    First-passage exit search over a ChainIndex.
+
+    Instead of stepping one second at a time, the engine builds the premium of
+    a position for every second from the check timestamp to the cutoff in one
+    pass and locates the first stop loss, target profit or data gap with array
+    comparisons. Per-leg quote seconds follow the same rules as
+    Position.get_current_leg_prices_from_index: each leg takes its first quote
+    within max_retries seconds of the running timestamp, which carries over
+    from one leg to the next, and the next check starts one second after the
+    latest leg quote. Exit timestamps, reasons and leg exit fields therefore
+    match the per-second loop in SpreadBacktester.check_exit_conditions.
+    """
+    def __init__(self, chain_index, greeks=None, clock=None, max_retries=10):
+        """
+        Initialize the exit engine.
+
+        Parameters:
+        - chain_index (ChainIndex): Dense per-day chain index.
+        - greeks (LazyGreeks or None): Lazy Greeks provider when the chain carries prices only.
+        - clock (SessionClock or None): Time axis of the day whose cutoff_second is the last second at which
+          exit conditions are checked, None for the chain index's clock.
+        - max_retries (int): Number of seconds searched for a quote per leg.
+        """
+        self.chain_index = chain_index
+        self.greeks = greeks
+        self.clock = chain_index.clock if clock is None else clock
+        self.max_retries = max_retries
+
+    def premium_path(self, position, start, stop):
+        """
+        Build the quote seconds and exit premium of a position for every check second in [start, stop].
+
+        Parameters:
+        - position (Position): Open position.
+        - start (int): First check second.
+        - stop (int): Last check second (inclusive).
+
+        Returns:
+        - dict: 'quote_seconds' (per leg arrays), 'exit_seconds' (latest leg quote per check second),
+          'failed' (no quote for some leg), 'failed_seconds' (running timestamp when the lookup failed)
+          and 'premium' (exit premium per check second).
+        """
+        chain_index = self.chain_index
+        checks = np.arange(start, stop + 1, dtype=np.int64)
+        # Quotes of later legs can be up to max_retries seconds past the previous leg
+        horizon = stop + self.max_retries * len(position.legs) + 1
+
+        running = checks.copy()
+        failed = np.zeros(len(checks), dtype=bool)
+        failed_seconds = checks.copy()
+        premium = np.zeros(len(checks))
+        quote_seconds = []
+
+        for leg in position.legs:
+            all_greeks_multiplier = get_all_other_greeks_multiplier(leg['action'])
+            contract = chain_index.contract(leg['strike_price'], leg['option_type'])
+            if contract is None:
+                quote = np.full(len(checks), horizon, dtype=np.int64)
+                found = np.zeros(len(checks), dtype=bool)
+            else:
+                pointers = chain_index.next_present(contract, start, horizon)
+                quote = pointers[running - start]
+                found = (quote - running) < self.max_retries
+
+            # Keep the running timestamp of the first failing leg
+            newly_failed = ~failed & ~found
+            failed_seconds[newly_failed] = running[newly_failed]
+            failed |= newly_failed
+
+            quote = np.where(failed, running, quote)
+            running = quote
+            quote_seconds.append(quote)
+
+            if contract is not None:
+                option_price = chain_index.values['option_price'][contract[0], contract[1], np.minimum(quote, chain_index.n_seconds - 1)]
+                premium = premium + (option_price * all_greeks_multiplier) * leg['lot_size']
+
+        return {
+            'quote_seconds': quote_seconds,
+            'exit_seconds': running,
+            'failed': failed,
+            'failed_seconds': failed_seconds,
+            'premium': premium
+        }
+
+    def visited_checks(self, path, start, stop):
+        """
+        Return the check seconds the per-second loop evaluates, in order.
+
+        After a check at second t the loop moves on to one second past the
+        latest leg quote, so seconds skipped over by a data gap are never
+        evaluated. Runs without gaps are taken whole and only the gaps are
+        walked one by one.
+
+        Returns:
+        - visited (np.ndarray): Offsets into the path arrays.
+        """
+        offsets = np.arange(stop - start + 1)
+        jumps = np.flatnonzero(path['failed'] | (path['exit_seconds'] != offsets + start))
+
+        runs = []
+        current = 0
+        last = stop - start
+        while current <= last:
+            k = np.searchsorted(jumps, current)
+            if k == len(jumps):
+                runs.append(offsets[current:])
+                break
+            jump = jumps[k]
+            runs.append(offsets[current:jump + 1])
+            if path['failed'][jump]:
+                break
+            current = path['exit_seconds'][jump] + 1 - start
+
+        return np.concatenate(runs) if runs else offsets[:0]
+
+    def apply_exit_quotes(self, position, path, offset):
+        """
+        Set the leg exit fields of a position from the quotes used at one check.
+        """
+        chain_index = self.chain_index
+        for leg, quote_seconds in zip(position.legs, path['quote_seconds']):
+            del_multiplier = get_delta_multiplier(leg['action'], leg['option_type'])
+            all_greeks_multiplier = get_all_other_greeks_multiplier(leg['action'])
+
+            second = int(quote_seconds[offset])
+            leg_timestamp = chain_index.datetime64_of(second)
+            quote = chain_index.quote(chain_index.contract(leg['strike_price'], leg['option_type']), second)
+            leg_greeks = self.greeks.lookup(leg['strike_price'], leg['option_type'], leg_timestamp) if self.greeks is not None else quote
+
+            leg['exit_price'] = quote['option_price'] * all_greeks_multiplier
+            leg['exit_delta'] = leg_greeks['delta'] * del_multiplier
+            leg['exit_theta'] = leg_greeks['theta'] * all_greeks_multiplier
+            leg['exit_gamma'] = leg_greeks['gamma'] * all_greeks_multiplier
+            leg['exit_iv'] = leg_greeks['iv'] * all_greeks_multiplier
+            leg['exit_time_of_leg'] = leg_timestamp
+
+        position.exit_premium = path['premium'][offset]
+
+    def find_exits(self, position, timestamp, stop_loss, target_profit):
+        """
+        Find the exits of one position for many stop loss / target profit levels at once.
+
+        The premium path is built once. Along the visited checks, the running
+        maximum and minimum of the absolute premium are monotone, so the first
+        check crossing each level is found with searchsorted.
+
+        Parameters:
+        - position (Position): Entered position (its own stop_loss and target_profit are ignored).
+        - timestamp (Timestamp): First timestamp at which exit conditions are checked.
+        - stop_loss (np.ndarray): Stop loss levels, one per combination.
+        - target_profit (np.ndarray): Target profit levels, one per combination.
+
+        Returns:
+        - dict or None: Arrays per combination: 'exit_seconds', 'reasons' ('SL_hit', 'TP_hit',
+          'time_breach' or 'no_data'), 'exit_premium' and 'exit_prices' (list with one array per leg);
+          None when there is no second to check.
+        """
+        chain_index = self.chain_index
+        start = chain_index.second_of(timestamp)
+        stop = self.clock.cutoff_second
+        if start > stop:
+            return None
+
+        path = self.premium_path(position, start, stop)
+        visited = self.visited_checks(path, start, stop)
+        n_checks = len(visited)
+        stop_loss = np.asarray(stop_loss, dtype=np.float64)
+        target_profit = np.asarray(target_profit, dtype=np.float64)
+
+        failed = np.flatnonzero(path['failed'][visited])
+        first_failed = failed[0] if failed.size else n_checks
+
+        value = np.abs(path['premium'][visited])
+        running_max = np.fmax.accumulate(np.where(np.isnan(value), -np.inf, value))
+        running_min = np.fmin.accumulate(np.where(np.isnan(value), np.inf, value))
+        if position.strategy_type == 'credit':
+            sl_first = np.searchsorted(running_max, stop_loss, side='left')
+            tp_first = np.searchsorted(-running_min, -target_profit, side='left')
+        elif position.strategy_type == 'debit':
+            sl_first = np.searchsorted(-running_min, -stop_loss, side='left')
+            tp_first = np.searchsorted(running_max, target_profit, side='left')
+        else:
+            sl_first = tp_first = np.full(len(stop_loss), n_checks)
+
+        # A data gap is detected before the premium is compared, and SL takes precedence over TP
+        first = np.minimum(np.minimum(sl_first, tp_first), first_failed)
+        reasons = np.where(first == n_checks, 'time_breach',
+                           np.where(first == first_failed, 'no_data', np.where(first == sl_first, 'SL_hit', 'TP_hit')))
+        offsets = visited[np.minimum(first, n_checks - 1)]
+
+        exit_seconds = path['exit_seconds'][offsets] + (first == n_checks)
+        exit_seconds = np.where(reasons == 'no_data', path['failed_seconds'][offsets], exit_seconds)
+
+        exit_prices = []
+        for leg, quote_seconds in zip(position.legs, path['quote_seconds']):
+            contract = chain_index.contract(leg['strike_price'], leg['option_type'])
+            seconds = np.minimum(quote_seconds[offsets], chain_index.n_seconds - 1)
+            exit_prices.append(chain_index.values['option_price'][contract[0], contract[1], seconds] *
+                               get_all_other_greeks_multiplier(leg['action']))
+
+        return {
+            'exit_seconds': exit_seconds,
+            'reasons': reasons,
+            'exit_premium': path['premium'][offsets],
+            'exit_prices': exit_prices
+        }
+
+    def find_exit(self, position, timestamp):
+        """
+        Find the exit of a position checked from timestamp onwards.
+
+        Parameters:
+        - position (Position): Open position.
+        - timestamp (Timestamp): First timestamp at which exit conditions are checked.
+
+        Returns:
+        - Tuple: Exit timestamp and reason ('SL_hit', 'TP_hit', 'time_breach', or 'no_data' when a
+          leg has no quote within max_retries seconds and the position cannot be valued).
+        """
+        start = self.chain_index.second_of(timestamp)
+        stop = self.clock.cutoff_second
+        if start > stop:
+            return timestamp, 'time_breach'
+        exit_second, reason = self.find_exit_at(position, start, stop)
+        return self.chain_index.timestamp_of(exit_second), reason
+
+    def find_exit_at(self, position, start, stop):
+        """
+        Integer-second version of find_exit.
+
+        Parameters:
+        - position (Position): Open position.
+        - start (int): First second at which exit conditions are checked.
+        - stop (int): Last second at which exit conditions are checked (the cutoff).
+
+        Returns:
+        - Tuple: Exit second and reason (see find_exit).
+        """
+        if start > stop:
+            return start, 'time_breach'
+
+        path = self.premium_path(position, start, stop)
+        visited = self.visited_checks(path, start, stop)
+
+        failed = path['failed'][visited]
+        value = np.abs(path['premium'][visited])
+        if position.strategy_type == 'credit':
+            sl_hit = value >= position.stop_loss
+            tp_hit = value <= position.target_profit
+        elif position.strategy_type == 'debit':
+            sl_hit = value <= position.stop_loss
+            tp_hit = value >= position.target_profit
+        else:
+            sl_hit = tp_hit = np.zeros(len(visited), dtype=bool)
+
+        # A data gap is detected before the premium is compared, and SL takes precedence over TP
+        hits = failed | sl_hit | tp_hit
+        if hits.any():
+            first = int(np.argmax(hits))
+            offset = visited[first]
+            if failed[first]:
+                return int(path['failed_seconds'][offset]), 'no_data'
+
+            self.apply_exit_quotes(position, path, offset)
+            reason = 'SL_hit' if sl_hit[first] else 'TP_hit'
+            return int(path['exit_seconds'][offset]), reason
+
+        # Time breach one second after the last check
+        offset = visited[-1]
+        self.apply_exit_quotes(position, path, offset)
+        return int(path['exit_seconds'][offset]) + 1, 'time_breach'
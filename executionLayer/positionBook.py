@@ -0,0 +1,205 @@
+import numpy as np
+from utils.utils import *
+
+# Per-leg columns held by the book; Greeks are signed like the leg dictionaries
+BOOK_LEG_COLUMNS = ['strike_position', 'type_position', 'lots', 'sign', 'delta_sign', 'entry_price',
+                    'current_price', 'last_quote', 'delta', 'gamma', 'theta', 'iv']
+
+
+class PositionBook:
+    """
+    Struct-of-arrays book of the legs of all open positions.
+
+    Each leg is one row across NumPy columns (contract coordinates in a
+    ChainIndex, lots, action sign, entry and current price, last quote second
+    and signed Greeks) plus the row of its position in the per-position
+    columns. Marking to market, SL/TP checks and portfolio Greeks are computed
+    for all open positions at once.
+    """
+    def __init__(self, chain_index, greeks=None, max_retries=10):
+        """
+        Initialize an empty book.
+
+        Parameters:
+        - chain_index (ChainIndex): Dense per-day chain index used for marking.
+        - greeks (LazyGreeks or None): Lazy Greeks provider when the chain carries prices only.
+        - max_retries (int): Seconds a leg may go without a quote before its position is dropped.
+        """
+        self.chain_index = chain_index
+        self.greeks = greeks
+        self.max_retries = max_retries
+        self.track_greeks = all(field in chain_index.fields for field in ('delta', 'gamma', 'theta', 'iv'))
+
+        self.legs = {column: np.zeros(0) for column in BOOK_LEG_COLUMNS}
+        for column in ('strike_position', 'type_position', 'last_quote'):
+            self.legs[column] = np.zeros(0, dtype=np.int64)
+        self.leg_position = np.zeros(0, dtype=np.int64)
+
+        self.positions = []
+        self.entry_premium = np.zeros(0)
+        self.stop_loss = np.zeros(0)
+        self.target_profit = np.zeros(0)
+        self.is_credit = np.zeros(0, dtype=bool)
+        self.margin = np.zeros(0)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def margin_in_use(self):
+        return float(np.abs(self.margin).sum())
+
+    def add(self, position):
+        """
+        Add the legs of a newly entered position.
+
+        Parameters:
+        - position (Position): Position built from ChainIndex legs.
+        """
+        chain_index = self.chain_index
+        rows = {column: [] for column in BOOK_LEG_COLUMNS}
+        for leg in position.legs:
+            strike_position, type_position = chain_index.contract(leg['strike_price'], leg['option_type'])
+            sign = get_all_other_greeks_multiplier(leg['action'])
+            rows['strike_position'].append(strike_position)
+            rows['type_position'].append(type_position)
+            rows['lots'].append(leg['lot_size'])
+            rows['sign'].append(sign)
+            rows['delta_sign'].append(get_delta_multiplier(leg['action'], leg['option_type']))
+            rows['entry_price'].append(leg['entry_price'])
+            rows['current_price'].append(leg['entry_price'] * sign)
+            rows['last_quote'].append(chain_index.second_of(leg['entry_time_of_leg']))
+            rows['delta'].append(leg['entry_delta'])
+            rows['gamma'].append(leg['entry_gamma'])
+            rows['theta'].append(leg['entry_theta'])
+            rows['iv'].append(leg['entry_iv'])
+
+        for column in BOOK_LEG_COLUMNS:
+            self.legs[column] = np.concatenate([self.legs[column], np.asarray(rows[column], dtype=self.legs[column].dtype)])
+        self.leg_position = np.concatenate([self.leg_position, np.full(len(position.legs), len(self.positions))])
+
+        self.positions.append(position)
+        self.entry_premium = np.append(self.entry_premium, position.entry_premium)
+        self.stop_loss = np.append(self.stop_loss, position.stop_loss)
+        self.target_profit = np.append(self.target_profit, position.target_profit)
+        self.is_credit = np.append(self.is_credit, position.strategy_type == 'credit')
+        self.margin = np.append(self.margin, position.margin_used)
+
+    def remove(self, rows):
+        """
+        Remove positions (and their legs) by row.
+
+        Parameters:
+        - rows (np.ndarray): Position rows to drop.
+        """
+        keep = np.ones(len(self.positions), dtype=bool)
+        keep[rows] = False
+        keep_legs = keep[self.leg_position]
+        renumber = np.cumsum(keep) - 1
+
+        for column in BOOK_LEG_COLUMNS:
+            self.legs[column] = self.legs[column][keep_legs]
+        self.leg_position = renumber[self.leg_position[keep_legs]]
+
+        self.positions = [position for position, kept in zip(self.positions, keep) if kept]
+        self.entry_premium = self.entry_premium[keep]
+        self.stop_loss = self.stop_loss[keep]
+        self.target_profit = self.target_profit[keep]
+        self.is_credit = self.is_credit[keep]
+        self.margin = self.margin[keep]
+
+    def mark_to_market(self, second):
+        """
+        Update current prices (and Greeks when the chain carries them) of all legs quoted at a second.
+
+        Legs without a quote keep their last price.
+
+        Parameters:
+        - second (int): Second of the session.
+        """
+        chain_index = self.chain_index
+        if not len(self.leg_position) or second >= chain_index.n_seconds:
+            return
+
+        legs = self.legs
+        seconds = second
+        present = chain_index.present[legs['strike_position'], legs['type_position'], seconds]
+        if not present.any():
+            return
+
+        prices = chain_index.lookup('option_price', seconds, legs['strike_position'], legs['type_position'])
+        legs['current_price'] = np.where(present, prices, legs['current_price'])
+        legs['last_quote'] = np.where(present, second, legs['last_quote'])
+
+        if self.track_greeks:
+            for field in ('gamma', 'theta', 'iv'):
+                values = chain_index.lookup(field, seconds, legs['strike_position'], legs['type_position'])
+                legs[field] = np.where(present, values * legs['sign'], legs[field])
+            values = chain_index.lookup('delta', seconds, legs['strike_position'], legs['type_position'])
+            legs['delta'] = np.where(present, values * legs['delta_sign'], legs['delta'])
+
+    def premiums(self):
+        """
+        Exit premium of every open position at the current marks.
+        """
+        legs = self.legs
+        return np.bincount(self.leg_position, weights=(legs['current_price'] * legs['sign']) * legs['lots'],
+                           minlength=len(self.positions))
+
+    def check_exits(self, second):
+        """
+        Evaluate SL/TP and stale data for all open positions.
+
+        Parameters:
+        - second (int): Second of the session being checked.
+
+        Returns:
+        - Tuple: Boolean arrays per position (stale, sl_hit, tp_hit) and the exit premiums.
+        """
+        premiums = self.premiums()
+        value = np.abs(premiums)
+        sl_hit = np.where(self.is_credit, value >= self.stop_loss, value <= self.stop_loss)
+        tp_hit = np.where(self.is_credit, value <= self.target_profit, value >= self.target_profit) & ~sl_hit
+
+        stale_legs = (second - self.legs['last_quote']) >= self.max_retries
+        stale = np.bincount(self.leg_position, weights=stale_legs, minlength=len(self.positions)) > 0
+        return stale, sl_hit & ~stale, tp_hit & ~stale, premiums
+
+    def aggregate_greeks(self):
+        """
+        Lot-weighted portfolio Greeks over all open legs.
+
+        Returns:
+        - dict: 'port_delta', 'port_gamma', 'port_theta' and 'port_iv'.
+        """
+        names = ('delta', 'gamma', 'theta', 'iv')
+        totals = np.nansum(np.vstack([self.legs[name] for name in names]) * self.legs['lots'], axis=1)
+        return {f'port_{name}': float(total) for name, total in zip(names, totals)}
+
+    def write_exit_fields(self, row, premium):
+        """
+        Copy the current marks of a position into its leg dictionaries.
+
+        Parameters:
+        - row (int): Position row.
+        - premium (float): Exit premium of the position.
+        """
+        chain_index = self.chain_index
+        position = self.positions[row]
+        legs = self.legs
+        for leg, book_row in zip(position.legs, np.flatnonzero(self.leg_position == row)):
+            sign = legs['sign'][book_row]
+            leg_timestamp = chain_index.timestamp_of(legs['last_quote'][book_row])
+            leg['exit_price'] = legs['current_price'][book_row] * sign
+            if self.greeks is not None:
+                leg_greeks = self.greeks.lookup(leg['strike_price'], leg['option_type'], leg_timestamp)
+                leg['exit_delta'] = leg_greeks['delta'] * legs['delta_sign'][book_row]
+                leg['exit_theta'] = leg_greeks['theta'] * sign
+                leg['exit_gamma'] = leg_greeks['gamma'] * sign
+                leg['exit_iv'] = leg_greeks['iv'] * sign
+            else:
+                leg['exit_delta'] = legs['delta'][book_row]
+                leg['exit_theta'] = legs['theta'][book_row]
+                leg['exit_gamma'] = legs['gamma'][book_row]
+                leg['exit_iv'] = legs['iv'][book_row]
+            leg['exit_time_of_leg'] = leg_timestamp
+        position.exit_premium = premium
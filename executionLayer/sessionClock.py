@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+from datetime import time
+
+# Default session bounds: market open, market close and the last time exits are checked / entries taken
+SESSION_OPEN = time(9, 15)
+SESSION_CLOSE = time(15, 30)
+ENTRY_CUTOFF = time(15, 15)
+
+
+class SessionClock:
+    """
+    Integer time axis of one trading day.
+
+    Times are int64 seconds since the origin, which is session open unless the
+    data starts earlier (the convention of ChainIndex, so its seconds and the
+    clock's are interchangeable). Session open, close and the cutoff are
+    integer bounds on that axis; the execution loops step, retry and compare
+    on plain integers and timestamps are rebuilt only when trades are recorded.
+    """
+    def __init__(self, origin, session_open=SESSION_OPEN, session_close=SESSION_CLOSE, cutoff=ENTRY_CUTOFF):
+        """
+        Initialize the clock.
+
+        Parameters:
+        - origin (Timestamp): Timestamp of second 0.
+        - session_open (datetime.time): Session open.
+        - session_close (datetime.time): Session close.
+        - cutoff (datetime.time): Last time at which exit conditions are checked; no entries at or after it.
+
+        Raises:
+        - ValueError: If the bounds are not in the order open <= cutoff <= close.
+        """
+        if not session_open <= cutoff <= session_close:
+            raise ValueError(f"Session bounds out of order: open {session_open}, cutoff {cutoff}, close {session_close}")
+        self.origin = pd.Timestamp(origin)
+        self.origin_ns = self.origin.value
+        self.open_second = self.second_at(session_open)
+        self.close_second = self.second_at(session_close)
+        self.cutoff_second = self.second_at(cutoff)
+
+    @staticmethod
+    def _offset(bound):
+        return pd.Timedelta(hours=bound.hour, minutes=bound.minute, seconds=bound.second)
+
+    def second_at(self, bound):
+        """
+        Return the second of the session at a time of day (datetime.time) of the clock's day.
+        """
+        return self.second_of(self.origin.normalize() + self._offset(bound))
+
+    @classmethod
+    def for_index(cls, index, session_open=SESSION_OPEN, session_close=SESSION_CLOSE, cutoff=ENTRY_CUTOFF):
+        """
+        Build the clock of the day of a timestamp index, with the origin ChainIndex would use.
+        """
+        index = pd.DatetimeIndex(index)
+        origin = index[0].normalize() + cls._offset(session_open)
+        return cls(min(origin, index.min().floor('s')), session_open, session_close, cutoff)
+
+    def second_of(self, timestamp):
+        """
+        Convert a timestamp into an integer second of the session.
+        """
+        return int((pd.Timestamp(timestamp).value - self.origin_ns) // 1_000_000_000)
+
+    def seconds_of(self, index):
+        """
+        Convert a timestamp index into an int64 array of seconds of the session.
+        """
+        return (pd.DatetimeIndex(index).asi8 - self.origin_ns) // 1_000_000_000
+
+    def timestamp_of(self, second):
+        """
+        Convert an integer second of the session back into a timestamp.
+        """
+        return pd.Timestamp(self.origin_ns + int(second) * 1_000_000_000, tz=self.origin.tz)
+
+    def datetime64_of(self, second):
+        """
+        Convert an integer second of the session into a datetime64 without building a Timestamp.
+        """
+        return np.datetime64(self.origin_ns + int(second) * 1_000_000_000, 'ns')
@@ -1,12 +1,17 @@
+import numpy as np
 import pandas as pd
-from datetime import time
+from datetime import time, timedelta
 from strategyLayer.positionClass import *
 from strategyLayer.createLegs import *
 from strategyLayer.strategyClass import *
 from strategyLayer.dynamicInstruments import *
+from strategyLayer.legRecords import *
+from executionLayer.exitEngine import *
+from executionLayer.positionBook import *
+from executionLayer.sessionClock import *
 
 class SpreadBacktester:
-    def __init__(self, options_data, signals, stop_loss, target_profit, instruments_with_actions, sl_percentage_based, tp_percentage_based, strategy_type):
+    def __init__(self, options_data, signals, stop_loss, target_profit, instruments_with_actions, sl_percentage_based, tp_percentage_based, strategy_type, greeks=None, chain_index=None, exit_engine=None, max_positions=1, margin_cap=None, strike_table=None, series_cache=None, clock=None):
         """
         Initialize the SpreadBacktester with necessary parameters.
 
@@ -19,6 +24,17 @@ class SpreadBacktester:
         - sl_percentage_based (bool): Whether stop loss is percentage-based.
         - tp_percentage_based (bool): Whether target profit is percentage-based.
         - strategy_type (str): Type of strategy ('directional' or other).
+        - greeks (LazyGreeks or None): Lazy Greeks provider when options_data carries prices only.
+        - chain_index (ChainIndex or None): Dense chain index used for leg entry and exit lookups.
+        - exit_engine (VectorizedExitEngine or None): Engine that finds exits in one pass, None for the per-second loop.
+        - max_positions (int): Maximum number of concurrently open positions in execute_portfolio.
+        - margin_cap (float or None): Maximum absolute margin of open positions in execute_portfolio, None for no cap.
+        - strike_table (StrikeTable or None): Precomputed per-second ATM strikes, None to search options_data at each entry.
+        - series_cache (ContractSeriesCache or None): Per-contract series of the day used for leg entry and exit
+          lookups when there is no chain_index, None to filter and merge options_data at each entry.
+        - clock (SessionClock or None): Integer time axis of the day with the session bounds and cutoff, shared
+          with chain_index, strike_table, series_cache and exit_engine; None for the chain_index's clock, or
+          SessionClock.for_index of options_data without one.
         """
         self.options_data = options_data
         self.signals = signals
@@ -34,6 +50,20 @@ class SpreadBacktester:
         self.sl_percentage_based = sl_percentage_based
         self.tp_percentage_based = tp_percentage_based
         self.strategy_type = strategy_type
+        self.greeks = greeks
+        self.chain_index = chain_index
+        self.exit_engine = exit_engine
+        self.max_positions = max_positions
+        self.margin_cap = margin_cap
+        self.strike_table = strike_table
+        self.series_cache = series_cache
+        self.leg_buffer = LegBuffer()
+        if clock is None:
+            clock = chain_index.clock if chain_index is not None else SessionClock.for_index(options_data.index)
+        self.clock = clock
+        self.signal_seconds = clock.seconds_of(self.signals.index)
+        self.rejected_entries = 0
+        self.realized_pnl = 0
         self.positions = []
         self.trades = []
         self.positions_not_counted = 0
@@ -53,48 +83,212 @@ class SpreadBacktester:
         Returns:
         - Timestamp: Timestamp of the first signal to process.
         """
+        signals = self.signals
         if self.strategy_type == 'directional':
-            self.signals['new_entry_signal'] = self.signals.apply(lambda x: 'long' if x['long_signal_entry'] else 'short' if x['short_signal_entry'] else 'nothing', axis=1)
-            self.signals['new_exit_signal'] = self.signals.apply(lambda x: 'long' if x['long_signal_exit'] else 'short' if x['short_signal_exit'] else 'nothing', axis=1)
+            long_entry, short_entry = signals['long_signal_entry'].values.astype(bool), signals['short_signal_entry'].values.astype(bool)
+            long_exit, short_exit = signals['long_signal_exit'].values.astype(bool), signals['short_signal_exit'].values.astype(bool)
+            signals['new_entry_signal'] = np.where(long_entry, 'long', np.where(short_entry, 'short', 'nothing')).astype(object)
+            signals['new_exit_signal'] = np.where(long_exit, 'long', np.where(short_exit, 'short', 'nothing')).astype(object)
         else:
-            self.signals['new_entry_signal'] = self.signals.apply(lambda x: True if (x['long_signal_entry'] or x['short_signal_entry'] or x['entry_signal']) else False, axis=1)
-            self.signals['new_exit_signal'] = self.signals.apply(lambda x: True if (x['long_signal_exit'] or x['short_signal_exit'] or x['exit_signal']) else False, axis=1)
+            signals['new_entry_signal'] = signals[['long_signal_entry', 'short_signal_entry', 'entry_signal']].values.astype(bool).any(axis=1)
+            signals['new_exit_signal'] = signals[['long_signal_exit', 'short_signal_exit', 'exit_signal']].values.astype(bool).any(axis=1)
         
         return self.signals.index[0]
 
+    def schedule_entries(self, cutoff_second=None):
+        """
+        Precompute the integer positions the trade scheduler jumps between.
+
+        Args:
+        - cutoff_second (int or None): Second of the session at and after which no new entries are taken,
+          None for the clock's cutoff.
+
+        Returns:
+        - Tuple: Positions of 'long'/'short' entry signals and positions of rows at or after the cutoff.
+        """
+        cutoff_second = self.clock.cutoff_second if cutoff_second is None else cutoff_second
+        entry_rows = np.flatnonzero(self.signals['new_entry_signal'].isin(['long', 'short']).values)
+        cutoff_rows = np.flatnonzero(self.signal_seconds >= cutoff_second)
+        return entry_rows, cutoff_rows
+
     def execute_trades(self, timestamp):
         """
         Execute trades based on generated signals.
 
+        Entry signal and cutoff positions are computed once; after every entry
+        attempt or exit the scheduler jumps to the next entry signal at or after
+        the resume second with searchsorted instead of rescanning the signals.
+        The walk runs on the clock's integer seconds.
+
         Args:
         - timestamp (Timestamp): Starting timestamp for executing trades.
 
         Returns:
         - Tuple: List of executed trades and count of uncounted positions.
         """
+        index = self.signals.index
+        signal_seconds = self.signal_seconds
+        entry_rows, cutoff_rows = self.schedule_entries()
+        second = self.clock.second_of(timestamp)
+
+        # Entries are taken on signal rows before the first cutoff row; a signal on the cutoff row itself is not entered
+        if len(cutoff_rows):
+            entry_rows = entry_rows[entry_rows < cutoff_rows[0]]
+
         while True:
-            signals_subset = self.signals[['new_entry_signal', 'new_exit_signal']][timestamp:]
-            if signals_subset.empty:
-                break
-            
-            for idx, (index, row) in enumerate(signals_subset.iterrows()):
-                if index.time() >= time(15, 15):
-                    return self.trades, self.positions_not_counted
-                
-                if row['new_entry_signal'] == 'long' or row['new_entry_signal'] == 'short':
-                    bool_var, upd_timestamp = self.enter_spread(index)
-                    
-                    if not bool_var:
-                        timestamp = upd_timestamp + timedelta(seconds=1)
-                        break
-                    
-                    timestamp = self.manage_positions(upd_timestamp + timedelta(seconds=1))
-                    break
-            else:
+            row = np.searchsorted(signal_seconds, second, side='left')
+            next_entry = np.searchsorted(entry_rows, row)
+            if next_entry == len(entry_rows):
                 break
+
+            entry_row = entry_rows[next_entry]
+            bool_var, _ = self.enter_spread(index[entry_row])
+            if not bool_var:
+                second = signal_seconds[entry_row] + 1
+                continue
+
+            second = self.manage_positions(signal_seconds[entry_row] + 1)
         
         return self.trades, self.positions_not_counted
 
+    def sweep(self, stop_loss, target_profit, sl_percentage_based=None, tp_percentage_based=None, timestamp=None):
+        """
+        Backtest many stop loss / target profit combinations against the same entries.
+
+        Every entry signal is entered once and its premium path is built once;
+        the exits of all combinations are found on that path together
+        (VectorizedExitEngine.find_exits). Each combination then walks its own
+        sequence of entries and exits with the same scheduling rules as
+        execute_trades, all combinations advancing in lockstep. Requires
+        classifying_signals to have run and a chain_index.
+
+        Args:
+        - stop_loss (array-like): Stop loss per combination.
+        - target_profit (array-like): Target profit per combination.
+        - sl_percentage_based (array-like or None): Per combination flag, None for the backtester setting.
+        - tp_percentage_based (array-like or None): Per combination flag, None for the backtester setting.
+        - timestamp (Timestamp or None): Starting timestamp, None for the first signal.
+
+        Returns:
+        - Tuple: Trades of all combinations as one DataFrame with a 'combo_id' column (without the
+          per-leg details), and a DataFrame of the combinations with their uncounted positions.
+        """
+        if self.chain_index is None:
+            raise ValueError("sweep requires a chain_index")
+
+        sl_percentage_based = self.sl_percentage_based if sl_percentage_based is None else sl_percentage_based
+        tp_percentage_based = self.tp_percentage_based if tp_percentage_based is None else tp_percentage_based
+        stop_loss, target_profit, sl_percentage_based, tp_percentage_based = (np.ravel(array) for array in np.broadcast_arrays(
+            np.asarray(stop_loss, dtype=np.float64), np.asarray(target_profit, dtype=np.float64),
+            np.asarray(sl_percentage_based, dtype=bool), np.asarray(tp_percentage_based, dtype=bool)))
+        n_combos = len(stop_loss)
+
+        exit_engine = self.exit_engine if self.exit_engine is not None else VectorizedExitEngine(self.chain_index, self.greeks, self.clock)
+        index = self.signals.index
+        timestamp = index[0] if timestamp is None else timestamp
+        entry_rows, cutoff_rows = self.schedule_entries()
+
+        # Entries are taken on signal rows before the first cutoff row
+        if len(cutoff_rows):
+            entry_rows = entry_rows[entry_rows < cutoff_rows[0]]
+        entry_ns = pd.DatetimeIndex(index[entry_rows]).asi8
+        n_entries = len(entry_rows)
+
+        # Enter every signal once and find its exit for every combination
+        entered = np.zeros(n_entries, dtype=bool)
+        entries = []
+        exit_seconds = np.zeros((n_entries, n_combos), dtype=np.int64)
+        reasons = np.empty((n_entries, n_combos), dtype=object)
+        exit_premium = np.zeros((n_entries, n_combos))
+        transaction_cost = np.zeros((n_entries, n_combos))
+
+        for k, row in enumerate(entry_rows):
+            entry_timestamp = index[row]
+            bool_var, _ = self.enter_spread(entry_timestamp)
+            if not bool_var:
+                entries.append(None)
+                continue
+            position = self.positions.pop()
+
+            entry_premium = position.entry_premium
+            magnitude = abs(entry_premium)
+            if entry_premium < 0:
+                combo_sl = np.where(sl_percentage_based, magnitude * stop_loss, magnitude + stop_loss)
+                combo_tp = np.where(tp_percentage_based, magnitude * target_profit, magnitude - target_profit)
+            else:
+                combo_sl = np.where(sl_percentage_based, magnitude * (1 - (stop_loss - 1)), magnitude - stop_loss)
+                combo_tp = np.where(tp_percentage_based, magnitude * (1 + (1 - target_profit)), magnitude + target_profit)
+
+            exits = exit_engine.find_exits(position, entry_timestamp + timedelta(seconds=1), combo_sl, combo_tp)
+            if exits is None:
+                entries.append(None)
+                continue
+
+            entered[k] = True
+            entries.append(position)
+            exit_seconds[k] = exits['exit_seconds']
+            reasons[k] = exits['reasons']
+            exit_premium[k] = exits['exit_premium']
+            cost = 0
+            for leg, leg_exit_price in zip(position.legs, exits['exit_prices']):
+                cost = cost + (np.abs(leg['entry_price'] + leg_exit_price) * leg['lot_size']) * 0.001
+            transaction_cost[k] = cost
+
+        # Next successfully entered signal at or after each position
+        next_entered = np.full(n_entries + 1, n_entries)
+        for k in range(n_entries - 1, -1, -1):
+            next_entered[k] = k if entered[k] else next_entered[k + 1]
+
+        origin_ns = self.clock.origin_ns
+        current = np.full(n_combos, next_entered[np.searchsorted(entry_ns, pd.Timestamp(timestamp).value, side='left')])
+        positions_not_counted = np.zeros(n_combos, dtype=np.int64)
+        records = []
+
+        while True:
+            combos = np.flatnonzero(current < n_entries)
+            if not combos.size:
+                break
+            k = current[combos]
+            records.append((combos, k))
+            resume_ns = origin_ns + exit_seconds[k, combos] * 1_000_000_000
+            current[combos] = next_entered[np.searchsorted(entry_ns, resume_ns, side='left')]
+
+        trades = []
+        for combos, k in records:
+            counted = reasons[k, combos] != 'no_data'
+            np.add.at(positions_not_counted, combos[~counted], 1)
+            combos, k = combos[counted], k[counted]
+            if not combos.size:
+                continue
+            entry_premium = np.array([entries[entry].entry_premium for entry in k])
+            trades.append(pd.DataFrame({
+                'combo_id': combos,
+                'entry_timestamp': index[entry_rows[k]],
+                'exit_timestamp': pd.to_datetime(origin_ns + exit_seconds[k, combos] * 1_000_000_000),
+                'margin_used': [entries[entry].margin_used for entry in k],
+                'entry_premium': entry_premium,
+                'exit_premium': exit_premium[k, combos],
+                'strategy_type': [entries[entry].strategy_type for entry in k],
+                'exit_reason': reasons[k, combos],
+                'pnl': exit_premium[k, combos] - entry_premium,
+                'transaction_cost': transaction_cost[k, combos]
+            }))
+
+        columns = ['combo_id', 'entry_timestamp', 'exit_timestamp', 'margin_used', 'entry_premium', 'exit_premium',
+                   'strategy_type', 'exit_reason', 'pnl', 'transaction_cost']
+        trades = pd.concat(trades, ignore_index=True) if trades else pd.DataFrame(columns=columns)
+        trades = trades.sort_values(['combo_id', 'entry_timestamp'], kind='stable').reset_index(drop=True)
+
+        combinations = pd.DataFrame({
+            'stop_loss': stop_loss,
+            'target_profit': target_profit,
+            'sl_percentage_based': sl_percentage_based,
+            'tp_percentage_based': tp_percentage_based,
+            'positions_not_counted': positions_not_counted
+        })
+        combinations.index.name = 'combo_id'
+        return trades, combinations
+
     def enter_spread(self, timestamp):
         """
         Enter into a spread position based on the current trading signals.
@@ -118,12 +312,16 @@ class SpreadBacktester:
                 instruments = self.instruments_with_actions[self.strategy_type]
             
             # Find ATM strike price
-            min_diff = self.options_data.loc[timestamp]['Difference'].min()
-            atm_strike = self.options_data.loc[timestamp][self.options_data.loc[timestamp]['Difference'] == min_diff]['strike_price'].iloc[0]
+            if self.strike_table is not None:
+                atm_strike = self.strike_table.atm_strike(timestamp)
+            else:
+                min_diff = self.options_data.loc[timestamp]['Difference'].min()
+                atm_strike = self.options_data.loc[timestamp][self.options_data.loc[timestamp]['Difference'] == min_diff]['strike_price'].iloc[0]
             
             # Generate legs for the spread strategy
             strategy = DynamicLegStrategy()
-            legs, self.filtered_options_data = strategy.get_legs(self.options_data, timestamp, atm_strike, instruments)
+            legs, self.filtered_options_data = strategy.get_legs(self.options_data, timestamp, atm_strike, instruments, self.greeks,
+                                                                 self.chain_index, self.strike_table, self.series_cache)
             
             # Calculate entry premium and margin used
             entry_premium = sum((leg['entry_price'] * leg['lot_size']) for leg in legs)
@@ -158,41 +356,61 @@ class SpreadBacktester:
         except KeyError as e:
             return False, timestamp
 
-    def manage_positions(self, timestamp):
+    def manage_positions(self, second):
         """
         Manage open positions by checking exit conditions.
 
         Args:
-        - timestamp (Timestamp): Timestamp for managing positions.
+        - second (int): Second of the session for managing positions.
 
         Returns:
-        - Timestamp: Updated timestamp after managing positions.
+        - int: Updated second after managing positions.
         """
         if self.positions:
             position = self.positions[0]
             if position.exit_timestamp is None:
-                exit_timestamp = self.check_exit_conditions(position, timestamp)
-                return exit_timestamp 
-        return timestamp
+                exit_second = self.check_exit_conditions(position, second)
+                return exit_second 
+        return second
 
-    def check_exit_conditions(self, position, timestamp):
+    def check_exit_conditions(self, position, second):
         """
         Check exit conditions for a given position.
 
+        Steps, retries and the cutoff comparison are integer operations on the
+        clock's seconds; the exit is converted to a timestamp when the trade is
+        recorded.
+
         Args:
         - position (Position): Position object to check exit conditions for.
-        - timestamp (Timestamp): Timestamp for checking exit conditions.
+        - second (int): Second of the session from which exit conditions are checked.
 
         Returns:
-        - Timestamp: Timestamp of exit or maximum exit timestamp.
+        - int: Second of exit or maximum exit second.
         """
-        max_exit_timestamp = timestamp
-        while max_exit_timestamp.time() <= time(15, 15):
-            max_exit_timestamp, close_position = position.get_current_leg_prices(self.filtered_options_data, max_exit_timestamp)
+        clock = self.clock
+        if self.exit_engine is not None:
+            exit_second, reason = self.exit_engine.find_exit_at(position, second, clock.cutoff_second)
+            if reason == 'no_data':
+                self.positions_not_counted += 1
+                self.positions.remove(position)
+            else:
+                self.close_position(position, clock.timestamp_of(exit_second), reason)
+            return exit_second
+
+        max_exit_second = second
+        while max_exit_second <= clock.cutoff_second:
+            if self.chain_index is not None:
+                max_exit_second, close_position = position.get_current_leg_prices_from_index(self.chain_index, max_exit_second, self.greeks)
+            elif self.series_cache is not None:
+                max_exit_second, close_position = position.get_current_leg_prices_from_series(self.filtered_options_data, max_exit_second, self.greeks)
+            else:
+                max_exit_timestamp, close_position = position.get_current_leg_prices(self.filtered_options_data, clock.timestamp_of(max_exit_second), self.greeks)
+                max_exit_second = clock.second_of(max_exit_timestamp)
             if close_position:
                 self.positions_not_counted += 1
                 self.positions.remove(position)
-                return max_exit_timestamp
+                return max_exit_second
             
             exit_premium = sum((leg['exit_price'] * leg['lot_size']) for leg in position.legs)
             position.exit_premium = exit_premium
@@ -200,27 +418,27 @@ class SpreadBacktester:
             # Check exit conditions based on strategy type
             if position.strategy_type == 'credit':
                 if (abs(position.exit_premium) >= position.stop_loss):
-                    self.close_position(position, max_exit_timestamp, 'SL_hit')
-                    return max_exit_timestamp
+                    self.close_position(position, clock.timestamp_of(max_exit_second), 'SL_hit')
+                    return max_exit_second
 
                 elif (abs(position.exit_premium) <= position.target_profit):
-                    self.close_position(position, max_exit_timestamp, 'TP_hit')
-                    return max_exit_timestamp
+                    self.close_position(position, clock.timestamp_of(max_exit_second), 'TP_hit')
+                    return max_exit_second
             
             elif position.strategy_type == 'debit':
                 if (abs(position.exit_premium) <= position.stop_loss):
-                    self.close_position(position, max_exit_timestamp, 'SL_hit')
-                    return max_exit_timestamp
+                    self.close_position(position, clock.timestamp_of(max_exit_second), 'SL_hit')
+                    return max_exit_second
 
                 elif (abs(position.exit_premium) >= position.target_profit):
-                    self.close_position(position, max_exit_timestamp, 'TP_hit')
-                    return max_exit_timestamp
+                    self.close_position(position, clock.timestamp_of(max_exit_second), 'TP_hit')
+                    return max_exit_second
 
-            max_exit_timestamp += pd.Timedelta(seconds=1)
+            max_exit_second += 1
         
         # Close position due to time breach
-        self.close_position(position, max_exit_timestamp, 'time_breach')
-        return max_exit_timestamp
+        self.close_position(position, clock.timestamp_of(max_exit_second), 'time_breach')
+        return max_exit_second
 
     def close_position(self, position, timestamp, reason):
         """
@@ -248,32 +466,146 @@ class SpreadBacktester:
             'exit_reason': reason,
             'pnl': position.pnl,
             'transaction_cost': transaction_cost,
-            'legs': position.legs
+            'legs': self.leg_buffer.record(position.legs)
         })
         
         # Remove the position from the positions list
         self.positions.remove(position)
 
 
-    def update_portfolio_metrics(self, timestamp, position):
+    def execute_portfolio(self, timestamp, cutoff=None):
+        """
+        Execute trades allowing up to max_positions overlapping positions.
+
+        Open legs are held in a PositionBook; every second while positions are
+        open they are marked to market, checked for SL/TP and aggregated into
+        portfolio Greeks in one vectorized step. New entries are taken on every
+        'long'/'short' signal while the position count and margin cap allow it.
+        Positions still open after the cutoff are closed on time breach, and
+        positions whose legs go max_retries seconds without a quote are dropped
+        as uncounted. Marks use the latest quote at or before each second, so
+        around data gaps exits can differ from execute_trades, which looks up
+        to max_retries seconds ahead for each leg. A single-position run
+        without a margin cap or an own cutoff is therefore handed to
+        execute_trades, so its trades do not depend on the engine; the
+        portfolio metrics are not updated in that case.
+
+        Args:
+        - timestamp (Timestamp): Starting timestamp for executing trades.
+        - cutoff (datetime.time or None): Time at and after which no new entries are taken, None for the
+          clock's cutoff.
+
+        Returns:
+        - Tuple: List of executed trades and count of uncounted positions.
         """
-        Manage portfolio Greeks and implement hedging strategies or position adjustments.
+        if self.chain_index is None:
+            raise ValueError("execute_portfolio requires a chain_index")
+
+        clock = self.clock
+        cutoff_second = clock.cutoff_second if cutoff is None else clock.second_at(cutoff)
+        if self.max_positions == 1 and self.margin_cap is None and cutoff_second == clock.cutoff_second:
+            return self.execute_trades(timestamp)
+
+        chain_index = self.chain_index
+        book = PositionBook(chain_index, self.greeks)
+        index = self.signals.index
+        entry_rows, cutoff_rows = self.schedule_entries(cutoff_second)
+
+        # Entries are taken on signal rows before the first cutoff row
+        second = clock.second_of(timestamp)
+        if len(cutoff_rows):
+            entry_rows = entry_rows[entry_rows < cutoff_rows[0]]
+        entry_rows = entry_rows[entry_rows >= np.searchsorted(self.signal_seconds, second, side='left')]
+        entry_seconds = self.signal_seconds[entry_rows]
+
+        next_entry = 0
+        while True:
+            if not len(book):
+                # Nothing to mark, jump straight to the next entry signal
+                if next_entry == len(entry_seconds):
+                    break
+                second = max(second, entry_seconds[next_entry])
+
+            if second > cutoff_second:
+                rows = np.arange(len(book))
+                premiums = book.premiums()
+                for row in rows:
+                    book.write_exit_fields(row, premiums[row])
+                    self.close_portfolio_position(book.positions[row], chain_index.timestamp_of(second), 'time_breach')
+                book.remove(rows)
+                break
+
+            if len(book):
+                self.step_portfolio(book, second)
+
+            while next_entry < len(entry_seconds) and entry_seconds[next_entry] <= second:
+                if entry_seconds[next_entry] == second:
+                    self.enter_portfolio_position(book, index[entry_rows[next_entry]])
+                next_entry += 1
+
+            second += 1
+
+        return self.trades, self.positions_not_counted
+
+    def step_portfolio(self, book, second):
+        """
+        Mark all open positions at a second and close those that hit SL/TP or ran out of quotes.
+        """
+        book.mark_to_market(second)
+        stale, sl_hit, tp_hit, premiums = book.check_exits(second)
+        exits = np.flatnonzero(stale | sl_hit | tp_hit)
+        timestamp = self.chain_index.timestamp_of(second)
+
+        for row in exits:
+            position = book.positions[row]
+            if stale[row]:
+                self.positions_not_counted += 1
+                self.positions.remove(position)
+                continue
+            book.write_exit_fields(row, premiums[row])
+            self.close_portfolio_position(position, timestamp, 'SL_hit' if sl_hit[row] else 'TP_hit')
+
+        if len(exits):
+            book.remove(exits)
+        self.update_portfolio_metrics(timestamp, book)
+
+    def enter_portfolio_position(self, book, timestamp):
+        """
+        Try to enter a position at a signal timestamp, subject to max_positions and margin_cap.
+        """
+        if len(book) >= self.max_positions:
+            self.rejected_entries += 1
+            return
+
+        bool_var, _ = self.enter_spread(timestamp)
+        if not bool_var:
+            return
+
+        position = self.positions[-1]
+        if self.margin_cap is not None and book.margin_in_use() + abs(position.margin_used) > self.margin_cap:
+            self.positions.remove(position)
+            self.rejected_entries += 1
+            return
+        book.add(position)
+
+    def close_portfolio_position(self, position, timestamp, reason):
+        """
+        Close a position of the portfolio and add its net result to the realized PnL.
+        """
+        self.close_position(position, timestamp, reason)
+        trade = self.trades[-1]
+        self.realized_pnl += trade['pnl'] - trade['transaction_cost']
+
+    def update_portfolio_metrics(self, timestamp, book):
+        """
+        Update portfolio Greeks and PnL from the open positions.
 
         Parameters:
         - timestamp (Timestamp): Current timestamp for managing portfolio.
+        - book (PositionBook): Book of open positions marked at timestamp.
         """
-        transaction_cost = 0
-        pnl = position.exit_premium - position.entry_premium
-        
+        unrealized_pnl = float((book.premiums() - book.entry_premium).sum())
 
-        for leg in position.legs:
-            self.portfolio_metrics['port_delta'] += leg['delta'] * leg['lot_size']
-            self.portfolio_metrics['port_gamma'] += leg['gamma'] * leg['lot_size']
-            self.portfolio_metrics['port_theta'] += leg['theta'] * leg['lot_size']
-            self.portfolio_metrics['port_iv'] += leg['iv'] * leg['lot_size']
-            transaction_cost += (abs(leg['entry_price'] + leg['exit_price']) * leg['lot_size']) * 0.001
-        
+        self.portfolio_metrics.update(book.aggregate_greeks())
         self.portfolio_metrics['current_timestamp'] = timestamp
-        self.portfolio_metrics['net_port_pnl'] += (pnl-transaction_cost)
-
-        
\ No newline at end of file
+        self.portfolio_metrics['net_port_pnl'] = self.realized_pnl + unrealized_pnl
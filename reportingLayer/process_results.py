@@ -1,5 +1,46 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from strategyLayer.legRecords import LegRecords, LEG_DTYPE, LEG_FIELDS
+
+def leg_columns(leg_records, n_trades):
+    """
+    Flatten typed legs into 'leg_{i}_{field}' columns, one array per column.
+
+    Args:
+    - leg_records (list): (trade row, LegRecords) pairs.
+    - n_trades (int): Number of trade rows; trades with fewer legs get NaN (NaT for times) in the missing columns.
+
+    Returns:
+    - columns (dict): Column name -> array of length n_trades.
+    """
+    columns = {}
+    n_legs = max((len(legs) for _, legs in leg_records), default=0)
+    for i in range(n_legs):
+        # Legs of one day share a buffer, so each day is read with one fancy index per field
+        by_buffer = {}
+        for row, legs in leg_records:
+            if len(legs) > i:
+                trade_rows, buffer_rows = by_buffer.setdefault(id(legs.buffer), (legs.buffer, [], []))[1:]
+                trade_rows.append(row)
+                buffer_rows.append(legs.rows[i])
+        for name in LEG_FIELDS:
+            kind = LEG_DTYPE[name].kind
+            if kind == 'S':
+                column = np.full(n_trades, np.nan, dtype=object)
+            elif kind == 'M':
+                column = np.full(n_trades, np.datetime64('NaT', 'ns'))
+            else:
+                column = np.full(n_trades, np.nan)
+            filled = 0
+            for buffer, trade_rows, buffer_rows in by_buffer.values():
+                values = buffer.records[name][buffer_rows]
+                column[trade_rows] = np.char.decode(values).astype(object) if kind == 'S' else values
+                filled += len(trade_rows)
+            if kind == 'i' and filled == n_trades:
+                column = column.astype(LEG_DTYPE[name])
+            columns[f"leg_{i+1}_{name}"] = column
+    return columns
 
 def process_results(results):
     """
@@ -16,6 +57,7 @@ def process_results(results):
     - accuracy (float): Percentage of trades with positive net profit.
     """
     all_trade_dicts = []
+    leg_records = []
 
     for result in results:
         if result is not None:
@@ -37,14 +79,21 @@ def process_results(results):
                     }
                     
                     # Add details for each leg of the trade
-                    for i, leg in enumerate(trade['legs']):
-                        for key, value in leg.items():
-                            trade_dict[f"leg_{i+1}_{key}"] = value
+                    if isinstance(trade['legs'], LegRecords):
+                        # Typed legs are flattened column by column below
+                        leg_records.append((len(all_trade_dicts), trade['legs']))
+                    else:
+                        for i, leg in enumerate(trade['legs']):
+                            for key, value in leg.items():
+                                trade_dict[f"leg_{i+1}_{key}"] = value
                     
                     all_trade_dicts.append(trade_dict)
 
     # Create a DataFrame from the list of trade dictionaries
     df_combined = pd.DataFrame(all_trade_dicts)
+    if leg_records:
+        leg_frame = pd.DataFrame(leg_columns(leg_records, len(df_combined)), index=df_combined.index)
+        df_combined = pd.concat([df_combined, leg_frame], axis=1)
 
     # Calculate additional metrics
     df_combined['net_pnl'] = df_combined['pnl'] - df_combined['transaction_cost']
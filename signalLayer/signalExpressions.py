@@ -0,0 +1,210 @@
+import operator
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+
+# Comparison operators supported on tags
+COMPARISONS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne
+}
+
+
+class Expression(ABC):
+    """
+    Boolean signal rule compiled into NumPy operations over whole columns.
+
+    Expressions are combined with & (AND), | (OR) and ~ (NOT), and made
+    persistent with for_bars(n). evaluate() returns one boolean per row of the
+    indicator frame; comparisons involving NaN are False, as in the row-wise
+    rules they replace.
+    """
+    @abstractmethod
+    def evaluate(self, data):
+        """
+        Return a boolean array with one value per row of data.
+        """
+
+    def __and__(self, other):
+        return Combine(np.logical_and, [self, other])
+
+    def __or__(self, other):
+        return Combine(np.logical_or, [self, other])
+
+    def __invert__(self):
+        return Not(self)
+
+    def for_bars(self, bars):
+        """
+        True where the expression has held for the last `bars` rows, including the current one.
+        """
+        return Persist(self, bars)
+
+
+class Tag:
+    """
+    Indicator column referenced by a rule.
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def values(self, data):
+        return np.asarray(data[self.name].values, dtype=np.float64)
+
+    def compare(self, op, other):
+        return Compare(self, op, other)
+
+    def __lt__(self, other):
+        return self.compare('<', other)
+
+    def __le__(self, other):
+        return self.compare('<=', other)
+
+    def __gt__(self, other):
+        return self.compare('>', other)
+
+    def __ge__(self, other):
+        return self.compare('>=', other)
+
+    def crosses_above(self, other):
+        """
+        True on the row where the tag moves from at or below `other` to above it.
+        """
+        return Cross(self, other, above=True)
+
+    def crosses_below(self, other):
+        """
+        True on the row where the tag moves from at or above `other` to below it.
+        """
+        return Cross(self, other, above=False)
+
+
+def _operand(value, data):
+    return value.values(data) if isinstance(value, Tag) else value
+
+
+class Compare(Expression):
+    def __init__(self, tag, op, other):
+        self.tag = tag
+        self.op = op
+        self.other = other
+
+    def evaluate(self, data):
+        return COMPARISONS[self.op](self.tag.values(data), _operand(self.other, data))
+
+
+class Cross(Expression):
+    def __init__(self, tag, other, above=True):
+        self.tag = tag
+        self.other = other
+        self.above = above
+
+    def evaluate(self, data):
+        values = self.tag.values(data)
+        other = np.broadcast_to(_operand(self.other, data), values.shape)
+        if self.above:
+            now, before = values > other, values <= other
+        else:
+            now, before = values < other, values >= other
+        crossed = np.zeros(len(values), dtype=bool)
+        crossed[1:] = now[1:] & before[:-1]
+        return crossed
+
+
+class Combine(Expression):
+    def __init__(self, function, expressions):
+        self.function = function
+        self.expressions = expressions
+
+    def evaluate(self, data):
+        result = self.expressions[0].evaluate(data)
+        for expression in self.expressions[1:]:
+            result = self.function(result, expression.evaluate(data))
+        return result
+
+
+class Not(Expression):
+    def __init__(self, expression):
+        self.expression = expression
+
+    def evaluate(self, data):
+        return ~self.expression.evaluate(data)
+
+
+class Persist(Expression):
+    def __init__(self, expression, bars):
+        self.expression = expression
+        self.bars = int(bars)
+
+    def evaluate(self, data):
+        held = self.expression.evaluate(data)
+        if self.bars <= 1:
+            return held
+        # Number of true rows in each trailing window of length bars
+        counts = np.concatenate([[0], np.cumsum(held)])
+        window = counts[self.bars:] - counts[:-self.bars]
+        result = np.zeros(len(held), dtype=bool)
+        result[self.bars - 1:] = window == self.bars
+        return result
+
+
+class TagGroup:
+    """
+    Several tags compared against one threshold or one threshold per tag.
+
+    all_of combines the comparisons with AND, any_of with OR.
+    """
+    def __init__(self, names, function):
+        self.tags = [Tag(name) for name in names]
+        self.function = function
+
+    def compare(self, op, thresholds):
+        if np.ndim(thresholds) == 0:
+            thresholds = [thresholds] * len(self.tags)
+        if len(thresholds) != len(self.tags):
+            raise ValueError(f"Expected {len(self.tags)} thresholds, got {len(thresholds)}")
+        return Combine(self.function, [tag.compare(op, threshold) for tag, threshold in zip(self.tags, thresholds)])
+
+    def __lt__(self, thresholds):
+        return self.compare('<', thresholds)
+
+    def __le__(self, thresholds):
+        return self.compare('<=', thresholds)
+
+    def __gt__(self, thresholds):
+        return self.compare('>', thresholds)
+
+    def __ge__(self, thresholds):
+        return self.compare('>=', thresholds)
+
+
+def all_of(names):
+    """
+    Group of tags whose comparisons must all hold, e.g. (all_of(['ulcer_index_rsi', 'kc_low_rsi']) < 15).for_bars(3).
+    """
+    return TagGroup(names, np.logical_and)
+
+
+def any_of(names):
+    """
+    Group of tags of which at least one comparison must hold.
+    """
+    return TagGroup(names, np.logical_or)
+
+
+def compile_signals(rules, data):
+    """
+    Evaluate named rules over an indicator frame.
+
+    Parameters:
+    - rules (dict): Output column name -> Expression.
+    - data (pd.DataFrame): Indicator values, one row per bar.
+
+    Returns:
+    - signals (pd.DataFrame): Boolean column per rule, indexed like data.
+    """
+    return pd.DataFrame({name: rule.evaluate(data) for name, rule in rules.items()}, index=data.index)
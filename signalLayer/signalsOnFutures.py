@@ -1,4 +1,5 @@
 import pandas as pd
+from signalLayer.signalExpressions import *
 
 class Signals:
     def __init__(self, indicators, options_data, lower_limit, upper_limit):
@@ -76,46 +77,52 @@ class Signals:
         signals['exit_signal'] = (signals['RSI'] > 70)
         return signals[['entry_signal', 'exit_signal']]
 
-    def four_tags(self, tag1, tag2, tag3, tag4):
+    def rule_signals(self, tags, long_entry, short_entry, long_exit=None, short_exit=None):
         """
-        Generate trading signals based on four indicator tags.
+        Generate trading signals from compiled signal expressions.
 
         Parameters:
-        - tag1 (str): Name of the first indicator tag.
-        - tag2 (str): Name of the second indicator tag.
-        - tag3 (str): Name of the third indicator tag.
-        - tag4 (str): Name of the fourth indicator tag.
+        - tags (list): Indicator columns copied into the signal frame.
+        - long_entry (Expression): Rule for 'long_signal_entry'.
+        - short_entry (Expression): Rule for 'short_signal_entry'.
+        - long_exit (Expression or None): Rule for 'long_signal_exit', None for never.
+        - short_exit (Expression or None): Rule for 'short_signal_exit', None for never.
 
         Returns:
-        - DataFrame: DataFrame with trading signals.
+        - DataFrame: DataFrame with trading signals, None if a tag is missing.
         """
         try:
-            self.trading_signal[tag1] = self.indicators[tag1]
-            self.trading_signal[tag2] = self.indicators[tag2]
-            self.trading_signal[tag3] = self.indicators[tag3]
-            self.trading_signal[tag4] = self.indicators[tag4]
-            
-            self.trading_signal['long_signal_entry'] = self.trading_signal.apply(
-                lambda x: x[tag1] < self.lower_limit and
-                          x[tag2] < self.lower_limit and
-                          x[tag3] < self.lower_limit and
-                          x[tag4] < self.lower_limit,
-                axis=1
-            )
-            self.trading_signal['short_signal_entry'] = self.trading_signal.apply(
-                lambda x: x[tag1] > self.upper_limit and
-                          x[tag2] > self.upper_limit and
-                          x[tag3] > self.upper_limit and
-                          x[tag4] > self.upper_limit,
-                axis=1
-            )
-            self.trading_signal['long_signal_exit'] = False
-            self.trading_signal['short_signal_exit'] = False
+            for tag in tags:
+                self.trading_signal[tag] = self.indicators[tag]
+
+            rules = {'long_signal_entry': long_entry, 'short_signal_entry': short_entry}
+            if long_exit is not None:
+                rules['long_signal_exit'] = long_exit
+            if short_exit is not None:
+                rules['short_signal_exit'] = short_exit
+            signals = compile_signals(rules, self.trading_signal)
+
+            for name in ['long_signal_entry', 'short_signal_entry', 'long_signal_exit', 'short_signal_exit']:
+                self.trading_signal[name] = signals[name].values if name in signals else False
             
             return self.trading_signal
         
         except KeyError as e:
             print(f"Indicator tag not found: {e}")
             return None
-    
-    
\ No newline at end of file
+
+    def four_tags(self, tag1, tag2, tag3, tag4):
+        """
+        Generate trading signals based on four indicator tags.
+
+        Parameters:
+        - tag1 (str): Name of the first indicator tag.
+        - tag2 (str): Name of the second indicator tag.
+        - tag3 (str): Name of the third indicator tag.
+        - tag4 (str): Name of the fourth indicator tag.
+
+        Returns:
+        - DataFrame: DataFrame with trading signals.
+        """
+        tags = [tag1, tag2, tag3, tag4]
+        return self.rule_signals(tags, all_of(tags) < self.lower_limit, all_of(tags) > self.upper_limit)
@@ -1,7 +1,6 @@
-from datetime import timedelta
 from utils.utils import *
 
-def create_leg(options_data, timestamp, strike_price, action, option_type, lots):
+def create_leg(options_data, timestamp, strike_price, action, option_type, lots, greeks=None):
     """
     Create a leg (option) based on given options data and parameters.
 
@@ -12,23 +11,108 @@ def create_leg(options_data, timestamp, strike_price, action, option_type, lots)
     - action (str): Action type ('buy' or 'sell').
     - option_type (str): Option type ('call' or 'put').
     - lots (int): Number of lots (contracts).
+    - greeks (LazyGreeks or None): Lazy Greeks provider when options_data carries prices only.
 
     Returns:
     - leg_data (dict): Dictionary containing details of the created leg.
+
+    Raises:
+    - KeyError: If the contract has no quote at or after timestamp.
+    """
+    if not options_data.index.is_monotonic_increasing:
+        options_data = options_data.sort_index(kind='stable')
+
+    # Use the first available quote at or after the requested timestamp
+    position = options_data.index.searchsorted(timestamp, side='left')
+    if position == len(options_data):
+        raise KeyError((strike_price, option_type, timestamp))
+    timestamp = options_data.index[position]
+    option = options_data.iloc[position]
+
+    # Compute Greeks on first touch when the chain carries prices only
+    option_greeks = greeks.lookup(strike_price, option_type, timestamp) if greeks is not None else option
+
+    return build_leg_data(timestamp, strike_price, action, option_type, lots, option['option_price'], option_greeks)
+
+def create_leg_from_index(chain_index, timestamp, strike_price, action, option_type, lots, greeks=None):
+    """
+    Create a leg (option) using a ChainIndex instead of a filtered options DataFrame.
+
+    Parameters:
+    - chain_index (ChainIndex): Dense per-day chain index.
+    - timestamp (datetime): Timestamp for selecting options data.
+    - strike_price (float): Strike price of the option.
+    - action (str): Action type ('buy' or 'sell').
+    - option_type (str): Option type ('CE' or 'PE').
+    - lots (int): Number of lots (contracts).
+    - greeks (LazyGreeks or None): Lazy Greeks provider when the chain carries prices only.
+
+    Returns:
+    - leg_data (dict): Dictionary containing details of the created leg.
+
+    Raises:
+    - KeyError: If the contract has no quote at or after timestamp.
+    """
+    contract = chain_index.contract(strike_price, option_type)
+    second = None if contract is None else chain_index.first_present(contract, chain_index.second_of(timestamp))
+    if second is None:
+        raise KeyError((strike_price, option_type, timestamp))
+
+    # Use the first available quote at or after the requested timestamp
+    timestamp = chain_index.timestamp_of(second)
+    option = chain_index.quote(contract, second)
+    option_greeks = greeks.lookup(strike_price, option_type, timestamp) if greeks is not None else option
+
+    return build_leg_data(timestamp, strike_price, action, option_type, lots, option['option_price'], option_greeks)
+
+def create_leg_from_series(series, timestamp, strike_price, action, option_type, lots, greeks=None):
+    """
+    Create a leg (option) from a cached ContractSeries instead of a filtered options DataFrame.
+
+    Parameters:
+    - series (ContractSeries or None): Quotes of the contract for the day.
+    - timestamp (datetime): Timestamp for selecting options data.
+    - strike_price (float): Strike price of the option.
+    - action (str): Action type ('buy' or 'sell').
+    - option_type (str): Option type ('CE' or 'PE').
+    - lots (int): Number of lots (contracts).
+    - greeks (LazyGreeks or None): Lazy Greeks provider when the chain carries prices only.
+
+    Returns:
+    - leg_data (dict): Dictionary containing details of the created leg.
+
+    Raises:
+    - KeyError: If the contract has no quote at or after timestamp.
+    """
+    position = None if series is None else series.first_present(series.second_of(timestamp))
+    if position is None:
+        raise KeyError((strike_price, option_type, timestamp))
+
+    # Use the first available quote at or after the requested timestamp
+    timestamp = series.timestamp_of(series.seconds[position])
+    option = series.quote(position)
+    option_greeks = greeks.lookup(strike_price, option_type, timestamp) if greeks is not None else option
+
+    return build_leg_data(timestamp, strike_price, action, option_type, lots, option['option_price'], option_greeks)
+
+def build_leg_data(timestamp, strike_price, action, option_type, lots, option_price, option_greeks):
     """
-    while True:
-        try:
-            # Attempt to locate option data at the specified timestamp
-            option = options_data.loc[timestamp]
-            if not option.empty:
-                break
-        except KeyError:
-            pass
-        # If data is not found at timestamp, increment timestamp by one second and retry
-        timestamp = timestamp + timedelta(seconds=1)
+    Construct the leg dictionary from an entry quote.
 
+    Parameters:
+    - timestamp (datetime): Entry timestamp of the leg.
+    - strike_price (float): Strike price of the option.
+    - action (str): Action type ('buy' or 'sell').
+    - option_type (str): Option type ('CE' or 'PE').
+    - lots (int): Number of lots (contracts).
+    - option_price (float): Option price at entry.
+    - option_greeks (Mapping): Values for 'delta', 'theta', 'gamma' and 'iv' at entry.
+
+    Returns:
+    - leg_data (dict): Dictionary containing details of the created leg.
+    """
     # Calculate margin based on action type
-    margin = (-100000 * lots) if action == 'sell' else (option['option_price'] * 15 * lots)
+    margin = (-100000 * lots) if action == 'sell' else (option_price * 15 * lots)
     
     # Calculate multipliers for delta and all other Greeks
     del_multiplier = get_delta_multiplier(action, option_type)
@@ -42,11 +126,11 @@ def create_leg(options_data, timestamp, strike_price, action, option_type, lots)
         'action': action,
         'lot_size': lots,
         'margin_used': margin,
-        'entry_price': option['option_price'] * all_greeks_multiplier,
-        'entry_delta': option['delta'] * del_multiplier,
-        'entry_theta': option['theta'] * all_greeks_multiplier,
-        'entry_gamma': option['gamma'] * all_greeks_multiplier,
-        'entry_iv': option['iv'] * all_greeks_multiplier,
+        'entry_price': option_price * all_greeks_multiplier,
+        'entry_delta': option_greeks['delta'] * del_multiplier,
+        'entry_theta': option_greeks['theta'] * all_greeks_multiplier,
+        'entry_gamma': option_greeks['gamma'] * all_greeks_multiplier,
+        'entry_iv': option_greeks['iv'] * all_greeks_multiplier,
         'exit_time_of_leg': None,
         'exit_price': None,
         'exit_delta': None,
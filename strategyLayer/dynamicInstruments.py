@@ -1,5 +1,5 @@
 import pandas as pd
-from strategyLayer.createLegs import create_leg
+from strategyLayer.createLegs import create_leg, create_leg_from_index, create_leg_from_series
 
 class DynamicLegStrategy:
     def __init__(self):
@@ -8,7 +8,16 @@ class DynamicLegStrategy:
         """
         print("calling Strategy class")
 
-    def get_legs(self, options_data, timestamp, atm_strike, instruments_with_actions):
+    def strike_of(self, timestamp, atm_strike, instrument, strike_table=None):
+        """
+        Return the strike of an instrument: ATM plus its 'strike_part', or the strike table's selection.
+        """
+        if strike_table is not None:
+            return strike_table.resolve(timestamp, atm_strike, instrument)
+        return atm_strike + instrument['strike_part']
+
+    def get_legs(self, options_data, timestamp, atm_strike, instruments_with_actions, greeks=None, chain_index=None,
+                 strike_table=None, series_cache=None):
         """
         Generate legs (options) based on given criteria.
 
@@ -17,16 +26,45 @@ class DynamicLegStrategy:
         - timestamp (datetime): Timestamp for selecting options data.
         - atm_strike (float): ATM (at-the-money) strike price.
         - instruments_with_actions (list): List of dictionaries specifying strike part, option type, action, and lots.
+        - greeks (LazyGreeks or None): Lazy Greeks provider when options_data carries prices only.
+        - chain_index (ChainIndex or None): Dense chain index; when given, legs are read from it
+          without filtering or merging options_data.
+        - strike_table (StrikeTable or None): Per-second strike table; when given, instruments may also select
+          strikes by 'strike_steps' (places from ATM on the strike ladder) or 'delta' (target delta).
+        - series_cache (ContractSeriesCache or None): Per-contract series of the day; when given, legs and
+          the filtered data are read from cached series without filtering or merging options_data.
 
         Returns:
         - legs (list): List of created legs (options).
-        - filtered_options_data (pd.DataFrame): Filtered options data based on selected strikes and types.
+        - filtered_options_data (pd.DataFrame, dict or None): Filtered options data based on selected strikes and types,
+          a dict of (strike_price, option_type) -> ContractSeries from timestamp when series_cache is used,
+          None when chain_index is used.
         """
+        if chain_index is not None:
+            legs = [
+                create_leg_from_index(chain_index, timestamp, self.strike_of(timestamp, atm_strike, instrument, strike_table),
+                                      instrument['action'], instrument['option_type'], instrument['lots'], greeks)
+                for instrument in instruments_with_actions
+            ]
+            return legs, None
+
+        if series_cache is not None:
+            legs = []
+            filtered_series = {}
+            for instrument in instruments_with_actions:
+                strike_price = self.strike_of(timestamp, atm_strike, instrument, strike_table)
+                option_type = instrument['option_type']
+                series = series_cache.get(strike_price, option_type)
+                legs.append(create_leg_from_series(series, timestamp, strike_price, instrument['action'], option_type,
+                                                   instrument['lots'], greeks))
+                filtered_series[(strike_price, option_type)] = series.since(timestamp)
+            return legs, filtered_series
+
         legs = []
         strikes_and_types = []
 
         for instrument in instruments_with_actions:
-            strike_price = atm_strike + instrument['strike_part']
+            strike_price = self.strike_of(timestamp, atm_strike, instrument, strike_table)
             option_type = instrument['option_type']
             action = instrument['action']
             lots = instrument['lots']
@@ -38,7 +76,7 @@ class DynamicLegStrategy:
             ]
             
             # Create a leg (option) using filtered options data
-            leg = create_leg(options_data_filtered, timestamp, strike_price, action, option_type, lots)
+            leg = create_leg(options_data_filtered, timestamp, strike_price, action, option_type, lots, greeks)
             legs.append(leg)
             strikes_and_types.append((strike_price, option_type))
         
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+# Typed fields of a leg, in the order of the leg dictionaries built by build_leg_data
+LEG_DTYPE = np.dtype([
+    ('entry_time_of_leg', 'datetime64[ns]'),
+    ('strike_price', 'f8'),
+    ('option_type', 'S2'),
+    ('action', 'S4'),
+    ('lot_size', 'i8'),
+    ('margin_used', 'f8'),
+    ('entry_price', 'f8'),
+    ('entry_delta', 'f8'),
+    ('entry_theta', 'f8'),
+    ('entry_gamma', 'f8'),
+    ('entry_iv', 'f8'),
+    ('exit_time_of_leg', 'datetime64[ns]'),
+    ('exit_price', 'f8'),
+    ('exit_delta', 'f8'),
+    ('exit_theta', 'f8'),
+    ('exit_gamma', 'f8'),
+    ('exit_iv', 'f8')
+])
+LEG_FIELDS = LEG_DTYPE.names
+_FIELD_KINDS = {name: LEG_DTYPE[name].kind for name in LEG_FIELDS}
+
+
+def _to_python(kind, value):
+    if kind == 'M':
+        return None if np.isnat(value) else pd.Timestamp(value)
+    if kind == 'S':
+        return value.decode()
+    if kind == 'i':
+        return int(value)
+    return float(value)
+
+
+def _to_field(kind, value):
+    if kind == 'M':
+        if isinstance(value, np.datetime64):
+            return value
+        return np.datetime64('NaT', 'ns') if value is None else pd.Timestamp(value).to_datetime64()
+    if kind == 'f' and value is None:
+        return np.nan
+    return value
+
+
+class LegBuffer:
+    """
+    Preallocated structured array holding the legs of a day's closed trades.
+
+    Each leg is one typed row (times as datetime64, option type and action
+    as short byte strings, prices and Greeks as float64). Legs stay plain
+    dictionaries while their position is open, so the per-second loops use
+    dict lookups, and are written once when the position closes (record).
+    Leg handles read a row like the leg dictionary it came from. The buffer
+    doubles its capacity when full and pickles only the rows in use.
+    """
+    def __init__(self, capacity=256):
+        """
+        Initialize an empty buffer.
+
+        Parameters:
+        - capacity (int): Number of legs preallocated.
+        """
+        self.records = np.zeros(capacity, dtype=LEG_DTYPE)
+        self.records['entry_time_of_leg'] = np.datetime64('NaT', 'ns')
+        self.records['exit_time_of_leg'] = np.datetime64('NaT', 'ns')
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getstate__(self):
+        return {'records': self.records[:self.size].copy(), 'size': self.size}
+
+    def append(self, **fields):
+        """
+        Add a leg and return its handle; fields not given are NaN (NaT for times).
+        """
+        if self.size == len(self.records):
+            grown = np.zeros(max(2 * len(self.records), 1), dtype=LEG_DTYPE)
+            grown['entry_time_of_leg'] = np.datetime64('NaT', 'ns')
+            grown['exit_time_of_leg'] = np.datetime64('NaT', 'ns')
+            grown[:self.size] = self.records[:self.size]
+            self.records = grown
+        row = self.size
+        for name in ('entry_price', 'entry_delta', 'entry_theta', 'entry_gamma', 'entry_iv',
+                     'exit_price', 'exit_delta', 'exit_theta', 'exit_gamma', 'exit_iv'):
+            self.records[name][row] = np.nan
+        for name, value in fields.items():
+            self.records[name][row] = _to_field(_FIELD_KINDS[name], value)
+        self.size += 1
+        return Leg(self, row)
+
+    def record(self, legs):
+        """
+        Write the legs of a closed position and return them as LegRecords.
+
+        Parameters:
+        - legs (list): Leg dictionaries (see build_leg_data).
+        """
+        return LegRecords(self, [self.append(**leg).row for leg in legs])
+
+    def frame(self, rows=None):
+        """
+        Return legs as a DataFrame with one column per field.
+
+        Parameters:
+        - rows (array-like or None): Rows to include, None for every leg.
+        """
+        records = self.records[:self.size] if rows is None else self.records[np.asarray(rows, dtype=np.int64)]
+        return pd.DataFrame({name: np.char.decode(records[name]) if _FIELD_KINDS[name] == 'S' else records[name]
+                             for name in LEG_FIELDS})
+
+    def nbytes(self):
+        return self.records.nbytes
+
+
+class Leg:
+    """
+    Handle on one row of a LegBuffer with the mapping interface of a leg dictionary.
+    """
+    __slots__ = ('buffer', 'row')
+
+    def __init__(self, buffer, row):
+        self.buffer = buffer
+        self.row = row
+
+    def __getitem__(self, key):
+        return _to_python(_FIELD_KINDS[key], self.buffer.records[key][self.row])
+
+    def __setitem__(self, key, value):
+        self.buffer.records[key][self.row] = _to_field(_FIELD_KINDS[key], value)
+
+    def __contains__(self, key):
+        return key in _FIELD_KINDS
+
+    def __iter__(self):
+        return iter(LEG_FIELDS)
+
+    def __len__(self):
+        return len(LEG_FIELDS)
+
+    def keys(self):
+        return LEG_FIELDS
+
+    def items(self):
+        record = self.buffer.records[self.row]
+        return [(name, _to_python(_FIELD_KINDS[name], record[name])) for name in LEG_FIELDS]
+
+    def to_dict(self):
+        return dict(self.items())
+
+
+class LegRecords:
+    """
+    Legs of a trade recorded as row indices into the day's LegBuffer.
+
+    Iterating yields Leg handles, so trades read like lists of leg dictionaries.
+    """
+    __slots__ = ('buffer', 'rows')
+
+    def __init__(self, buffer, rows):
+        self.buffer = buffer
+        self.rows = tuple(int(row) for row in rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return (Leg(self.buffer, row) for row in self.rows)
+
+    def __getitem__(self, i):
+        return Leg(self.buffer, self.rows[i])
+
+    def records(self):
+        """
+        Return the trade's legs as a structured array.
+        """
+        return self.buffer.records[list(self.rows)]
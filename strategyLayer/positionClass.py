@@ -1,8 +1,10 @@
 import pandas as pd
-from datetime import timedelta
 from utils.utils import *
 
 class Position:
+    __slots__ = ('entry_timestamp', 'legs', 'entry_premium', 'margin_used', 'strategy_type', 'stop_loss',
+                 'target_profit', 'exit_premium', 'exit_timestamp', 'pnl')
+
     def __init__(self, entry_timestamp, legs, stop_loss, target_profit, entry_premium, margin_used, strategy_type):
         """
         Initialize a position object with entry details.
@@ -43,13 +45,14 @@ class Position:
         self.exit_timestamp = exit_timestamp
         self.pnl = pnl
 
-    def get_current_leg_prices(self, options_data, timestamp):
+    def get_current_leg_prices(self, options_data, timestamp, greeks=None):
         """
         Retrieve current prices and Greeks for all legs of the position at a given timestamp.
 
         Parameters:
         - options_data (pd.DataFrame): DataFrame containing options data.
         - timestamp (datetime): Timestamp to fetch current prices.
+        - greeks (LazyGreeks or None): Lazy Greeks provider when options_data carries prices only.
 
         Returns:
         - max_exit_timestamp (datetime): Maximum timestamp encountered while fetching prices.
@@ -85,7 +88,16 @@ class Position:
                         timestamp += pd.Timedelta(seconds=1)
                         retries += 1
                     else:
-                        if isinstance(current_leg, pd.Series):
+                        if greeks is not None:
+                            # Compute Greeks on first touch when the chain carries prices only
+                            leg_greeks = greeks.lookup(leg['strike_price'], leg['option_type'], timestamp)
+                            option_price = current_leg['option_price'] if isinstance(current_leg, pd.Series) else current_leg['option_price'].iloc[0]
+                            current_price = option_price * all_greeks_multiplier
+                            leg['exit_delta'] = leg_greeks['delta'] * del_multiplier
+                            leg['exit_theta'] = leg_greeks['theta'] * all_greeks_multiplier
+                            leg['exit_gamma'] = leg_greeks['gamma'] * all_greeks_multiplier
+                            leg['exit_iv'] = leg_greeks['iv'] * all_greeks_multiplier
+                        elif isinstance(current_leg, pd.Series):
                             current_price = current_leg['option_price'] * all_greeks_multiplier
                             leg['exit_delta'] = current_leg['delta'] * del_multiplier
                             leg['exit_theta'] = current_leg['theta'] * all_greeks_multiplier
@@ -96,7 +108,7 @@ class Position:
                             leg['exit_delta'] = current_leg['delta'].iloc[0] * del_multiplier
                             leg['exit_theta'] = current_leg['theta'].iloc[0] * all_greeks_multiplier
                             leg['exit_gamma'] = current_leg['gamma'].iloc[0] * all_greeks_multiplier
-                            leg['exit_iv'] = current_leg['iv'] * all_greeks_multiplier
+                            leg['exit_iv'] = current_leg['iv'].iloc[0] * all_greeks_multiplier
 
                         leg['exit_price'] = current_price
                         timestamp_list.append(timestamp)
@@ -116,3 +128,95 @@ class Position:
                 break
 
         return max_exit_timestamp, close_position
+
+    def get_current_leg_prices_from_index(self, chain_index, second, greeks=None, max_retries=10):
+        """
+        ChainIndex version of get_current_leg_prices on the integer time axis.
+
+        Each leg takes its first quote within max_retries seconds of the running
+        second, which carries over from one leg to the next as in
+        get_current_leg_prices.
+
+        Parameters:
+        - chain_index (ChainIndex): Dense per-day chain index.
+        - second (int): Second of the session to fetch current prices at.
+        - greeks (LazyGreeks or None): Lazy Greeks provider when the chain carries prices only.
+        - max_retries (int): Number of seconds searched for a quote per leg.
+
+        Returns:
+        - max_exit_second (int): Latest second encountered while fetching prices.
+        - close_position (bool): Flag indicating if the position should be closed due to inability to fetch prices.
+        """
+        max_exit_second = second
+
+        for leg in self.legs:
+            del_multiplier = get_delta_multiplier(leg['action'], leg['option_type'])
+            all_greeks_multiplier = get_all_other_greeks_multiplier(leg['action'])
+
+            contract = chain_index.contract(leg['strike_price'], leg['option_type'])
+            found = None if contract is None else chain_index.first_present(contract, second, second + max_retries)
+            if found is None:
+                return max_exit_second, True
+
+            second = found
+            quote = chain_index.quote(contract, second)
+            leg_greeks = greeks.lookup(leg['strike_price'], leg['option_type'], chain_index.datetime64_of(second)) if greeks is not None else quote
+
+            leg['exit_price'] = quote['option_price'] * all_greeks_multiplier
+            leg['exit_delta'] = leg_greeks['delta'] * del_multiplier
+            leg['exit_theta'] = leg_greeks['theta'] * all_greeks_multiplier
+            leg['exit_gamma'] = leg_greeks['gamma'] * all_greeks_multiplier
+            leg['exit_iv'] = leg_greeks['iv'] * all_greeks_multiplier
+
+            if second > max_exit_second:
+                max_exit_second = second
+
+            leg['exit_time_of_leg'] = chain_index.datetime64_of(max_exit_second)
+
+        return max_exit_second, False
+
+    def get_current_leg_prices_from_series(self, filtered_series, second, greeks=None, max_retries=10):
+        """
+        ContractSeries version of get_current_leg_prices on the integer time axis.
+
+        Each leg takes its first quote within max_retries seconds of the running
+        second, which carries over from one leg to the next as in
+        get_current_leg_prices.
+
+        Parameters:
+        - filtered_series (dict): (strike_price, option_type) -> ContractSeries, as returned by get_legs.
+        - second (int): Second of the session to fetch current prices at.
+        - greeks (LazyGreeks or None): Lazy Greeks provider when the chain carries prices only.
+        - max_retries (int): Number of seconds searched for a quote per leg.
+
+        Returns:
+        - max_exit_second (int): Latest second encountered while fetching prices.
+        - close_position (bool): Flag indicating if the position should be closed due to inability to fetch prices.
+        """
+        max_exit_second = second
+
+        for leg in self.legs:
+            del_multiplier = get_delta_multiplier(leg['action'], leg['option_type'])
+            all_greeks_multiplier = get_all_other_greeks_multiplier(leg['action'])
+
+            series = filtered_series.get((leg['strike_price'], leg['option_type']))
+            position = None if series is None else series.first_present(second, second + max_retries)
+            if position is None:
+                return max_exit_second, True
+
+            second = int(series.seconds[position])
+            quote = series.quote(position)
+            leg_greeks = greeks.lookup(leg['strike_price'], leg['option_type'], series.datetime64_of(second)) if greeks is not None else quote
+
+            leg['exit_price'] = quote['option_price'] * all_greeks_multiplier
+            leg['exit_delta'] = leg_greeks['delta'] * del_multiplier
+            leg['exit_theta'] = leg_greeks['theta'] * all_greeks_multiplier
+            leg['exit_gamma'] = leg_greeks['gamma'] * all_greeks_multiplier
+            leg['exit_iv'] = leg_greeks['iv'] * all_greeks_multiplier
+
+            if second > max_exit_second:
+                max_exit_second = second
+
+            leg['exit_time_of_leg'] = series.datetime64_of(max_exit_second)
+
+        return max_exit_second, False
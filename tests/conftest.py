@@ -0,0 +1,65 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_chain(day='2023-01-03', n_strikes=5, step=100, base=43000, seed=0, start='09:15:00', end='15:30:00'):
+    """
+    Build a one-second option chain of a day with intrinsic-plus-time-value prices.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(f'{day} {start}', f'{day} {end}', freq='1s')
+    spot = base + np.cumsum(rng.normal(0, 2, len(index)))
+    expiry = pd.Timestamp(day) + pd.Timedelta(days=2, hours=15, minutes=30)
+    frames = []
+    for strike in base + step * (np.arange(n_strikes) - n_strikes // 2):
+        for option_type in ('CE', 'PE'):
+            intrinsic = np.maximum(spot - strike, 0) if option_type == 'CE' else np.maximum(strike - spot, 0)
+            frames.append(pd.DataFrame({'option_price': np.round(intrinsic + 150.0, 2), 'spot_price': spot,
+                                        'strike_price': float(strike), 'option_type': option_type,
+                                        'expiry_date': expiry, 'Difference': np.abs(spot - strike)}, index=index))
+    return pd.concat(frames).sort_index(kind='stable')
+
+
+def make_gapped_chain(day='2023-01-03', seed=0, drop=0.3, gap=('11:00:00', '11:05:00')):
+    """
+    Build an option chain of a day with a share of rows dropped at random and a window with no quotes at all.
+    """
+    chain = make_chain(day=day, seed=seed)
+    rng = np.random.default_rng(seed)
+    keep = rng.random(len(chain)) >= drop
+    keep &= ~((chain.index >= pd.Timestamp(f'{day} {gap[0]}')) & (chain.index < pd.Timestamp(f'{day} {gap[1]}')))
+    return chain[keep]
+
+
+def make_signals(day='2023-01-03', seed=0, n_entries=30):
+    """
+    Build one-minute signals of a day with random long and short entry rows.
+    """
+    index = pd.date_range(f'{day} 09:15:00', f'{day} 15:29:00', freq='1min')
+    signals = pd.DataFrame(False, index=index, columns=['long_signal_entry', 'short_signal_entry',
+                                                        'long_signal_exit', 'short_signal_exit'])
+    rows = np.random.default_rng(seed).choice(len(index), n_entries, replace=False)
+    signals.iloc[rows[:n_entries // 2], 0] = True
+    signals.iloc[rows[n_entries // 2:], 1] = True
+    return signals
+
+
+def make_ticks(day='2023-01-03', seed=1, base=43000, start='09:15:00', end='15:30:00'):
+    """
+    Build one-second futures ticks of a day.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(f'{day} {start}', f'{day} {end}', freq='1s')
+    return pd.DataFrame({'Close': base + np.cumsum(rng.normal(0, 2, len(index))),
+                         'Volume': rng.integers(1, 100, len(index)),
+                         'OI': rng.integers(1000, 2000, len(index))}, index=index)
+
+
+@pytest.fixture
+def option_chain():
+    return make_chain()
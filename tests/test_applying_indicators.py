@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+import dataLayer.applying_indicators as applying_indicators
+from conftest import make_ticks
+from dataLayer.applying_indicators import apply_indicators, indicator_params
+from dataLayer.indicatorGraph import compute_indicators, sweep_indicators
+from dataLayer.ohlcBuilder import create_ohlc_candles
+
+MODULE_PARAMETERS = [
+    'rolling_window_of_returns', 'rsi_window', 'bb_window', 'bb_deviation', 'atr_kc_multiplier', 'donchian_window',
+    'keltner_window', 'keltner_window_atr', 'ulcer_index_window', 'atr_window', 'chaikin_volatility_period',
+    'dpo_period', 'roc_period', 'rvi_period', 'gamma', 'short_window', 'medium_window', 'long_window',
+    'signal_window', 'multiplier', 'k_window', 'd_window', 'acceleration_psar', 'maximum_psar', 'window'
+]
+
+
+def test_defaults_equal_module_constants():
+    params = indicator_params()
+    assert sorted(params) == sorted(MODULE_PARAMETERS)
+    for name in MODULE_PARAMETERS:
+        assert params[name] == getattr(applying_indicators, name), name
+
+
+def test_base_window_override():
+    params = indicator_params(rolling_window_of_returns=8)
+    assert params['rsi_window'] == applying_indicators.rsi_window
+    for name in ('bb_window', 'donchian_window', 'keltner_window', 'atr_window', 'k_window', 'd_window', 'window'):
+        assert params[name] == 8
+    assert (params['short_window'], params['medium_window'], params['long_window'], params['signal_window']) == \
+           (9, 27, 81, 27)
+
+
+def test_overrides_rederive_dependents_only():
+    params = indicator_params(bb_deviation=2.5, short_window=3)
+    assert params['atr_kc_multiplier'] == params['multiplier'] == 2.5
+    assert (params['medium_window'], params['long_window'], params['signal_window']) == (9, 27, 9)
+    assert params['bb_window'] == applying_indicators.bb_window
+
+    params = indicator_params(bb_deviation=2.5, atr_kc_multiplier=1.5, medium_window=10)
+    assert (params['atr_kc_multiplier'], params['multiplier']) == (1.5, 2.5)
+    assert (params['short_window'], params['long_window'], params['signal_window']) == (5, 30, 10)
+
+
+SWEEP = [{}, {'rolling_window_of_returns': 8}, {'bb_deviation': 2.5, 'rsi_window': 9}, {'short_window': 3}]
+SWEEP_REQUEST = ['ulcer_index_rsi', 'kc_low_rsi', 'BB_high_k_percent', 'ATR_k_percent', 'donchian_mid', 'EMA_adjusted']
+
+
+@pytest.mark.parametrize('through_apply', [True, False])
+def test_sweep_settings_match_single_runs(through_apply):
+    bars = create_ohlc_candles(make_ticks(), '1min')
+    if through_apply:
+        frames = apply_indicators(bars, SWEEP_REQUEST, sweep=SWEEP)
+    else:
+        frames = sweep_indicators(bars, SWEEP_REQUEST, [indicator_params(**overrides) for overrides in SWEEP])
+
+    for k, overrides in enumerate(SWEEP):
+        expected = compute_indicators(bars.copy(), SWEEP_REQUEST, indicator_params(**overrides))
+        for frame, single in zip(frames, expected):
+            setting = frame[k]
+            # The sweep keeps OHLC and the indicators, not the other columns of the bars
+            assert list(setting.columns) == [column for column in single.columns if column in setting.columns]
+            pd.testing.assert_frame_equal(setting, single[setting.columns].astype(np.float64), check_names=False)
+            assert np.shares_memory(setting.to_numpy(), frame.to_numpy())
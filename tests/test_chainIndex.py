@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from conftest import make_gapped_chain
+from dataLayer.chainIndex import ChainIndex, NO_QUOTE
+
+
+def brute_next_quote(quoted_seconds, second):
+    later = quoted_seconds[quoted_seconds >= second]
+    return int(later[0]) if len(later) else None
+
+
+def test_quotes_match_chain():
+    options_data = make_gapped_chain()
+    chain_index = ChainIndex(options_data)
+    contract = chain_index.contract(43000.0, 'PE')
+    rows = options_data[(options_data['strike_price'] == 43000.0) & (options_data['option_type'] == 'PE')]
+    seconds = np.array([chain_index.second_of(timestamp) for timestamp in rows.index[:500]])
+
+    assert chain_index.present[contract[0], contract[1]].sum() == len(rows)
+    np.testing.assert_array_equal(chain_index.lookup('option_price', seconds, contract[0], contract[1]),
+                                  rows['option_price'].values[:500])
+    assert chain_index.timestamp_of(seconds[-1]) == rows.index[499]
+    assert chain_index.contract(43050.0, 'CE') is None
+
+
+def test_next_quote_pointers_skip_gaps():
+    options_data = make_gapped_chain()
+    chain_index = ChainIndex(options_data)
+    contract = chain_index.contract(43100.0, 'CE')
+    quoted_seconds = np.flatnonzero(chain_index.present[contract[0], contract[1]])
+
+    # Every second of the session, including the five minutes without quotes from 11:00
+    for second in range(0, chain_index.n_seconds, 7):
+        assert chain_index.first_present(contract, second) == brute_next_quote(quoted_seconds, second)
+
+    gap_start = chain_index.second_of(pd.Timestamp('2023-01-03 11:00:00'))
+    gap_end = chain_index.second_of(pd.Timestamp('2023-01-03 11:05:00'))
+    assert chain_index.first_present(contract, gap_start) >= gap_end
+    assert chain_index.first_present(contract, gap_start, gap_end) is None
+
+    pointers = chain_index.next_present(contract, gap_end - 10, gap_end + 10)
+    waits = chain_index.staleness(contract, gap_end - 10, gap_end + 10)
+    for offset, second in enumerate(range(gap_end - 10, gap_end + 10)):
+        expected = brute_next_quote(quoted_seconds, second)
+        expected = NO_QUOTE if expected is None or expected >= gap_end + 10 else expected
+        assert pointers[offset] == expected
+        assert waits[offset] == (NO_QUOTE if expected == NO_QUOTE else expected - second)
+
+
+
+def test_float32_values():
+    options_data = make_gapped_chain()
+    chain_index = ChainIndex(options_data, dtype=np.float32)
+    assert chain_index.values['option_price'].dtype == np.float32
+    assert chain_index.nbytes() < ChainIndex(options_data).nbytes()
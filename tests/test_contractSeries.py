@@ -0,0 +1,39 @@
+import numpy as np
+from conftest import make_gapped_chain
+from dataLayer.chainIndex import ChainIndex
+from dataLayer.contractSeries import ContractSeriesCache
+
+
+def test_series_matches_chain_index():
+    options_data = make_gapped_chain()
+    cache = ContractSeriesCache(options_data)
+    chain_index = ChainIndex(options_data)
+    for strike_price in chain_index.strikes:
+        for option_type in ('CE', 'PE'):
+            series = cache.get(strike_price, option_type)
+            contract = chain_index.contract(strike_price, option_type)
+            np.testing.assert_array_equal(series.seconds, np.flatnonzero(chain_index.present[contract[0], contract[1]]))
+            np.testing.assert_array_equal(series.values['option_price'],
+                                          chain_index.series('option_price', contract)[series.seconds])
+            start = int(series.seconds[100]) + 1
+            assert series.seconds[series.first_present(start)] == chain_index.first_present(contract, start)
+    assert cache.get(43050.0, 'CE') is None
+
+
+def test_lru_eviction():
+    cache = ContractSeriesCache(make_gapped_chain(), max_contracts=2)
+    first = cache.get(43000.0, 'CE')
+    cache.get(43000.0, 'PE')
+    assert cache.get(43000.0, 'CE') is first
+    cache.get(43100.0, 'CE')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['contracts']) == (1, 3, 1, 2)
+    assert (43000.0, 'PE') not in cache.entries
+    assert stats['peak_bytes'] >= stats['bytes'] > 0
+
+
+def test_since_is_a_view():
+    series = ContractSeriesCache(make_gapped_chain()).get(43000.0, 'CE')
+    later = series.since(series.timestamp_of(series.seconds[50]))
+    assert later.seconds[0] == series.seconds[50]
+    assert np.shares_memory(later.values['option_price'], series.values['option_price'])
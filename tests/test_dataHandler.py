@@ -0,0 +1,35 @@
+from datetime import datetime
+from conftest import make_chain
+from dataLayer.chainIndex import ChainIndex
+from dataLayer.chainSchema import chain_memory, memory_report
+from dataLayer.dataHandler import DataHandler
+from dataLayer.strikeTable import StrikeTable
+
+
+def test_fetch_and_process_days_keeps_tuples_sharing_a_date(monkeypatch):
+    handler = DataHandler('BANKNIFTY', '1min', prefetch_workers=1)
+    monkeypatch.setattr(handler, 'load_day', lambda date: ('futures', date))
+    monkeypatch.setattr(handler, 'fetch_and_process_data', lambda args, loaded: (args, loaded))
+
+    args_list = [(datetime(2023, 1, 3), 1.1, 0.8), (datetime(2023, 1, 3), 1.2, 0.5), (datetime(2023, 1, 4), 1.1, 0.8)]
+    results = handler.fetch_and_process_days(args_list)
+    assert [args for args, _ in results] == args_list
+    assert [loaded for _, loaded in results] == [('futures', args[0]) for args in args_list]
+
+
+def test_memory_log_has_structure_stages():
+    handler = DataHandler('BANKNIFTY', '1min', track_memory=True)
+    date = datetime(2023, 1, 3)
+    options_data = make_chain()
+    chain_index = ChainIndex(options_data)
+    strike_table = StrikeTable(options_data, chain_index=chain_index)
+    handler.record_memory(date, 'loaded', options_data)
+    handler.record_memory(date, 'chain_index', options_data, chain_index.nbytes())
+    handler.record_memory(date, 'strike_table', options_data, strike_table.nbytes())
+
+    report = memory_report(handler.memory_log)
+    assert list(report.columns) == ['loaded', 'chain_index', 'strike_table', 'rows']
+    assert report.loc[date, 'loaded'] == chain_memory(options_data) / 1e6
+    assert report.loc[date, 'chain_index'] == chain_index.nbytes() / 1e6
+    assert report.loc[date, 'strike_table'] == strike_table.nbytes() / 1e6
+    assert report.loc[date, 'rows'] == len(options_data)
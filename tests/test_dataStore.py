@@ -0,0 +1,63 @@
+from datetime import datetime, time
+import pandas as pd
+import pytest
+from conftest import make_chain, make_ticks
+from dataLayer.dataStore import PickleStore, ParquetStore, convert_pickle_tree, pq
+
+DAYS = [datetime(2023, 1, 3), datetime(2023, 1, 4)]
+
+
+def make_pickle_tree(root, tickers):
+    for ticker in tickers:
+        for seed, day in enumerate(DAYS):
+            stamp = pd.Timestamp(day)
+            make_ticks(stamp.strftime('%Y-%m-%d'), seed=seed, end='09:30:00').to_pickle(
+                root / f'{ticker}_f_{stamp.day}_{stamp.month}_{stamp.year}.pkl')
+            make_chain(stamp.strftime('%Y-%m-%d'), n_strikes=3, end='09:30:00').to_pickle(
+                root / f'{ticker}_o_{stamp.day}_{stamp.month}_{stamp.year}.pkl')
+    return PickleStore({ticker: str(root / (ticker + '_o_{day}_{month}_{year}.pkl')) for ticker in tickers},
+                       {ticker: str(root / (ticker + '_f_{day}_{month}_{year}.pkl')) for ticker in tickers})
+
+
+class MemoryStore:
+    """
+    Target store keeping written partitions in a dict.
+    """
+    def __init__(self):
+        self.partitions = {}
+
+    def has_partition(self, kind, ticker, year, month, day):
+        return (kind, ticker, year, month, day) in self.partitions
+
+    def write(self, kind, ticker, year, month, day, data):
+        self.partitions[(kind, ticker, year, month, day)] = data
+
+
+def test_convert_every_ticker_from_a_generator(tmp_path):
+    source = make_pickle_tree(tmp_path, ['BANKNIFTY', 'NIFTY'])
+    target = MemoryStore()
+    summary = convert_pickle_tree(source, target, ['BANKNIFTY', 'NIFTY'], (day for day in DAYS))
+    assert summary == {'converted': 8, 'skipped': 0, 'missing': 0}
+
+    summary = convert_pickle_tree(source, target, ['BANKNIFTY', 'NIFTY'], iter(DAYS + [datetime(2023, 1, 5)]))
+    assert summary == {'converted': 0, 'skipped': 8, 'missing': 4}
+
+
+@pytest.mark.skipif(pq is None, reason='ParquetStore requires pyarrow')
+def test_parquet_round_trip_and_pushdown(tmp_path):
+    source = make_pickle_tree(tmp_path, ['BANKNIFTY'])
+    target = ParquetStore(str(tmp_path / 'parquet'))
+    convert_pickle_tree(source, target, ['BANKNIFTY'], DAYS)
+
+    chain = source.read_options('BANKNIFTY', 2023, 1, 3)
+    pd.testing.assert_frame_equal(target.read_options('BANKNIFTY', 2023, 1, 3), chain, check_freq=False)
+
+    # Time, strike and column predicates give the rows and columns the pickle filter gives
+    kwargs = {'columns': ['option_price', 'strike_price'], 'start_time': time(9, 20), 'end_time': '09:25:00',
+              'strike_range': (43000, 43100)}
+    pd.testing.assert_frame_equal(target.read_options('BANKNIFTY', 2023, 1, 3, **kwargs),
+                                  source.read_options('BANKNIFTY', 2023, 1, 3, **kwargs), check_freq=False)
+
+    ticks = target.read_futures('BANKNIFTY', 2023, 1, 4, start_time=time(9, 29))
+    assert ticks.index.min() == pd.Timestamp('2023-01-04 09:29:00')
+    assert len(pd.concat(target.iter_futures('BANKNIFTY', DAYS, batch_size=100))) == 2 * 901
@@ -0,0 +1,41 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+from dataLayer.dayPrefetcher import DayPrefetcher, frame_bytes
+
+DAY = pd.DataFrame({'Close': np.zeros(1000)})
+
+
+def test_reads_in_flight_count_against_max_bytes():
+    lock = threading.Lock()
+    started = []
+
+    def loader(date):
+        with lock:
+            started.append(date)
+        time.sleep(0.02)
+        return DAY
+
+    size = frame_bytes(DAY)
+    prefetcher = DayPrefetcher(loader, range(12), depth=5, max_workers=4, max_bytes=2.5 * size)
+    handed_over = 0
+    ahead = []
+    for date, loaded in prefetcher:
+        assert date == handed_over and loaded is DAY
+        handed_over += 1
+        # Days started but not yet handed over: read ahead, loaded or in flight
+        with lock:
+            ahead.append(len(started) - handed_over)
+
+    # Reads start only while less than 2.5 days are held, so at most 3 are ahead, not depth
+    assert max(ahead) == 3
+    stats = prefetcher.stats()
+    assert stats['days'] == 12
+    assert stats['peak_bytes'] <= 4 * size
+
+
+def test_unlimited_reads_ahead_to_depth():
+    prefetcher = DayPrefetcher(lambda date: (time.sleep(0.01), DAY)[1], range(8), depth=3, max_workers=4)
+    assert [date for date, _ in prefetcher] == list(range(8))
+    assert prefetcher.stats()['cap_wait_seconds'] == 0.0
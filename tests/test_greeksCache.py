@@ -0,0 +1,60 @@
+import os
+import json
+import numpy as np
+import pytest
+from datetime import datetime
+from conftest import make_chain
+from dataLayer.calculateGreeks import GREEKS_COLUMNS
+from dataLayer.greeksCache import GreeksCache, calculate_iv_and_greeks_cached
+
+DAY = datetime(2023, 1, 3)
+
+
+@pytest.fixture
+def small_chain():
+    return make_chain(n_strikes=3, end='09:20:00')
+
+
+def test_hit_matches_computed_chain(tmp_path, small_chain):
+    cache = GreeksCache(str(tmp_path))
+    computed = calculate_iv_and_greeks_cached(small_chain.copy(), cache, 'BANKNIFTY', DAY, r=0.07)
+    served = calculate_iv_and_greeks_cached(small_chain.copy(), cache, 'BANKNIFTY', DAY, r=0.07)
+    assert cache.stats()['hits'] == 1
+    assert served.attrs['r'] == computed.attrs['r'] == 0.07
+    assert list(served.columns) == list(computed.columns)
+    for name in GREEKS_COLUMNS:
+        assert np.allclose(served[name].values, computed[name].values, equal_nan=True)
+
+
+def test_hit_skips_columns_of_older_entries(tmp_path, small_chain):
+    cache = GreeksCache(str(tmp_path))
+    key = cache.make_key(small_chain, r=0.07)
+    computed = calculate_iv_and_greeks_cached(small_chain.copy(), cache, 'BANKNIFTY', DAY, r=0.07)
+
+    # Entries written before the rate moved to attrs hold a per-row 'r' column
+    path = cache.entry_path('BANKNIFTY', DAY, key)
+    np.save(os.path.join(path, 'r.npy'), np.full(len(computed), 0.07))
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    meta['columns'].append('r')
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+    served = calculate_iv_and_greeks_cached(small_chain.copy(), cache, 'BANKNIFTY', DAY, r=0.07)
+    assert 'r' not in served.columns
+    assert served.attrs['r'] == 0.07
+
+
+def test_put_keeps_entry_written_by_another_worker(tmp_path, small_chain, monkeypatch):
+    cache = GreeksCache(str(tmp_path))
+    computed = calculate_iv_and_greeks_cached(small_chain.copy(), cache, 'BANKNIFTY', DAY)
+    key = cache.make_key(small_chain)
+    path = cache.entry_path('BANKNIFTY', DAY, key)
+
+    # The other worker's entry appears only after any existence check would have run
+    with monkeypatch.context() as patch:
+        patch.setattr(os.path, 'exists', lambda _: False)
+        cache.put('BANKNIFTY', DAY, key, computed)
+    assert cache.stats()['writes'] == 1
+    assert os.listdir(os.path.dirname(path)) == [key]
+    assert cache.get('BANKNIFTY', DAY, key) is not None
@@ -0,0 +1,66 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import make_ticks
+from dataLayer.ohlcBuilder import create_ohlc_candles
+from dataLayer.incrementalIndicators import IncrementalIndicators, RollingBuffer, RollingExtremum, check_consistency
+
+
+@pytest.fixture
+def gapped_day():
+    """
+    One-minute bars of a day with scattered empty bars and a ten-minute gap.
+    """
+    bars = create_ohlc_candles(make_ticks(), '1min')
+    rng = np.random.default_rng(3)
+    bars.loc[bars.index[rng.random(len(bars)) < 0.05], ['open', 'high', 'low', 'close']] = np.nan
+    bars.iloc[100:110, :4] = np.nan
+    return bars
+
+
+def test_replay_matches_batch(gapped_day):
+    report = check_consistency(gapped_day)
+    assert report['consistent'].all(), report[~report['consistent']]
+
+
+def test_snapshot_restore_round_trip(gapped_day):
+    bars = list(zip(*(gapped_day[column].values for column in ('open', 'high', 'low', 'close'))))
+    split = len(bars) // 2
+
+    engine = IncrementalIndicators()
+    for bar in bars[:split]:
+        engine.update(*bar)
+    snapshot = engine.snapshot()
+    expected = [engine.update(*bar) for bar in bars[split:]]
+
+    # Updating the engine after the snapshot must not have touched it
+    resumed = IncrementalIndicators()
+    resumed.restore(snapshot)
+    assert resumed.bars == split
+    for bar, (values, rsi, stoch) in zip(bars[split:], expected):
+        result = resumed.update(*bar)
+        for expected_frame, result_frame in zip((values, rsi, stoch), result):
+            assert result_frame.keys() == expected_frame.keys()
+            assert np.allclose(list(result_frame.values()), list(expected_frame.values()), equal_nan=True, rtol=0, atol=0)
+
+
+def test_rolling_buffer_weighted_mean():
+    rng = np.random.default_rng(0)
+    values = 43000 + np.cumsum(rng.normal(0, 2, 500))
+    values[[40, 41, 300]] = np.nan
+    values[200] = np.inf
+    buffer = RollingBuffer(14)
+    result = np.array([buffer.weighted_mean(value) for value in values])
+
+    weights = np.arange(1, 15)
+    expected = pd.Series(values).replace(np.inf, np.nan).rolling(14).apply(lambda x: x @ weights / weights.sum(), raw=True)
+    assert np.allclose(result, expected.values, equal_nan=True)
+
+
+def test_rolling_extremum_missing_values():
+    values = [1.0, 3.0, math.nan, 2.0, 5.0, 4.0, math.inf, 1.0, 0.0, 2.0]
+    rolling = RollingExtremum(3)
+    result = [rolling.update(value) for value in values]
+    expected = pd.Series(values).rolling(3).max().values
+    assert np.allclose(result, expected, equal_nan=True)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from dataLayer.indicatorLibrary import (calculate_rsi, calculate_stoch, calculate_rsi_2d, calculate_rsi_2d_windows,
+                                        calculate_stoch_2d, calculate_stoch_2d_windows)
+
+RSI_WINDOWS = [4, 14]
+STOCH_WINDOWS = [(14, 3), (5, 3), (5, 7)]
+
+
+@pytest.fixture
+def gapped_bars():
+    """
+    Indicator columns of random walks with NaN gaps, a leading warmup of NaN, a flat stretch and infinite values.
+    """
+    rng = np.random.default_rng(7)
+    n_rows, n_columns = 400, 6
+    values = 100 + np.cumsum(rng.normal(0, 1, (n_rows, n_columns)), axis=0)
+    values[rng.random((n_rows, n_columns)) < 0.05] = np.nan
+    values[:20, 1] = np.nan
+    values[100:140, 2] = np.nan
+    values[200:230, 3] = values[200, 3]
+    values[300:303, 4] = np.inf
+    values[[310, 350], 5] = [np.inf, -np.inf]
+    columns = [f'col{i}' for i in range(n_columns)]
+    return pd.DataFrame(values, columns=columns)
+
+
+def pandas_rsi(bars, window):
+    data = bars.copy()
+    for column in bars.columns:
+        calculate_rsi(data, column, window)
+    return data[[f'{column}_rsi' for column in bars.columns]].to_numpy()
+
+
+def pandas_stoch(bars, k_window, d_window):
+    data = bars.copy()
+    for column in bars.columns:
+        calculate_stoch(data, column, k_window, d_window)
+    return (data[[f'{column}_k_percent' for column in bars.columns]].to_numpy(),
+            data[[f'{column}_d_percent' for column in bars.columns]].to_numpy())
+
+
+@pytest.mark.parametrize('window', RSI_WINDOWS)
+def test_rsi_2d_matches_pandas(gapped_bars, window):
+    expected = pandas_rsi(gapped_bars, window)
+    rsi = calculate_rsi_2d(gapped_bars.to_numpy(dtype=np.float64), window)
+    for column in range(expected.shape[1]):
+        assert np.allclose(rsi[:, column], expected[:, column], equal_nan=True)
+
+
+def test_rsi_2d_windows_matches_pandas(gapped_bars):
+    rsi = calculate_rsi_2d_windows(np.asfortranarray(gapped_bars.to_numpy(dtype=np.float64)), RSI_WINDOWS)
+    for window in RSI_WINDOWS:
+        expected = pandas_rsi(gapped_bars, window)
+        for column in range(expected.shape[1]):
+            assert np.allclose(rsi[window][:, column], expected[:, column], equal_nan=True)
+
+
+@pytest.mark.parametrize('k_window, d_window', STOCH_WINDOWS)
+def test_stoch_2d_matches_pandas(gapped_bars, k_window, d_window):
+    expected_k, expected_d = pandas_stoch(gapped_bars, k_window, d_window)
+    k_percent, d_percent = calculate_stoch_2d(gapped_bars.to_numpy(dtype=np.float64), k_window, d_window)
+    for column in range(expected_k.shape[1]):
+        assert np.allclose(k_percent[:, column], expected_k[:, column], equal_nan=True)
+        assert np.allclose(d_percent[:, column], expected_d[:, column], equal_nan=True)
+
+
+def test_stoch_2d_windows_matches_pandas(gapped_bars):
+    stoch = calculate_stoch_2d_windows(np.asfortranarray(gapped_bars.to_numpy(dtype=np.float64)), STOCH_WINDOWS)
+    for k_window, d_window in STOCH_WINDOWS:
+        expected_k, expected_d = pandas_stoch(gapped_bars, k_window, d_window)
+        k_percent, d_percent = stoch[(k_window, d_window)]
+        for column in range(expected_k.shape[1]):
+            assert np.allclose(k_percent[:, column], expected_k[:, column], equal_nan=True)
+            assert np.allclose(d_percent[:, column], expected_d[:, column], equal_nan=True)
@@ -0,0 +1,42 @@
+import pickle
+import numpy as np
+import pandas as pd
+from strategyLayer.createLegs import build_leg_data
+from strategyLayer.legRecords import LegBuffer, LegRecords, LEG_FIELDS
+
+GREEKS = {'delta': 0.5, 'theta': -12.0, 'gamma': 0.001, 'iv': 0.15}
+
+
+def closed_leg(strike_price, action):
+    leg = build_leg_data(pd.Timestamp('2023-01-03 10:00:00'), strike_price, action, 'CE', 1, 150.0, GREEKS)
+    leg.update({'exit_time_of_leg': pd.Timestamp('2023-01-03 10:05:00'), 'exit_price': 160.0, 'exit_delta': 0.55,
+                'exit_theta': -11.0, 'exit_gamma': 0.0011, 'exit_iv': 0.16})
+    return leg
+
+
+def test_record_round_trip():
+    buffer = LegBuffer(capacity=1)
+    legs = [closed_leg(43000.0, 'buy'), closed_leg(43100.0, 'sell')]
+    records = buffer.record(legs)
+    assert isinstance(records, LegRecords)
+    assert len(buffer) == 2
+    for leg, stored in zip(legs, records):
+        assert stored.to_dict() == leg
+
+
+def test_unclosed_fields_are_missing():
+    buffer = LegBuffer()
+    leg = build_leg_data(pd.Timestamp('2023-01-03 10:00:00'), 43000.0, 'buy', 'PE', 2, 150.0, GREEKS)
+    stored = buffer.record([leg])[0]
+    assert stored['exit_time_of_leg'] is None
+    assert np.isnan(stored['exit_price'])
+    assert stored['option_type'] == 'PE' and stored['lot_size'] == 2
+
+
+def test_pickle_keeps_rows_in_use():
+    buffer = LegBuffer()
+    records = buffer.record([closed_leg(43000.0, 'buy')])
+    restored = pickle.loads(pickle.dumps(records))
+    assert len(restored.buffer.records) == 1
+    assert list(restored.buffer.frame().columns) == list(LEG_FIELDS)
+    assert restored[0].to_dict() == records[0].to_dict()
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+import pytest
+from signalLayer.signalExpressions import Expression, Tag, all_of
+
+
+def test_expression_is_abstract():
+    with pytest.raises(TypeError):
+        Expression()
+
+    class Incomplete(Expression):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_combined_rule():
+    data = pd.DataFrame({'a': [10.0, 12.0, np.nan, 5.0, 4.0, 3.0], 'b': [20.0, 10.0, 10.0, 10.0, 10.0, 30.0]})
+    rule = ((all_of(['a', 'b']) < 15).for_bars(2)) | ~(Tag('b') < 25)
+    assert rule.evaluate(data).tolist() == [False, False, False, False, True, True]
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import time
+from conftest import make_gapped_chain, make_signals
+from dataLayer.chainIndex import ChainIndex
+from dataLayer.contractSeries import ContractSeriesCache
+from dataLayer.lazyGreeks import LazyGreeks
+from executionLayer.exitEngine import VectorizedExitEngine
+from executionLayer.sessionClock import SessionClock
+from executionLayer.spreadStrategiesBacktester import SpreadBacktester
+
+INSTRUMENTS = {
+    'directional': {'long': [{'strike_part': 0, 'option_type': 'CE', 'action': 'buy', 'lots': 1}],
+                    'short': [{'strike_part': 0, 'option_type': 'PE', 'action': 'buy', 'lots': 1}]},
+    'spread': []
+}
+
+# Two-leg spreads, whose legs are quoted at different seconds of a thinned chain
+SPREADS = {
+    'directional': {'long': [{'strike_part': 0, 'option_type': 'CE', 'action': 'buy', 'lots': 1},
+                             {'strike_part': 100, 'option_type': 'CE', 'action': 'sell', 'lots': 1}],
+                    'short': [{'strike_part': 0, 'option_type': 'PE', 'action': 'buy', 'lots': 1},
+                              {'strike_part': -100, 'option_type': 'PE', 'action': 'sell', 'lots': 1}]},
+    'spread': []
+}
+
+
+def single_signal(day, entry_time):
+    index = pd.date_range(f'{day} 09:15:00', f'{day} 15:29:00', freq='1min')
+    signals = pd.DataFrame(False, index=index, columns=['long_signal_entry', 'short_signal_entry',
+                                                        'long_signal_exit', 'short_signal_exit'])
+    signals.loc[pd.Timestamp(f'{day} {entry_time}'), 'long_signal_entry'] = True
+    return signals
+
+
+def build(options_data, signals, path, max_positions=1, instruments=INSTRUMENTS, stop_loss=1.1, target_profit=0.8,
+          sl_percentage_based=True, tp_percentage_based=True, cutoff=time(15, 15)):
+    clock = SessionClock.for_index(options_data.index, cutoff=cutoff)
+    greeks = LazyGreeks(options_data)
+    chain_index = ChainIndex(options_data, clock=clock) if path in ('chain_index', 'exit_engine') else None
+    exit_engine = VectorizedExitEngine(chain_index, greeks, clock) if path == 'exit_engine' else None
+    series_cache = ContractSeriesCache(options_data, clock=clock) if path == 'series_cache' else None
+    return SpreadBacktester(options_data, signals, stop_loss, target_profit, instruments, sl_percentage_based,
+                            tp_percentage_based, 'directional', greeks, chain_index, exit_engine, max_positions,
+                            series_cache=series_cache, clock=clock)
+
+
+PATHS = ['dataframe', 'chain_index', 'exit_engine', 'series_cache']
+
+
+@pytest.mark.parametrize('path', PATHS)
+def test_no_entry_on_cutoff_row(option_chain, path):
+    backtester = build(option_chain, single_signal('2023-01-03', '15:15:00'), path)
+    trades, uncounted = backtester.execute_trades(backtester.classifying_signals())
+    assert trades == []
+    assert uncounted == 0
+
+
+@pytest.mark.parametrize('path', PATHS)
+def test_entry_before_cutoff_is_closed(option_chain, path):
+    backtester = build(option_chain, single_signal('2023-01-03', '15:14:00'), path)
+    trades, _ = backtester.execute_trades(backtester.classifying_signals())
+    assert len(trades) == 1
+    # The chain's time value is flat, so neither SL nor TP is hit and the cutoff closes the trade
+    assert trades[0]['entry_timestamp'] == pd.Timestamp('2023-01-03 15:14:00')
+    assert trades[0]['exit_timestamp'] == pd.Timestamp('2023-01-03 15:15:01')
+    assert trades[0]['exit_reason'] == 'time_breach'
+    assert trades[0]['exit_premium'] == trades[0]['entry_premium']
+
+
+@pytest.mark.parametrize('path', PATHS)
+def test_clock_cutoff_closes_trades(option_chain, path):
+    signals = single_signal('2023-01-03', '14:59:00')
+    signals.loc[pd.Timestamp('2023-01-03 15:00:00'), 'long_signal_entry'] = True
+    backtester = build(option_chain, signals, path, cutoff=time(15, 0))
+    trades, _ = backtester.execute_trades(backtester.classifying_signals())
+    assert [(trade['entry_timestamp'], trade['exit_timestamp'], trade['exit_reason']) for trade in trades] == \
+           [(pd.Timestamp('2023-01-03 14:59:00'), pd.Timestamp('2023-01-03 15:00:01'), 'time_breach')]
+
+
+def exits(trades):
+    return [(trade['entry_timestamp'], trade['exit_timestamp'], trade['exit_reason'], trade['pnl'],
+             [(leg['exit_time_of_leg'], leg['exit_price']) for leg in trade['legs']]) for trade in trades]
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_exit_paths_agree_on_gapped_chain(seed):
+    options_data = make_gapped_chain(seed=seed)
+    signals = make_signals(seed=seed)
+    results = {}
+    for path in PATHS:
+        backtester = build(options_data.copy(), signals, path)
+        trades, uncounted = backtester.execute_trades(backtester.classifying_signals())
+        results[path] = (exits(trades), uncounted)
+
+    expected = results['dataframe']
+    assert expected[0]
+    for path in PATHS[1:]:
+        assert results[path] == expected, path
+    if seed == 0:
+        assert {trade[2] for trade in expected[0]} == {'SL_hit', 'TP_hit', 'time_breach'}
+
+
+@pytest.mark.parametrize('path', ['chain_index', 'exit_engine'])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_single_position_portfolio_matches_execute_trades(seed, path):
+    options_data = make_gapped_chain(seed=seed, drop=0.6)
+    signals = make_signals(seed=seed)
+    backtester = build(options_data, signals, path, instruments=SPREADS)
+    trades, uncounted = backtester.execute_trades(backtester.classifying_signals())
+    backtester = build(options_data, signals, path, instruments=SPREADS)
+    portfolio_trades, portfolio_uncounted = backtester.execute_portfolio(backtester.classifying_signals())
+    assert exits(portfolio_trades) == exits(trades)
+    assert portfolio_uncounted == uncounted
+
+
+# (stop_loss, target_profit, sl_percentage_based, tp_percentage_based)
+SWEEP_COMBOS = [(1.1, 0.8, True, True), (1.05, 0.9, True, True), (20.0, 30.0, False, False), (1.2, 25.0, True, False)]
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_sweep_matches_separate_runs(seed):
+    options_data = make_gapped_chain(seed=seed, drop=0.6)
+    signals = make_signals(seed=seed)
+    backtester = build(options_data, signals, 'chain_index', instruments=SPREADS)
+    stop_loss, target_profit, sl_percentage_based, tp_percentage_based = (list(values) for values in zip(*SWEEP_COMBOS))
+    swept, combinations = backtester.sweep(stop_loss, target_profit, sl_percentage_based, tp_percentage_based,
+                                           backtester.classifying_signals())
+
+    for combo_id, combo in enumerate(SWEEP_COMBOS):
+        backtester = build(options_data, signals, 'chain_index', instruments=SPREADS, stop_loss=combo[0],
+                           target_profit=combo[1], sl_percentage_based=combo[2], tp_percentage_based=combo[3])
+        trades, uncounted = backtester.execute_trades(backtester.classifying_signals())
+        combo_trades = swept[swept['combo_id'] == combo_id]
+
+        assert len(trades) > 0
+        assert combinations.loc[combo_id, 'positions_not_counted'] == uncounted
+        assert list(combo_trades['entry_timestamp']) == [trade['entry_timestamp'] for trade in trades]
+        assert list(combo_trades['exit_timestamp']) == [trade['exit_timestamp'] for trade in trades]
+        assert list(combo_trades['exit_reason']) == [trade['exit_reason'] for trade in trades]
+        for column in ('entry_premium', 'exit_premium', 'pnl', 'transaction_cost'):
+            np.testing.assert_allclose(combo_trades[column], [trade[column] for trade in trades])
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+from dataLayer.chainIndex import ChainIndex
+from dataLayer.strikeTable import StrikeTable
+
+
+@pytest.fixture
+def chain_with_delta(option_chain):
+    call_delta = np.clip(0.5 + (option_chain['spot_price'] - option_chain['strike_price']) / 400, 0.01, 0.99)
+    option_chain['delta'] = np.where(option_chain['option_type'] == 'CE', call_delta, call_delta - 1)
+    return option_chain
+
+
+def test_delta_array_is_built_on_first_selection(chain_with_delta):
+    table = StrikeTable(chain_with_delta)
+    assert table.delta is None
+    table.delta_strike(pd.Timestamp('2023-01-03 10:00:00'), 'CE', 0.25)
+    assert table.delta is not None
+
+
+@pytest.mark.parametrize('option_type, target', [('CE', 0.25), ('CE', 0.6), ('PE', -0.25), ('PE', -0.9)])
+def test_chain_index_deltas_match_dense_array(chain_with_delta, option_type, target):
+    dense = StrikeTable(chain_with_delta)
+    indexed = StrikeTable(chain_with_delta, chain_index=ChainIndex(chain_with_delta))
+    for timestamp in pd.date_range('2023-01-03 09:15:00', '2023-01-03 15:30:00', freq='17min'):
+        assert indexed.delta_strike(timestamp, option_type, target) == dense.delta_strike(timestamp, option_type, target)
+    assert indexed.delta is None
+
+
+def test_delta_strike_without_deltas(option_chain):
+    table = StrikeTable(option_chain, chain_index=ChainIndex(option_chain))
+    with pytest.raises(ValueError):
+        table.delta_strike(pd.Timestamp('2023-01-03 10:00:00'), 'CE', 0.25)
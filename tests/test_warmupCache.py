@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+from datetime import datetime
+from conftest import make_ticks
+from dataLayer.dataHandler import DataHandler
+from dataLayer.dataStore import PickleStore
+from dataLayer.ohlcBuilder import create_ohlc_candles
+from dataLayer.applying_indicators import indicator_params
+from dataLayer.warmupCache import WarmupCache, session_bars, warmup_bars
+
+
+def make_store(root, days):
+    for seed, day in enumerate(days):
+        stamp = pd.Timestamp(day)
+        make_ticks(day, seed=seed).to_pickle(root / f'f_{stamp.day}_{stamp.month}_{stamp.year}.pkl')
+    return PickleStore({}, {'BANKNIFTY': str(root / 'f_{day}_{month}_{year}.pkl')})
+
+
+def test_previous_session_from_calendar(tmp_path):
+    cache = WarmupCache(str(tmp_path), calendar=['2023-01-06', '2023-01-02', '2023-01-03'])
+    assert cache.previous_session(datetime(2023, 1, 6)) == pd.Timestamp('2023-01-03')
+    assert cache.previous_session(datetime(2023, 1, 3)) == pd.Timestamp('2023-01-02')
+    assert cache.previous_session(datetime(2023, 1, 2)) is None
+
+
+def test_stale_tail_is_not_used(tmp_path):
+    store = make_store(tmp_path, ['2023-01-03', '2023-01-04'])
+    cache = WarmupCache(str(tmp_path / 'warmup'))
+    handler = DataHandler('BANKNIFTY', '1T', store=store, warmup_cache=cache)
+    params = indicator_params()
+    key = cache.make_key('1T', params)
+
+    # Only the older session has a cached tail; Jan 4 has ticks but no entry
+    older = create_ohlc_candles(store.read_futures('BANKNIFTY', 2023, 1, 3), '1T')
+    cache.put('BANKNIFTY', datetime(2023, 1, 3), key, older, cache.n_bars(params, '1T'))
+
+    warmup = handler.load_warmup(datetime(2023, 1, 5), '1T', params)
+    assert warmup.index[0].date() == datetime(2023, 1, 4).date()
+    assert cache.stats()['misses'] == 1
+    assert cache.get('BANKNIFTY', datetime(2023, 1, 4), key) is not None
+
+    # The rebuilt tail is served from the cache on the next lookup
+    pd.testing.assert_frame_equal(handler.load_warmup(datetime(2023, 1, 5), '1T', params), warmup,
+                                  check_freq=False)
+    assert cache.stats()['hits'] == 1
+
+
+def test_no_previous_session(tmp_path):
+    store = make_store(tmp_path, ['2023-01-03'])
+    cache = WarmupCache(str(tmp_path / 'warmup'), max_gap_days=3)
+    handler = DataHandler('BANKNIFTY', '1T', store=store, warmup_cache=cache)
+    assert handler.load_warmup(datetime(2023, 1, 3), '1T', indicator_params()) is None
+
+
+@pytest.mark.parametrize('timeframe', ['1T', '5T'])
+def test_seed_does_not_depend_on_cache_state(tmp_path, timeframe):
+    store = make_store(tmp_path, ['2023-01-02', '2023-01-03', '2023-01-04'])
+    params = indicator_params()
+    day = datetime(2023, 1, 4)
+    ohlc_data = create_ohlc_candles(store.read_futures('BANKNIFTY', 2023, 1, 4), timeframe)
+
+    # Warm: the sessions before are processed first, so Jan 4 is seeded from a stored tail
+    warm = DataHandler('BANKNIFTY', timeframe, store=store, warmup_cache=WarmupCache(str(tmp_path / 'warm')))
+    for previous_day in (datetime(2023, 1, 2), datetime(2023, 1, 3)):
+        previous = create_ohlc_candles(store.read_futures('BANKNIFTY', 2023, 1, previous_day.day), timeframe)
+        warm.apply_indicators_with_warmup(previous_day, previous, None, timeframe)
+    warm_frames = warm.apply_indicators_with_warmup(day, ohlc_data, None, timeframe)
+    assert warm.warmup_cache.stats()['hits'] == 2
+
+    # Cold: Jan 4 comes first, so the tail of Jan 3 is rebuilt from its ticks
+    cold = DataHandler('BANKNIFTY', timeframe, store=store, warmup_cache=WarmupCache(str(tmp_path / 'cold')))
+    cold_frames = cold.apply_indicators_with_warmup(day, ohlc_data, None, timeframe)
+    assert cold.warmup_cache.stats()['misses'] == 1
+
+    for warm_frame, cold_frame in zip(warm_frames, cold_frames):
+        pd.testing.assert_frame_equal(warm_frame, cold_frame)
+
+    n_bars = min(warmup_bars(params), session_bars(timeframe))
+    tail = warm.warmup_cache.get('BANKNIFTY', datetime(2023, 1, 3), warm.warmup_cache.make_key(timeframe, params))
+    assert len(tail) == n_bars
+    assert (tail.index.normalize() == pd.Timestamp('2023-01-03')).all()